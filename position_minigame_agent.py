@@ -41,8 +41,6 @@ class StartLearningAgent(BaseAgent):
         self.prev_reward = 0
         self.reward = 0
 
-        self.correct_count = 0
-
     def take_action(self, state, action_code, options):
 
         #if for some reason this agent is used
@@ -57,21 +55,9 @@ class StartLearningAgent(BaseAgent):
             #for all actions
             actions = self.model.predict(state)
 
-            #choose the one with the highest value
-            max_action = np.argmax(actions)
-
-            #if it chose an invalid option, train it until it learns
-            #the rules
-            while max_action not in options:
-
-                print("Had to correct",self.correct_count,"\n",actions)
-
-                #handles the training
-                self.correct(state, options)
-
-                #choose again
-                actions = self.model.predict(state)
-                max_action = np.argmax(actions)
+            #choose the valid one with the highest value
+            valid = self.action_space.mask(action_code, options)[:self.output]
+            max_action = np.argmax(np.where(valid, actions[0], -np.inf))
 
             if random.random() < self.epsilon:
                 max_action = random.choice(options)
@@ -105,17 +91,6 @@ class StartLearningAgent(BaseAgent):
 
         self.model.fit(X, y, epochs=6, verbose=self.v_flag)
 
-    def correct(self, state, valid):
-        '''
-        Train NN on valid options for state
-        '''
-        layer = np.array([[0]*self.output])
-        for pos in valid:
-            layer[0, pos] = 1
-        self.model.fit(state, layer, epochs=1, verbose=False)
-
-        self.correct_count+=1
-
     def create_nn(self):
         '''
         Builds a neural network
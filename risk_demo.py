@@ -10,7 +10,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import itertools
 
-def plot_results(results, players, trade_gen, roll=20, lw=2):
+def plot_results(results, players, trade_table, roll=20, lw=2):
     '''
     Plotting the results of a game into meaningful graphs
     '''
@@ -37,8 +37,7 @@ def plot_results(results, players, trade_gen, roll=20, lw=2):
     for plr_num, plr in enumerate(troop_stats, 1):
         ax = plr.plot(ax=ax, kind='line', x='x', y='y', c=p2c[plr_num-1],label="Player "+str(plr_num),linewidth=lw)
 
-    trade_values = [next(trade_gen) for num in range(trade_r[-1]+1)]
-    trade_rv = np.array([trade_values[x] for x in trade_r])
+    trade_rv = trade_table[trade_r]
     plt.plot(trade_rv, label='Value of Set Trade In', color='blue', linestyle='--', linewidth=lw)
     
     plt.legend(loc='best')
@@ -61,5 +60,4 @@ if __name__ == '__main__':
     env = Risk(players, has_gui=True, turn_cap=1000)
     results = env.play()
 
-    trade_gen = env.gen_backup
-    plot_results(results, players, trade_gen,5)
+    plot_results(results, players, env.trade_table, 5)
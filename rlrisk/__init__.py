@@ -28,4 +28,17 @@ environment
 minigames
     Smaller versions of the full game that focus on
     specific aspects of gameplay and learning
+
+Available Modules
+-----------------
+benchmark
+    Measures engine throughput, method costs and agent
+    latency against a saved baseline
+
+cli
+    The rlrisk command line program
+
+runner
+    Plays many games across a pool of processes and
+    summarizes the results
 '''
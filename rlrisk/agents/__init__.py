@@ -16,10 +16,15 @@ base_agent
 human
     An agent that request user input and validates it for an action
     to perform
+
+mcts
+    An agent that searches ahead with Monte Carlo tree search in a
+    simulator of the environment
 '''
 
 from .base_agent import BaseAgent
 from .aggressive import AggressiveAgent
 from .human import Human
+from .mcts import MCTSAgent
 
-__all__ = ['BaseAgent', 'AggressiveAgent', 'Human']
+__all__ = ['BaseAgent', 'AggressiveAgent', 'Human', 'MCTSAgent']
@@ -6,10 +6,21 @@ A module that holds a class for an agent that always makes
 import random
 import numpy as np
 from rlrisk.agents import BaseAgent
+from rlrisk.environment.board import CompiledBoard
 
 class AggressiveAgent(BaseAgent):
     """An aggressive random agent"""
 
+    def __init__(self):
+        """Adds the compiled form of the board used to find borders"""
+        super(AggressiveAgent, self).__init__()
+        self.compiled_board = None
+
+    def pregame_setup(self, setup_values):
+        """Compiles the board once per game, see BaseAgent.pregame_setup"""
+        super(AggressiveAgent, self).pregame_setup(setup_values)
+        self.compiled_board = CompiledBoard(self.board)
+
     def take_action(self, state, action_code, options):
         """
         Always make that aggressive move.
@@ -31,6 +42,8 @@ class AggressiveAgent(BaseAgent):
         #never retreat
         if action_code == 2:
             return True
+        if action_code == 12:
+            return options[0]
 
         #never pass on attack
         if action_code in [1, 11] and len(options) > 1:
@@ -46,12 +59,20 @@ class AggressiveAgent(BaseAgent):
                 return random.choice(border_options)
 
         #When fortifying, always choose destination
-        if action_code == 6:
-            return options[-1]
+        if action_code in [6, 15]:
+            return options[-1] if action_code == 6 else options[0]
 
         #always move troops into newly conquered territory
-        if action_code == 7:
-            return options[-1]
+        if action_code in [7, 16]:
+            return options[-1] if action_code == 7 else options[0]
+
+        #always sent troops to borders, all at once
+        if action_code in [13, 14]:
+            troops, valid = options
+            targets = np.isin(valid, self.get_borders(state))
+            if not targets.any():
+                targets[:] = True
+            return np.random.multinomial(troops, targets / targets.sum())
 
         return random.choice(options)
 
@@ -79,19 +100,10 @@ class AggressiveAgent(BaseAgent):
         list : Territory IDs of border territories
         """
 
-        territories = state[0]
+        compiled = self.compiled_board
+        owned = compiled.owned_mask(state[0], self.player)
 
-        owned = np.where(territories[:, 0] == self.player)[0]
-
-        borders = []
-        for terr in owned:
-            links = self.board[terr]
-            for link in links:
-                if link not in owned:
-                    borders.append(terr)
-                    break
-
-        return borders
+        return compiled.ids(compiled.borders(owned)).tolist()
 
     def get_start_borders(self, state):
         """
@@ -115,18 +127,14 @@ class AggressiveAgent(BaseAgent):
 
         Returns
         -------
-        list : Territory IDs of border territories
+        list : Territory IDs of unclaimed territories, once for every owned
+               neighbor, ordered by that neighbor
         """
 
-        territories = state[0]
-
-        owned = np.where(territories[:, 0] == self.player)[0]
-
-        borders = []
-        for terr in owned:
-            links = self.board[terr]
-            for link in links:
-                if territories[link, 0] == -1:
-                    borders.append(link)
+        #one entry per edge from owned to unclaimed territory, as the
+        #adjacency list loop this replaces listed them
+        owners = state[0][:, 0]
+        compiled = self.compiled_board
+        start = (owners[compiled.edge_src] == self.player) & (owners[compiled.edge_dst] == -1)
 
-        return borders
+        return compiled.edge_dst[start].tolist()
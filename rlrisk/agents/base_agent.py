@@ -6,6 +6,7 @@ should be sub-classes of this one.
 """
 
 import random
+import numpy as np
 
 class BaseAgent(object):
     """A base agent for Risk"""
@@ -20,6 +21,8 @@ class BaseAgent(object):
         self.defeated = None
         self.continents = None
         self.continent_rewards = None
+        self.action_space = None
+        self.env = None
 
     def pregame_setup(self, setup_values):
         """
@@ -35,12 +38,12 @@ class BaseAgent(object):
 
         Required Parameters
         -------------------
-        setup_values : 7 value tuple
+        setup_values : 9 value tuple
             int : The symbol in the game state representing this agent
                 ie 0 means this agent is player 1 for the particular game
 
-            generator : The sequence from which rewards for card set trade ins
-                are pulled
+            TradeTable : Troops rewarded for card set trade ins, indexed by
+                the number of trade ins so far (the third value of the state)
 
             list : Order in which players take turns
 
@@ -53,6 +56,13 @@ class BaseAgent(object):
 
             dictionary : Maps continents to the defined troop rewards per continent
 
+            ActionSpace : Fixed encoding of every decision's options, for
+                masking a policy's outputs with action_space.mask
+
+            Risk : The environment, for agents that search ahead from its
+                snapshot in a simulator (see MCTSAgent). Agents must not
+                change it
+
         Returns
         -------
         None
@@ -61,7 +71,7 @@ class BaseAgent(object):
         #what player this agent is
         self.player = setup_values[0]
 
-        #the sequence from which card set trade in rewards are given
+        #the table from which card set trade in rewards are given
         self.trade_vals = setup_values[1]
 
         #the order which players take turns
@@ -79,6 +89,12 @@ class BaseAgent(object):
         #the troop rewards for owning continents
         self.continent_rewards = setup_values[6]
 
+        #fixed size encoding of the options of every decision
+        self.action_space = setup_values[7]
+
+        #the environment, only to be read from
+        self.env = setup_values[8]
+
         #at game start player has not been defeated
         self.defeated = False
 
@@ -120,16 +136,35 @@ class BaseAgent(object):
                 9 = choose initial territory
                 10 = place initial troops
                 11 = after attack choose another attack
+                12 = choose troop count to stop at during blitz attack
+                13 = distribute all troops during recruitment at once
+                14 = distribute all initial troops at once
+                15 = split troops between source and destination during reinforcement
+                16 = split troops between attacking and conquered territory after attack
 
         options : list
             A list of all valid moves for a given player, for a given action,
             for a given state. Most of the time it is a list of territory IDs,
             but could well be tuples (attack from, attack to), or booleans.
 
+            For action codes 13 and 14 options is a tuple of the number of troops
+            and a Numpy Array of territory IDs, and for action codes 15 and 16 it
+            is a tuple of the number of troops and (source, destination) IDs.
+
         Returns
         -------
-        ? : One of the elements inside the options parameter
+        ? : One of the elements inside the options parameter, except for
+            action codes 13 and 14 which need the number of troops for each
+            territory ID, and 15 and 16 which need the number of troops sent
+            to the destination
         """
 
+        #allocations spread troops as if each was placed randomly
+        if action_code in [13, 14]:
+            troops, valid = options
+            return np.random.multinomial(troops, [1 / len(valid)] * len(valid))
+        if action_code in [15, 16]:
+            return int(np.random.binomial(options[0], 0.5))
+
         #random action is performed for base agent
         return random.choice(options)
@@ -24,12 +24,29 @@ class Human(BaseAgent):
                        8:'Which arrangement of cards would you like to trade in?',
                        9:'Choose Territories at game start',
                        10:'Place 1 Troop in initial placement',
-                       11:'Choose which attack to follow up successful attack with\nFalse for no attack'}
+                       11:'Choose which attack to follow up successful attack with\nFalse for no attack',
+                       12:'Stop the blitz attack when down to how many troops?',
+                       13:'Place all recruited troops\nEnter troops for each territory',
+                       14:'Place all initial troops\nEnter troops for each territory',
+                       15:'How many troops go to the destination during reinforcement?',
+                       16:'How many troops move into the conquered territory?'}
 
     def take_action(self, state, action_code, options):
         """Enumerates options to user and validates input to choose an option"""
 
         print(self.acodes[action_code])
+
+        if action_code in [13, 14]:
+            return self.ask_allocation(options)
+        if action_code in [15, 16]:
+            troops, pair = options
+            print(troops, 'troops to split between', pair)
+            valid = [str(x) for x in range(troops + 1)]
+            user_input = input("Choose: ")
+            while user_input not in valid:
+                user_input = input('Invalid, choose again: ')
+            return int(user_input)
+
         for index, option in enumerate(options):
             print(index, 'is for option', option)
         user_input = input("Choose: ")
@@ -37,3 +54,18 @@ class Human(BaseAgent):
             user_input = input('Invalid, choose again: ')
 
         return options[int(user_input)]
+
+    @staticmethod
+    def ask_allocation(options):
+        """Prompts for a space seperated troop count per territory until valid"""
+
+        troops, valid = options
+        print(troops, 'troops to place in territories', list(valid))
+        while True:
+            try:
+                counts = [int(x) for x in input("Choose: ").split()]
+            except ValueError:
+                counts = []
+            if len(counts) == len(valid) and min(counts) >= 0 and sum(counts) == troops:
+                return counts
+            print('Invalid, choose again')
@@ -0,0 +1,388 @@
+"""
+This module holds an agent that chooses actions by
+Monte Carlo tree search, playing the game ahead in a
+simulator with the environment's own rules
+"""
+
+import math
+import time
+import numpy as np
+from rlrisk.agents import BaseAgent, AggressiveAgent
+
+class DecisionNode(object):
+    """A decision point of the search tree"""
+
+    def __init__(self, player, columns):
+        """
+        DecisionNode Constructor
+
+        Required Parameters
+        -------------------
+        player : integer
+            The player making the decision
+
+        columns : List of integers
+            Legal columns of the decision's action encoding
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.player = player
+        self.columns = columns
+        self.untried = list(columns)
+        self.edges = {}
+        self.visits = 0
+
+class ChanceNode(object):
+    """An action of a decision, whose outcome is left to chance"""
+
+    def __init__(self):
+        """
+        ChanceNode Constructor
+
+        The decision points that followed the action are kept by their
+        outcome, so dice and card draws branch the tree.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.children = {}
+        self.visits = 0
+        self.value = 0.0
+
+class MCTSAgent(BaseAgent):
+    """An agent searching ahead with Monte Carlo tree search"""
+
+    def __init__(self, iterations=200, time_limit=None, rollout=AggressiveAgent,
+                 rollout_depth=100, exploration=0.7, reuse_tree=True, seed=None):
+        """
+        MCTSAgent Constructor
+
+        Every decision the agent restores the environment's snapshot into a
+        simulator and plays it ahead. Decisions are chosen by UCT, each player
+        maximizing their own value, over the columns of the fixed action
+        encoding (see ActionSpace). The outcome of an action is a chance node
+        keyed by the resulting decision point, so dice rolls and card draws
+        are sampled. Every iteration draws new dice and shuffles the unseen
+        draw pile, so the search does not know the game's future.
+
+        Optional Parameters
+        -------------------
+        iterations : integer
+            Number of iterations per decision, None for no limit
+
+            200 by default
+
+        time_limit : float
+            Seconds of search per decision, None for no limit. At least one
+            iteration is made
+
+            None by default
+
+        rollout : callable
+            Returns an agent, one per player, that plays out the game from the
+            leaves of the tree
+
+            AggressiveAgent by default
+
+        rollout_depth : integer
+            Number of decisions played out before the position is evaluated
+
+            100 by default
+
+        exploration : float
+            UCT exploration constant
+
+            0.7 by default
+
+        reuse_tree : boolean
+            Whether the subtree of the reached decision point is kept for the
+            agent's next decision in the same turn
+
+            True by default
+
+        seed : integer
+            Seed of the search's random stream
+
+            None by default, for fresh entropy
+
+        Returns
+        -------
+        None
+
+        """
+
+        super(MCTSAgent, self).__init__()
+
+        if iterations is None and time_limit is None:
+            raise ValueError("MCTSAgent needs an iteration or a time limit")
+
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.rollout = rollout
+        self.rollout_depth = rollout_depth
+        self.exploration = exploration
+        self.reuse_tree = reuse_tree
+        self.chance = np.random.default_rng(seed)
+        self.simulator = None
+
+        #the action last chosen and the turn it was chosen in, for tree reuse
+        self.last = None
+        self.last_turn = None
+
+    def pregame_setup(self, setup_values):
+        """Builds the simulator, see BaseAgent.pregame_setup"""
+
+        super(MCTSAgent, self).pregame_setup(setup_values)
+
+        if self.env is None:
+            raise ValueError("MCTSAgent needs the environment to search from")
+        self.simulator = self.env.simulator([self.rollout() for player in self.env.players],
+                                            seed=self.seed())
+        self.last = None
+
+    def seed(self):
+        """A seed for the simulator's random stream"""
+
+        return int(self.chance.integers(2 ** 62))
+
+    def take_action(self, state, action_code, options):
+        """
+        Searches the position for the best column and decodes it
+
+        See BaseAgent.take_action
+
+        """
+
+        legal = self.action_space.mask(action_code, options)
+        columns = np.where(legal)[0].tolist()
+        if len(columns) == 1:
+            self.last = None
+            return self.action_space.decode(action_code, columns[0], options)
+
+        root = self.reused_root(state, action_code, columns)
+        snapshot = self.env.snapshot()
+
+        start = time.time()
+        iterations = 0
+        while iterations == 0 or not self.budget_spent(iterations, start):
+            self.search(root, snapshot)
+            iterations += 1
+
+        column = max(root.edges, key=lambda col: root.edges[col].visits)
+        self.last = root.edges[column]
+        self.last_turn = self.env.turn_count
+        return self.action_space.decode(action_code, column, options)
+
+    def budget_spent(self, iterations, start):
+        """Whether the iteration or time limit of a decision is reached"""
+
+        if self.iterations is not None and iterations >= self.iterations:
+            return True
+        return self.time_limit is not None and time.time() - start >= self.time_limit
+
+    def reused_root(self, state, action_code, columns):
+        """
+        The subtree of the current decision point, if it was searched
+
+        Required Parameters
+        -------------------
+        state : 3 value tuple
+            The game state
+
+        action_code : integer
+            The action code of the decision
+
+        columns : List of integers
+            Legal columns of the decision
+
+        Returns
+        -------
+        DecisionNode
+
+        """
+
+        if self.reuse_tree and self.last is not None and self.last_turn == self.env.turn_count:
+            node = self.last.children.get(self.outcome(self.player, state, action_code))
+            if node is not None and node.columns == columns:
+                return node
+        return DecisionNode(self.player, columns)
+
+    def search(self, root, snapshot):
+        """
+        One iteration: selection, expansion, rollout and backpropagation
+
+        Required Parameters
+        -------------------
+        root : DecisionNode
+            The decision point searched
+
+        snapshot : Snapshot
+            The position of the decision point
+
+        Returns
+        -------
+        None
+
+        """
+
+        sim = self.simulator
+        sim.restore(snapshot)
+
+        #new dice, and the unseen cards in another order
+        sim.rng.reseed(self.seed())
+        deck = sim.deck
+        deck.pile = deck.pile[:deck.pointer] + sim.rng.permutation(deck.pile[deck.pointer:])
+
+        node, path, done = root, [], False
+        while node is not None and not done:
+            if node.untried:
+                column = node.untried.pop(int(self.chance.integers(len(node.untried))))
+                node.edges[column] = ChanceNode()
+            else:
+                column = self.select(node)
+            edge = node.edges[column]
+            path.append((node, edge))
+
+            state, action_code, options, done = sim.step(sim.decode_action(column))
+            if done:
+                break
+
+            key = self.outcome(sim.current_player, state, action_code)
+            child = edge.children.get(key)
+            if child is None:
+                #one node is added per iteration, the rest is played out
+                child = DecisionNode(sim.current_player,
+                                     np.where(sim.legal_actions())[0].tolist())
+                edge.children[key] = child
+                path.append((child, None))
+                node = None
+            else:
+                node = child
+
+        if not done:
+            self.play_out(state, action_code, options)
+
+        values = self.evaluate(sim)
+        for node, edge in path:
+            node.visits += 1
+            if edge is not None:
+                edge.visits += 1
+                edge.value += values[node.player]
+
+    def select(self, node):
+        """
+        The column of a fully expanded decision point with the best UCT score
+
+        Required Parameters
+        -------------------
+        node : DecisionNode
+            The decision point
+
+        Returns
+        -------
+        integer
+        """
+
+        log_visits = math.log(max(node.visits, 1))
+        best, best_score = None, -math.inf
+        for column, edge in node.edges.items():
+            score = (edge.value / edge.visits +
+                     self.exploration * math.sqrt(log_visits / edge.visits))
+            if score > best_score:
+                best, best_score = column, score
+        return best
+
+    def play_out(self, state, action_code, options):
+        """
+        Plays the simulator on with the rollout agents
+
+        Required Parameters
+        -------------------
+        state : 3 value tuple
+            The game state
+
+        action_code : integer
+            The action code of the pending decision
+
+        options : Any
+            The options of the pending decision
+
+        Returns
+        -------
+        None
+
+        """
+
+        sim = self.simulator
+        for depth in range(self.rollout_depth):
+            action = sim.players[sim.current_player].take_action(state, action_code, options)
+            state, action_code, options, done = sim.step(action)
+            if done:
+                break
+
+    def evaluate(self, env):
+        """
+        Value of a position for every player, from 0 to 1
+
+        The winner of a finished game gets 1. Otherwise players get the mean
+        of their share of territories and their share of troops. Override to
+        search with another evaluation.
+
+        Required Parameters
+        -------------------
+        env : Risk
+            The simulator at the position
+
+        Returns
+        -------
+        (players,) Numpy Array
+        """
+
+        territories = env.state[0]
+        players = len(env.players)
+
+        #territories not picked yet are left out
+        territories = territories[territories[:, 0] >= 0]
+        if len(territories) == 0:
+            return np.repeat(1 / players, players)
+
+        owned = np.bincount(territories[:, 0], minlength=players)
+        if env.game_over and env.winner():
+            return (owned > 0).astype(float)
+
+        troops = np.bincount(territories[:, 0], weights=territories[:, 1], minlength=players)
+        return (owned / len(territories) + troops / troops.sum()) / 2
+
+    @staticmethod
+    def outcome(player, state, action_code):
+        """
+        Key of the decision point an action led to
+
+        Required Parameters
+        -------------------
+        player : integer
+            The player making the decision
+
+        state : 3 value tuple
+            The game state
+
+        action_code : integer
+            The action code of the decision
+
+        Returns
+        -------
+        tuple
+        """
+
+        return (player, action_code, state[0].tobytes(), state[1].tobytes(), state[2])
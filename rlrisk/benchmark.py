@@ -0,0 +1,475 @@
+'''
+This module measures how fast the engine is, playing whole
+games of standard configurations and timing the methods
+called most during a game, and compares the results with
+a baseline saved earlier to find regressions
+'''
+
+import sys
+import time
+import json
+import random
+import platform
+import numpy as np
+from rlrisk.runner import load, AGENTS, ENVIRONMENTS
+
+#whole game configurations as (environment, agents, environment keyword arguments)
+GAMES = {
+    'risk-2-base': ('risk', ['base']*2, {'turn_cap': 250}),
+    'risk-2-aggressive': ('risk', ['aggressive']*2, {'turn_cap': 250}),
+    'risk-4-mixed': ('risk', ['aggressive', 'base']*2, {'turn_cap': 250}),
+    'risk-6-aggressive': ('risk', ['aggressive']*6, {'turn_cap': 250}),
+    'risk-6-aggressive-blitz': ('risk', ['aggressive']*6,
+                                {'turn_cap': 250, 'blitz': True, 'bulk_allocation': True}),
+    'southern-3-aggressive': ('southern', ['aggressive']*3, {'turn_cap': 250}),
+    'pick-2-base': ('rlrisk.minigames:SPMinigame', ['base']*2, {}),
+}
+
+#keyword arguments every game is played with, when the environment takes them
+QUIET = {'record': None, 'verbose': False}
+
+#which way each metric improves, True for higher
+HIGHER_IS_BETTER = {'games_per_sec': True, 'decisions_per_sec': True,
+                    'agent_us_per_decision': False, 'us_per_call': False}
+
+def counted(decisions, timing):
+    """
+    Passes on the decision points of a game generator, timing the engine
+
+    Time spent in the generator is engine time, the rest of a game is
+    spent by agents deciding.
+
+    Required Parameters
+    -------------------
+    decisions : Generator
+        A game generator, see Risk.game
+
+    timing : List
+        [decisions, engine seconds], added to as the game is played
+
+    Returns
+    -------
+    The value the generator returns
+    """
+
+    try:
+        start = time.perf_counter()
+        decision = next(decisions)
+        while True:
+            timing[1] += time.perf_counter() - start
+            timing[0] += 1
+            action = yield decision
+            start = time.perf_counter()
+            decision = decisions.send(action)
+    except StopIteration as stop:
+        timing[1] += time.perf_counter() - start
+        return stop.value
+
+def bench_game(env, agents, env_kwargs, games=10):
+    """
+    Plays games of a configuration in this process
+
+    Games are seeded 0 to games-1, so every run plays the same games.
+
+    Required Parameters
+    -------------------
+    env : String
+        Specification of the environment class, see runner.load
+
+    agents : List of Strings
+        Specifications of the agent classes, see runner.load
+
+    env_kwargs : dictionary
+        Keyword arguments for the environment
+
+    Optional Parameters
+    -------------------
+    games : integer
+        Number of games
+
+        10 by default
+
+    Returns
+    -------
+    dictionary
+        games_per_sec : Games played a second
+        decisions_per_sec : Decisions made a second
+        agent_us_per_decision : Microseconds agents take to decide
+        engine_share : Fraction of the time spent in the engine
+        decisions : Decisions per game
+        turns : Turns per game
+    """
+
+    env_class = load(env, ENVIRONMENTS)
+    players = [load(agent, AGENTS)() for agent in agents]
+
+    timing = [0, 0.0]
+    turns = 0
+    start = time.perf_counter()
+    for seed in range(games):
+        random.seed(seed)
+        np.random.seed(seed)
+        kwargs = dict(QUIET, **env_kwargs)
+        try:
+            game = env_class(players, seed=seed, **kwargs)
+        except TypeError:
+            #minigames take fewer arguments
+            kwargs.pop('verbose')
+            game = env_class(players, seed=seed, **kwargs)
+        game.drive(counted(game.game(), timing))
+        turns += game.turn_count
+    seconds = time.perf_counter() - start
+
+    decisions, engine = timing
+    return {'games_per_sec': games / seconds,
+            'decisions_per_sec': decisions / seconds,
+            'agent_us_per_decision': 1e6 * (seconds - engine) / max(decisions, 1),
+            'engine_share': engine / seconds,
+            'decisions': decisions / games,
+            'turns': turns / games}
+
+def measure(func, number, repeat=5, setup=None):
+    """
+    Best time of a function call
+
+    Required Parameters
+    -------------------
+    func : callable
+        Called without arguments
+
+    number : integer
+        Calls timed together
+
+    Optional Parameters
+    -------------------
+    repeat : integer
+        Times the calls are timed, the fastest counts
+
+        5 by default
+
+    setup : callable
+        Called without arguments before the calls are timed, untimed
+
+        None by default
+
+    Returns
+    -------
+    float : Microseconds a call
+    """
+
+    best = float('inf')
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return 1e6 * best / number
+
+def midgame(turns=20, seed=0):
+    """
+    A game of four AggressiveAgents paused after some turns
+
+    Required Parameters
+    -------------------
+    None
+
+    Optional Parameters
+    -------------------
+    turns : integer
+        Turns played
+
+        20 by default
+
+    seed : integer
+        Seed of the game
+
+        0 by default
+
+    Returns
+    -------
+    Risk : Waiting for a decision, see Risk.step
+    """
+
+    from rlrisk.environment import Risk
+    from rlrisk.agents import AggressiveAgent
+
+    random.seed(seed)
+    np.random.seed(seed)
+    players = [AggressiveAgent() for _ in range(4)]
+    env = Risk(players, seed=seed, **QUIET)
+    state, action_code, options = env.reset()
+    while env.turn_count < turns:
+        action = players[env.current_player].take_action(state, action_code, options)
+        state, action_code, options, done = env.step(action)
+        if done:
+            raise ValueError("The game ended before turn " + str(turns))
+    return env
+
+def bench_micro(number=1000, gui=True):
+    """
+    Times the methods the engine calls most, on a position in mid game
+
+    Required Parameters
+    -------------------
+    None
+
+    Optional Parameters
+    -------------------
+    number : integer
+        Calls of each method timed together
+
+        1000 by default
+
+    gui : boolean
+        Whether to time GUI.recolor too, drawn offscreen
+
+        True by default
+
+    Returns
+    -------
+    dictionary : Method names as keys for dictionaries of us_per_call
+    """
+
+    env = midgame()
+    territories = env.state[0]
+
+    #the player with the most territories, and a border it attacks across
+    player = int(np.argmax(env.territory_counts[:len(env.players)]))
+    owned = env.get_owned_territories(player)
+    owners, edges = territories[:, 0], env.compiled.edges
+    attack = tuple(edges[(owners[edges[:, 0]] == player) & (owners[edges[:, 1]] != player)][0])
+
+    #a hand of five for get_sets
+    while env.deck.hand_size(player) < 5:
+        env.deck.draw(player)
+
+    def reset_battle():
+        env.set_troops(attack[0], 1000)
+        env.set_troops(attack[1], 1000)
+
+    def combat_round():
+        decisions = env.combat(attack)
+        next(decisions)
+        try:
+            decisions.send(3)
+        except StopIteration:
+            pass
+
+    calls = {'combat': (combat_round, reset_battle),
+             'get_targets': (lambda: env.get_targets(player), None),
+             'get_sets': (lambda: env.get_sets(player), None),
+             'calculate_recruits': (lambda: env.calculate_recruits(player), None),
+             'map_connected_territories': (
+                 lambda: env.map_connected_territories(owned[0], owned), None)}
+
+    results = {}
+    for name, (func, setup) in calls.items():
+        #a battle of 1000 troops a side lasts at least 500 rounds
+        count = min(number, 400) if name == 'combat' else number
+        results[name] = {'us_per_call': measure(func, count, setup=setup)}
+
+    if gui:
+        results.update(bench_gui(env, max(number // 10, 10)))
+    return results
+
+def bench_gui(env, number):
+    """
+    Times GUI.recolor offscreen
+
+    Required Parameters
+    -------------------
+    env : Risk
+        The game whose state is drawn
+
+    number : integer
+        Frames timed together
+
+    Returns
+    -------
+    dictionary
+        recolor_changed : Drawing states that differ in half the territories
+        recolor_unchanged : Drawing the state already shown
+    """
+
+    from rlrisk.environment import capture, GUI
+
+    capture.headless()
+    gui = GUI()
+    try:
+        territories, cards, trade_ins = env.state
+        changed = np.array(territories)
+        changed[::2, 0] = (changed[::2, 0] + 1) % len(env.players)
+        changed[1::2, 1] += 1
+        states = [(np.array(territories), np.array(cards), trade_ins),
+                  (changed, np.array(cards), trade_ins)]
+
+        frame = [0]
+        def alternate():
+            frame[0] += 1
+            gui.recolor(states[frame[0] % 2])
+
+        gui.recolor(states[0])
+        return {'recolor_changed': {'us_per_call': measure(alternate, number)},
+                'recolor_unchanged': {'us_per_call': measure(lambda: gui.recolor(states[0]),
+                                                             number)}}
+    finally:
+        gui.quit_game()
+
+def run(games=10, number=1000, configs=None, gui=True):
+    """
+    Runs the whole benchmark suite
+
+    Optional Parameters
+    -------------------
+    games : integer
+        Games played of each configuration
+
+        10 by default
+
+    number : integer
+        Calls of each method timed together, see bench_micro
+
+        1000 by default
+
+    configs : List of Strings
+        Keys of GAMES to play
+
+        All of GAMES by default
+
+    gui : boolean
+        Whether to time the GUI
+
+        True by default
+
+    Returns
+    -------
+    dictionary
+        meta : Versions, platform and settings of the run
+        results : Benchmark names as keys for dictionaries of metrics,
+                  game/<config> for games and micro/<method> for methods
+    """
+
+    results = {}
+    for config in configs or list(GAMES):
+        env, agents, env_kwargs = GAMES[config]
+        results['game/' + config] = bench_game(env, agents, env_kwargs, games)
+    for name, metrics in bench_micro(number, gui).items():
+        results['micro/' + name] = metrics
+
+    meta = {'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'games': games,
+            'number': number}
+    return {'meta': meta, 'results': results}
+
+def save(report, path):
+    """
+    Writes a report of run as JSON
+
+    Required Parameters
+    -------------------
+    report : dictionary
+        From run
+
+    path : String
+        The file to write
+
+    Returns
+    -------
+    None
+
+    """
+
+    with open(path, 'w') as report_file:
+        json.dump(report, report_file, indent=2, sort_keys=True)
+
+def compare(report, baseline, tolerance=0.25):
+    """
+    Compares the metrics of a report with a baseline report
+
+    Only benchmarks and metrics in both reports are compared, and games
+    only when both reports played as many of each configuration, since
+    they are then the same games.
+
+    Required Parameters
+    -------------------
+    report : dictionary
+        From run
+
+    baseline : dictionary or String
+        From run, or the JSON file it was saved to
+
+    Optional Parameters
+    -------------------
+    tolerance : float
+        Fraction a metric may get worse by before it is a regression
+
+        0.25 by default
+
+    Returns
+    -------
+    List of 6 value tuples
+        Benchmark name, metric, baseline value, value, ratio of the value to
+        the baseline, and whether it is a regression
+    """
+
+    if isinstance(baseline, str):
+        with open(baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    same_games = report['meta'].get('games') == baseline['meta'].get('games')
+
+    rows = []
+    for name, metrics in sorted(report['results'].items()):
+        base_metrics = baseline['results'].get(name, {})
+        if name.startswith('game/') and not same_games:
+            continue
+        for metric, higher in HIGHER_IS_BETTER.items():
+            if metric not in metrics or not base_metrics.get(metric):
+                continue
+            ratio = metrics[metric] / base_metrics[metric]
+            worse = ratio < 1 - tolerance if higher else ratio > 1 + tolerance
+            rows.append((name, metric, base_metrics[metric], metrics[metric], ratio, worse))
+    return rows
+
+def print_report(report, rows=None, out=sys.stdout):
+    """
+    Prints the results of a report, and the comparison if given
+
+    Required Parameters
+    -------------------
+    report : dictionary
+        From run
+
+    Optional Parameters
+    -------------------
+    rows : List
+        From compare
+
+        None by default
+
+    out : file
+        Where to print
+
+        sys.stdout by default
+
+    Returns
+    -------
+    None
+
+    """
+
+    for name, metrics in sorted(report['results'].items()):
+        print("%-36s %s" % (name, ", ".join("%s %.4g" % (metric, value)
+                                             for metric, value in sorted(metrics.items()))),
+              file=out)
+
+    if rows:
+        print("\nCompared with the baseline:", file=out)
+        for name, metric, base, value, ratio, worse in rows:
+            print("%-36s %-24s %10.4g -> %-10.4g %6.2fx%s" %
+                  (name, metric, base, value, ratio, "  REGRESSION" if worse else ""), file=out)
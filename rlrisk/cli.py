@@ -0,0 +1,306 @@
+'''
+This module is the rlrisk command line program
+
+    $ rlrisk simulate --games 1000 --agents aggressive base --workers 64
+    $ rlrisk simulate --games 100 --map synthetic:2000 --blitz --bulk
+    $ rlrisk capture records/ frames/ --games 0 1 2 --format png
+    $ rlrisk replay records/ --game 3 --speed 50
+    $ rlrisk profile --agents aggressive base --trace trace.json
+    $ rlrisk bench --out bench.json --baseline baseline.json
+'''
+
+import sys
+import json
+import argparse
+import numpy as np
+from rlrisk import runner
+
+def parser():
+    """
+    Builds the argument parser of every command
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    argparse.ArgumentParser
+    """
+
+    main_parser = argparse.ArgumentParser(prog='rlrisk', description='RLRisk command line tools')
+    commands = main_parser.add_subparsers(dest='command')
+    commands.required = True
+
+    sim = commands.add_parser('simulate', help='play many games across a process pool')
+    sim.add_argument('--games', type=int, default=100, help='number of games to play')
+    sim.add_argument('--agents', nargs='+', default=['aggressive']*6,
+                     help='agents in player order, base, aggressive or module:Class')
+    sim.add_argument('--workers', type=int, default=None,
+                     help='number of processes, defaults to the number of CPUs')
+    sim.add_argument('--chunk-size', type=int, default=16,
+                     help='games sent to a worker at a time')
+    sim.add_argument('--seed', type=int, default=None, help='seed of the whole run')
+    sim.add_argument('--env', default='risk', help='risk, southern or module:Class')
+    sim.add_argument('--turn-cap', type=int, default=None, help='turns before a game is stopped')
+    sim.add_argument('--blitz', action='store_true', help='resolve attacks in a single step')
+    sim.add_argument('--bulk', action='store_true', help='allocate troops in a single step')
+    sim.add_argument('--map', default=None,
+                     help='map file to play on, or synthetic:N for a map of N territories')
+    sim.add_argument('--json', action='store_true', help='print the summary as JSON')
+    sim.set_defaults(func=simulate)
+
+    cap = commands.add_parser('capture', help='render recorded games offscreen')
+    cap.add_argument('dataset', help='directory a TrajectorySink wrote to')
+    cap.add_argument('out', help='directory the frames are written to')
+    cap.add_argument('--games', type=int, nargs='+', default=None,
+                     help='indices of the games to render, defaults to all')
+    cap.add_argument('--format', choices=['png', 'npy'], default='png',
+                     help='one PNG per record, or an array of frames per game')
+    cap.add_argument('--board', choices=['risk', 'southern'], default='risk',
+                     help='the GUI the games are drawn with')
+    cap.add_argument('--workers', type=int, default=None,
+                     help='number of processes, defaults to the number of CPUs')
+    cap.set_defaults(func=capture)
+
+    rep = commands.add_parser('replay', help='watch a recorded game')
+    rep.add_argument('dataset', help='directory a TrajectorySink wrote to')
+    rep.add_argument('--game', type=int, default=0, help='index of the game')
+    rep.add_argument('--speed', type=float, default=10, help='records played a second')
+    rep.add_argument('--fps', type=float, default=30, help='frames drawn a second at most')
+    rep.add_argument('--board', choices=['risk', 'southern'], default='risk',
+                     help='the GUI the game is drawn with')
+    rep.set_defaults(func=replay)
+
+    prof = commands.add_parser('profile', help='time the phases and decisions of games')
+    prof.add_argument('--games', type=int, default=1, help='number of games to play')
+    prof.add_argument('--agents', nargs='+', default=['aggressive']*6,
+                      help='agents in player order, base, aggressive or module:Class')
+    prof.add_argument('--seed', type=int, default=0, help='seed of the first game')
+    prof.add_argument('--env', default='risk', help='risk, southern or module:Class')
+    prof.add_argument('--turn-cap', type=int, default=None, help='turns before a game is stopped')
+    prof.add_argument('--blitz', action='store_true', help='resolve attacks in a single step')
+    prof.add_argument('--bulk', action='store_true', help='allocate troops in a single step')
+    prof.add_argument('--trace', default=None, help='file the Chrome trace is written to')
+    prof.add_argument('--json', default=None, help='file the summary is written to as JSON')
+    prof.set_defaults(func=profile)
+
+    bench = commands.add_parser('bench', help='measure engine speed against a baseline')
+    bench.add_argument('--games', type=int, default=10, help='games played of each configuration')
+    bench.add_argument('--number', type=int, default=1000,
+                       help='calls of each method timed together')
+    bench.add_argument('--configs', nargs='+', default=None,
+                       help='game configurations to play, defaults to all')
+    bench.add_argument('--no-gui', action='store_true', help='do not time the GUI')
+    bench.add_argument('--out', default=None, help='JSON file the results are written to')
+    bench.add_argument('--baseline', default=None, help='JSON results of an earlier run')
+    bench.add_argument('--tolerance', type=float, default=0.25,
+                       help='fraction a metric may get worse by before it is a regression')
+    bench.set_defaults(func=benchmark)
+
+    return main_parser
+
+def simulate(args):
+    """
+    Runs the simulate command and prints the summary
+
+    Required Parameters
+    -------------------
+    args : argparse.Namespace
+        Parsed arguments
+
+    Returns
+    -------
+    None
+
+    """
+
+    env_kwargs = {'blitz': args.blitz, 'bulk_allocation': args.bulk}
+    if args.turn_cap is not None:
+        env_kwargs['turn_cap'] = args.turn_cap
+    if args.map is not None:
+        env_kwargs['board_map'] = load_map(args.map, args.seed)
+
+    summary = runner.simulate(args.games, args.agents, args.workers, args.chunk_size,
+                              args.seed, args.env, env_kwargs)
+    lengths = summary['lengths']
+
+    if args.json:
+        summary['lengths'] = lengths.tolist()
+        print(json.dumps(summary))
+        return
+
+    print("Games:", summary['games'], "in %.2fs (%.1f games/sec)" %
+          (summary['seconds'], summary['games_per_sec']))
+    for player, (agent, wins) in enumerate(zip(args.agents, summary['wins']), 1):
+        share = " (%.1f%%)" % (100 * wins / summary['games']) if summary['games'] else ""
+        print("Player", player, "(" + agent + ") won", str(wins) + share)
+    print("Turn cap reached:", summary['capped'])
+    if len(lengths):
+        print("Game length: mean %.1f, median %d, min %d, max %d turns" %
+              (lengths.mean(), np.median(lengths), lengths.min(), lengths.max()))
+
+def load_map(spec, seed=None):
+    """
+    The map of a --map argument
+
+    Required Parameters
+    -------------------
+    spec : String
+        Path of a map file, or synthetic:N
+
+    Optional Parameters
+    -------------------
+    seed : integer
+        Seed of a synthetic map
+
+        None by default
+
+    Returns
+    -------
+    Map
+    """
+
+    from rlrisk.environment import Map
+
+    if spec.startswith('synthetic:'):
+        return Map.synthetic(int(spec.split(':', 1)[1]), seed=seed)
+    return Map.load(spec)
+
+def capture(args):
+    """
+    Runs the capture command and prints the number of frames
+
+    Required Parameters
+    -------------------
+    args : argparse.Namespace
+        Parsed arguments
+
+    Returns
+    -------
+    None
+
+    """
+
+    from rlrisk.environment import capture as capturing
+    from rlrisk.environment import GUI
+    from rlrisk.minigames import SWGUI
+
+    gui_class = SWGUI if args.board == 'southern' else GUI
+    counts = capturing.capture_games(args.dataset, args.out, args.games, gui_class,
+                                     args.format, args.workers)
+    print("Rendered", sum(counts), "frames of", len(counts), "games to", args.out)
+
+def replay(args):
+    """
+    Runs the replay command until the window is closed
+
+    Required Parameters
+    -------------------
+    args : argparse.Namespace
+        Parsed arguments
+
+    Returns
+    -------
+    None
+
+    """
+
+    from rlrisk.environment import GUI, Replay
+    from rlrisk.minigames import SWGUI
+
+    gui_class = SWGUI if args.board == 'southern' else GUI
+    viewer = Replay.load(args.dataset, args.game, gui_class=gui_class, speed=args.speed,
+                         fps=args.fps)
+    viewer.play()
+    viewer.run()
+
+def profile(args):
+    """
+    Runs the profile command and prints the table of times
+
+    Required Parameters
+    -------------------
+    args : argparse.Namespace
+        Parsed arguments
+
+    Returns
+    -------
+    None
+
+    """
+
+    from rlrisk.environment import Profiler
+
+    env_kwargs = {'blitz': args.blitz, 'bulk_allocation': args.bulk, 'record': None,
+                  'verbose': False}
+    if args.turn_cap is not None:
+        env_kwargs['turn_cap'] = args.turn_cap
+
+    env_class = runner.load(args.env, runner.ENVIRONMENTS)
+    agents = [runner.load(agent, runner.AGENTS)() for agent in args.agents]
+
+    profiler = Profiler(trace=args.trace is not None)
+    for seed in range(args.seed, args.seed + args.games):
+        env_class(agents, seed=seed, profiler=profiler, **env_kwargs).play()
+
+    print(profiler.report())
+    if args.trace is not None:
+        profiler.chrome_trace(args.trace)
+    if args.json is not None:
+        with open(args.json, 'w') as summary_file:
+            json.dump(profiler.summary(), summary_file, indent=2)
+
+def benchmark(args):
+    """
+    Runs the bench command and prints the results
+
+    Exits with status 1 if a metric regressed against the baseline.
+
+    Required Parameters
+    -------------------
+    args : argparse.Namespace
+        Parsed arguments
+
+    Returns
+    -------
+    None
+
+    """
+
+    from rlrisk import benchmark as benchmarking
+
+    report = benchmarking.run(args.games, args.number, args.configs, not args.no_gui)
+    if args.out is not None:
+        benchmarking.save(report, args.out)
+
+    rows = None
+    if args.baseline is not None:
+        rows = benchmarking.compare(report, args.baseline, args.tolerance)
+    benchmarking.print_report(report, rows)
+
+    if rows and any(row[-1] for row in rows):
+        sys.exit(1)
+
+def main(argv=None):
+    """
+    Entry point of the rlrisk command
+
+    Optional Parameters
+    -------------------
+    argv : List of Strings
+        Command line arguments
+
+        sys.argv[1:] by default
+
+    Returns
+    -------
+    None
+
+    """
+
+    args = parser().parse_args(sys.argv[1:] if argv is None else argv)
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -4,17 +4,82 @@ rlrisk.environment
 
 Available Modules
 -----------------
+actions
+    Fixed size action encoding with legal action masks
+
+batched
+    Lockstep environment for playing many games of Risk at once
+
+battle
+    Precomputed battle outcome tables for resolving attacks in one step
+
+board
+    Compiled array and bitmask form of the game board
+
+capture
+    Offscreen rendering of recorded games to images or frame arrays
+
+cards
+    Card deck with draw pile and players' hands
+
 config
     Functions for configuring game settings
 
 gui
     GUI for observing game environment
 
+maps
+    Boards loaded from map files or generated with any number of territories
+
+profiler
+    Timing of game phases and agent decisions, with Chrome trace export
+
+recorder
+    Compact buffers for recording game states
+
+replay
+    Seekable playback of recorded games on the GUI
+
+renderer
+    GUI drawn on a background thread at a capped frame rate
+
 risk
     Environment for Risk board game
+
+rng
+    Seedable random streams for games
+
+snapshot
+    Compact, picklable positions of a game and undo journal marks
+
+sink
+    Streaming of game records to memory-mapped shard files
+
+trades
+    Lazily drawn table of card set trade in rewards
+
+vector
+    Environments stepped together in worker processes
 '''
 
 from .gui import GUI
+from .maps import Map, MapGUI
+from .renderer import Renderer
+from .actions import ActionSpace
 from .risk import Risk
+from .batched import BatchedRisk
+from .battle import BattleTable
+from .board import CompiledBoard
+from .cards import CardDeck
+from .rng import GameRNG
+from .recorder import Recorder
+from .profiler import Profiler
+from .trades import TradeTable
+from .snapshot import Snapshot, Mark
+from .sink import TrajectorySink, TrajectoryDataset
+from .replay import Replay
+from .vector import VecRisk
 
-__all__ = ['GUI', 'Risk']
+__all__ = ['GUI', 'Map', 'MapGUI', 'Renderer', 'ActionSpace', 'Risk', 'BatchedRisk', 'BattleTable',
+           'CompiledBoard', 'CardDeck', 'GameRNG', 'Profiler', 'Recorder', 'TradeTable', 'Snapshot',
+           'Mark', 'TrajectorySink', 'TrajectoryDataset', 'Replay', 'VecRisk']
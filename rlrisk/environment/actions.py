@@ -0,0 +1,211 @@
+'''
+This module holds the ActionSpace class, a fixed size
+encoding of the choices of every action code with legal
+action masks and the decoding back to option values
+'''
+
+import numpy as np
+from rlrisk.environment.cards import FACES, SET_PATTERNS
+
+#action codes that choose a territory, 4 may also choose not to fortify
+TERRITORY_CODES = (0, 4, 5, 9, 10)
+
+#action codes that choose an attack, or not to attack
+ATTACK_CODES = (1, 11)
+
+#action codes that choose one of two territories, or how many troops go
+#to the second in one decision
+PAIR_CODES = (6, 7)
+SPLIT_CODES = (15, 16)
+
+#action codes that distribute troops over territories in one decision
+BULK_CODES = (13, 14)
+
+class ActionSpace(object):
+    """Fixed width action encoding per action code for a board"""
+
+    def __init__(self, compiled, card_faces, stop_levels=30):
+        """
+        ActionSpace Constructor
+
+        Every action code gets a fixed number of columns, so a policy can
+        score every column and mask out the illegal ones:
+            0, 4, 5, 9, 10 = One per territory, then not fortifying
+            1, 11 = One per directed edge of the board (compiled.edges),
+                    then not attacking
+            2 = Press the attack, retreat
+            3 = Risk 1, 2 or 3 troops
+            6, 7 = The first or second territory of the pair
+            8 = One per card set pattern (SET_PATTERNS), then not trading
+            12 = Stop at 1 to stop_levels troops
+            13, 14 = One per territory, all troops go there
+            15, 16 = Send none, send all
+
+        Required Parameters
+        -------------------
+        compiled : CompiledBoard
+            The board of the game
+
+        card_faces : dictionary
+            Card IDs as keys for card face values
+
+        Optional Parameters
+        -------------------
+        stop_levels : integer
+            Number of blitz stop thresholds that can be chosen
+
+            30 by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.compiled = compiled
+        num_edges = len(compiled.edges)
+
+        #edges are sorted by (from, to), so the edge index of a pair is found
+        #by binary search on from * size + to, without a size by size table
+        self.edge_keys = compiled.edge_src * compiled.size + compiled.edge_dst
+
+        self.faces = np.array([FACES.index(card_faces[card]) for card in sorted(card_faces)])
+        self.patterns = dict((tuple(pattern), num)
+                             for num, pattern in enumerate(SET_PATTERNS.tolist()))
+
+        self.widths = {2: 2, 3: 3, 8: len(SET_PATTERNS) + 1, 12: stop_levels}
+        for code in TERRITORY_CODES:
+            self.widths[code] = compiled.size + 1
+        for code in ATTACK_CODES:
+            self.widths[code] = num_edges + 1
+        for code in PAIR_CODES + SPLIT_CODES:
+            self.widths[code] = 2
+        for code in BULK_CODES:
+            self.widths[code] = compiled.size
+        self.size = max(self.widths.values())
+
+        #option value of each column for action codes whose options never change
+        territories = list(range(compiled.size)) + [False]
+        attacks = [tuple(edge) for edge in compiled.edges.tolist()] + [False]
+        self.tables = {2: [True, False], 3: [1, 2, 3], 12: list(range(1, stop_levels + 1))}
+        for code in TERRITORY_CODES:
+            self.tables[code] = territories
+        for code in ATTACK_CODES:
+            self.tables[code] = attacks
+
+    def edge_index(self, attacks):
+        """
+        Columns of attacks for action codes 1 and 11
+
+        Required Parameters
+        -------------------
+        attacks : (?, 2) Numpy Array
+            (attacking_from, attacking_to) pairs of adjacent territories
+
+        Returns
+        -------
+        (?,) Numpy Array : Index of each pair in compiled.edges
+        """
+
+        keys = attacks[:, 0] * self.compiled.size + attacks[:, 1]
+        return np.searchsorted(self.edge_keys, keys)
+
+    def pattern(self, card_set):
+        """
+        Column of a card set for action code 8
+
+        Required Parameters
+        -------------------
+        card_set : List
+            Card IDs of the set, or False for not trading
+
+        Returns
+        -------
+        integer
+        """
+
+        if card_set is False:
+            return len(SET_PATTERNS)
+        counts = np.bincount(self.faces[card_set], minlength=len(FACES))
+        return self.patterns[tuple(counts.tolist())]
+
+    def mask(self, action_code, options):
+        """
+        Legal columns of a decision
+
+        Required Parameters
+        -------------------
+        action_code : integer
+            The action code of the decision
+
+        options : Any
+            The options of the decision, as given to take_action
+
+        Returns
+        -------
+        (size,) Numpy Array of booleans :
+            True for legal columns, columns past the width of the action
+            code are always False
+        """
+
+        mask = np.zeros(self.size, dtype=bool)
+        width = self.widths[action_code]
+
+        if action_code in TERRITORY_CODES and isinstance(options, np.ndarray):
+            mask[options] = True
+        elif action_code in TERRITORY_CODES:
+            chosen = [option for option in options if option is not False]
+            mask[chosen] = True
+            mask[width - 1] = len(chosen) != len(options)
+        elif action_code in ATTACK_CODES:
+            attacks = np.array([option for option in options if option is not False],
+                               dtype=int).reshape(-1, 2)
+            mask[self.edge_index(attacks)] = True
+            mask[width - 1] = len(attacks) != len(options)
+        elif action_code == 3:
+            mask[np.array(options, dtype=int) - 1] = True
+        elif action_code == 8:
+            mask[[self.pattern(option) for option in options]] = True
+        elif action_code == 12:
+            mask[:min(width, len(options))] = True
+        elif action_code in BULK_CODES:
+            mask[options[1]] = True
+        else:
+            mask[:width] = True
+
+        return mask
+
+    def decode(self, action_code, index, options):
+        """
+        Option value of a column
+
+        Required Parameters
+        -------------------
+        action_code : integer
+            The action code of the decision
+
+        index : integer
+            The chosen column, which must be legal
+
+        options : Any
+            The options of the decision, as given to take_action
+
+        Returns
+        -------
+        ? : What take_action would return for the choice
+        """
+
+        if not self.mask(action_code, options)[index]:
+            raise ValueError("Column " + str(index) + " is not a legal choice for action code " +
+                             str(action_code))
+
+        if action_code in self.tables:
+            return self.tables[action_code][index]
+        elif action_code in PAIR_CODES:
+            return options[index]
+        elif action_code == 8:
+            return next(option for option in options if self.pattern(option) == index)
+        elif action_code in BULK_CODES:
+            troops, valid = options
+            return np.where(valid == index, troops, 0)
+        return options[0] * index
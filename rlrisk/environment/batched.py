@@ -0,0 +1,965 @@
+'''
+This module holds the BatchedRisk Class which plays many
+games of Risk in lockstep, storing every game as a slice
+of stacked NumPy arrays so that each phase of the game is
+advanced for all games at once
+'''
+
+import math
+import numpy as np
+from rlrisk.environment import Risk
+from rlrisk.environment.board import CompiledBoard
+from rlrisk.environment.cards import SET_PATTERNS
+from rlrisk.environment.trades import TradeTable
+
+def random_policy(observation, action_code, mask, rng):
+    """
+    Batched policy that makes a random valid choice for every game
+
+    Required Parameters
+    -------------------
+    observation : 4 value tuple
+        (n, 42, 2) Numpy Array : Territory owner and troop count per game
+        (n, 44) Numpy Array : Card status per game
+        (n,) Numpy Array : Number of card sets traded in per game
+        (n,) Numpy Array : The player making the decision in each game
+
+    action_code : integer
+        The action code of the decision, see BaseAgent.take_action
+
+    mask : (n, ?) Numpy Array of booleans
+        Valid choices for each game
+
+    rng : Numpy Generator
+        The random stream of the games, so seeded games can be replayed
+
+    Returns
+    -------
+    (n,) Numpy Array : Index of the chosen column of mask for each game
+    """
+
+    scores = rng.random(mask.shape)
+    scores[~mask] = -1
+    return scores.argmax(1)
+
+def aggressive_policy(observation, action_code, mask, rng):
+    """
+    Batched counterpart of AggressiveAgent
+
+    Never passes on an attack, risks as many troops as possible, moves as
+    many troops as possible into conquered territory and otherwise chooses
+    randomly. Parameters are the same as random_policy.
+    """
+
+    #the last column is "pass" for attacks and the largest amount for dice and moves
+    if action_code in [1, 3, 7]:
+        if action_code == 1:
+            scores = rng.random(mask.shape)
+            scores[:, -1] = -0.5
+        else:
+            scores = np.tile(np.arange(mask.shape[1], dtype=float), (mask.shape[0], 1))
+        scores[~mask] = -1
+        return scores.argmax(1)
+
+    return random_policy(observation, action_code, mask, rng)
+
+class BatchedRisk(object):
+    """Lockstep environment for many games of Risk World Domination"""
+
+    def __init__(self, num_games, policies, turn_order="c", trade_vals="s",
+                 steal_cards=False, turn_cap=math.inf, max_attacks=100, seed=None):
+        """
+        BatchedRisk Constructor
+
+        Stores num_games games as stacked arrays. Every game uses the same
+        ruleset and the same seats, with seat i being played by policies[i]
+        in every game.
+
+        The games follow the rules of Risk with its default settings, the
+        same decisions being asked with the same action codes, except that
+            the board is always the classic board and territories are dealt
+            attacks are chosen every round of combat with action code 1, which
+            replaces pressing an attack (action code 2) and attacking again
+            from a conquered territory (action code 11)
+            a player fights at most max_attacks rounds of combat a turn
+            fortifying asks for a pair of adjacent territories at once with
+            action code 4, instead of a source and a destination (action code 5)
+            card sets are traded in before recruited troops are placed, not after
+            recruited troops are all placed on the board as it was before
+            placing, not one after another
+            defeated players' cards go back to the deck unless steal_cards is set
+            blitz combat and bulk allocation are not available
+
+        Required Parameters
+        -------------------
+        num_games : integer
+            The number of games to play at once
+
+        policies : List, 2 <= len(policies) <= 6
+            Batched policies, one per player. A batched policy is a function
+            policy(observation, action_code, mask, rng) that returns the index
+            of a True column of mask for each game it is asked about, see
+            random_policy
+
+        Optional Parameters
+        -------------------
+        turn_order : String "c"/"r" or List
+            Same as for Risk, "c" and "r" are drawn separately for each game
+
+            "c" by default
+
+        trade_vals : String "s"/"1" (letter one), Generator or TradeTable
+            Same as for Risk
+
+            "s" by default
+
+        steal_cards : boolean
+            Whether or not defeated player's card go to the player that defeated them
+
+            False by default
+
+        turn_cap : integer
+            Stops a game if it exceeds a given number of turns
+
+            Infinity by default
+
+        max_attacks : integer
+            Maximum number of combat rounds a player may fight in one turn
+
+            100 by default
+
+        seed : integer, Numpy SeedSequence, Numpy Generator or None
+            Seed of the random stream of the games, which the policies are
+            handed too. Games played from the same seed are the same
+
+            None by default, for fresh entropy
+
+        Returns
+        -------
+        None
+
+        """
+
+        if len(policies) < 2 or len(policies) > 6:
+            raise ValueError("Invalid size for policies. Must be 2<=len(policies)<=6")
+
+        self.num_games = num_games
+        self.policies = policies
+        self.num_players = len(policies)
+        self.policy_ids = np.array([policies.index(policy) for policy in policies])
+        self.steal_cards = steal_cards
+        self.turn_cap = turn_cap
+        self.max_attacks = max_attacks
+        self.rng = np.random.default_rng(seed)
+
+        if isinstance(trade_vals, TradeTable):
+            self.trade_table = trade_vals
+        else:
+            self.trade_table = TradeTable(trade_vals)
+
+        self.board, self.continents, card_faces, self.con_rewards = Risk.gen_board()
+        self.num_territories = len(self.board)
+
+        #directed edge list of the board, used to index attacks and fortifies
+        self.compiled = CompiledBoard(self.board, self.continents, self.con_rewards)
+        self.edges = self.compiled.edges
+
+        #territory by continent membership, and continent rewards
+        names = sorted(self.continents)
+        self.continent_matrix = np.zeros((self.num_territories, len(names)), dtype=int)
+        for index, name in enumerate(names):
+            self.continent_matrix[self.continents[name], index] = 1
+        self.continent_sizes = self.continent_matrix.sum(0)
+        self.continent_values = np.array([self.con_rewards[name] for name in names])
+
+        #card faces as index into (1, 5, 10, wild)
+        face_index = {1:0, 5:1, 10:2, 99:3}
+        self.card_faces = np.array([face_index[card_faces[card]]
+                                    for card in sorted(card_faces)])
+
+        self.turn_order = self.gen_turn_order(turn_order)
+
+        state = Risk.gen_init_state(self.num_territories)
+        self.territories = np.repeat(state[0][None], num_games, 0)
+        self.cards = np.repeat(state[1][None], num_games, 0)
+        self.trade_ins = np.zeros(num_games, dtype=int)
+        self.turn_count = np.zeros(num_games, dtype=int)
+        self.defeated = np.zeros((num_games, self.num_players), dtype=bool)
+        self.game_over = np.zeros(num_games, dtype=bool)
+        self.winners = np.repeat(-1, num_games)
+        self.record = {0:[], 1:[], 2:[], 3:[], 4:[]}
+
+    def gen_turn_order(self, turn_order):
+        """
+        Generates the turn order of every game
+
+        Required Parameters
+        -------------------
+        turn_order : String "c"/"r" or List
+            See constructor
+
+        Returns
+        -------
+        (num_games, players) Numpy Array : Turn order of each game
+        """
+
+        num_games, players = self.num_games, self.num_players
+
+        if not isinstance(turn_order, str):
+            return np.tile(np.array(turn_order), (num_games, 1))
+
+        if turn_order.lower() == "c":
+            first = self.rng.integers(0, players, num_games)
+            return (first[:, None] + np.arange(players)) % players
+
+        if turn_order.lower() == "r":
+            return self.rng.random((num_games, players)).argsort(1)
+
+        raise ValueError("Error generating player order, unknown setting " + turn_order)
+
+    def play(self):
+        """
+        Play all the games
+
+        Deals territories and places starting troops, then advances every
+        game one phase at a time until all of them have a winner or reached
+        the turn cap.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        List of 6 value tuples
+            The same record that Risk.play returns, one per game
+
+        """
+
+        self.allocate_territories()
+        self.place_starting_troops()
+
+        while not self.game_over.all():
+            active = np.where(~self.game_over)[0]
+
+            self.record_state(active)
+
+            players = self.current_players(active)
+
+            self.recruitment_phase(active, players)
+
+            self.attack_phase(active, players)
+
+            #games that were won end without fortifying or counting the turn
+            won = self.winner(active)
+            self.winners[active[won]] = players[won]
+            self.game_over[active[won]] = True
+            active, players = active[~won], players[~won]
+
+            self.fortify_phase(active, players)
+
+            self.turn_count[active] += 1
+            self.game_over[active[self.turn_count[active] > self.turn_cap]] = True
+
+        return self.game_records()
+
+    def game_records(self):
+        """
+        Collects the record of every game
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        List of 6 value tuples
+            Same as the return value of Risk.play, with the same int8 and
+            int16 arrays
+
+        """
+
+        board_size, num_cards = self.territories.shape[1], self.cards.shape[1]
+        if not self.record[4]:
+            arrays = (np.empty((0, board_size), dtype=np.int8),
+                      np.empty((0, board_size), dtype=np.int16),
+                      np.empty((0, num_cards), dtype=np.int8), np.empty(0, dtype=np.int16))
+            return [arrays + (self.turn_order[game].tolist(), self.steal_cards)
+                    for game in range(self.num_games)]
+
+        #rows of all turns grouped by game, turns stay in order within a game
+        games = np.concatenate(self.record[4])
+        order = np.argsort(games, kind='stable')
+        splits = np.cumsum(np.bincount(games, minlength=self.num_games))[:-1]
+        arrays = [np.split(np.concatenate(self.record[num])[order], splits) for num in range(4)]
+
+        return [(owners, troops, cards, trades, self.turn_order[game].tolist(), self.steal_cards)
+                for game, (owners, troops, cards, trades) in enumerate(zip(*arrays))]
+
+    def record_state(self, games):
+        """
+        Records the state of the active games at the beginning of a turn
+
+        States are kept as int8 and int16 like Recorder, troop counts too
+        large for int16 are kept as int64.
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the active games
+
+        Returns
+        -------
+        None
+
+        """
+
+        troops = self.territories[games, :, 1]
+        if troops.size == 0 or troops.max() <= np.iinfo(np.int16).max:
+            troops = troops.astype(np.int16)
+
+        self.record[0].append(self.territories[games, :, 0].astype(np.int8))
+        self.record[1].append(troops)
+        self.record[2].append(self.cards[games].astype(np.int8))
+        self.record[3].append(self.trade_ins[games].astype(np.int16))
+        self.record[4].append(games)
+
+    def current_players(self, games):
+        """
+        Gets whose turn it is in each game, skipping defeated players
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        Returns
+        -------
+        (n,) Numpy Array : The player whose turn it is in each game
+        """
+
+        while True:
+            players = self.turn_order[games, self.turn_count[games] % self.num_players]
+            skip = self.defeated[games, players]
+            if not skip.any():
+                return players
+            self.turn_count[games[skip]] += 1
+
+    def observe(self, games, players):
+        """
+        Builds the observation handed to batched policies
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The player deciding in each game
+
+        Returns
+        -------
+        4 value tuple : See random_policy
+        """
+
+        return (self.territories[games], self.cards[games],
+                self.trade_ins[games], players)
+
+    def ask(self, games, players, action_code, mask):
+        """
+        Asks the batched policies of each player for a decision
+
+        Groups games by the policy of the player that must decide and calls
+        each policy once for all of its games.
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The player deciding in each game
+
+        action_code : integer
+            The action code of the decision
+
+        mask : (n, ?) Numpy Array of booleans
+            The valid choices for each game
+
+        Returns
+        -------
+        (n,) Numpy Array : Chosen column of mask for each game
+        """
+
+        if len(games) == 0:
+            return np.zeros(0, dtype=int)
+
+        #players sharing a policy are asked together
+        policy_ids = self.policy_ids[players]
+        if (policy_ids == policy_ids[0]).all():
+            observation = self.observe(games, players)
+            choices = self.policies[policy_ids[0]](observation, action_code, mask, self.rng)
+        else:
+            choices = np.zeros(len(games), dtype=int)
+            for policy_id in np.unique(policy_ids):
+                rows = np.where(policy_ids == policy_id)[0]
+                observation = self.observe(games[rows], players[rows])
+                choices[rows] = self.policies[policy_id](observation, action_code, mask[rows],
+                                                         self.rng)
+
+        if not mask[np.arange(len(games)), choices].all():
+            raise ValueError("Policy chose an invalid option for action code " +
+                             str(action_code))
+
+        return choices
+
+    def owned(self, games, players):
+        """
+        Territory ownership mask of the given players
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The player in each game
+
+        Returns
+        -------
+        (n, 42) Numpy Array of booleans
+        """
+
+        return self.territories[games, :, 0] == players[:, None]
+
+    def allocate_territories(self):
+        """
+        Randomly deals territories to players in turn order
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        games = np.arange(self.num_games)[:, None]
+        dealt = self.rng.random((self.num_games, self.num_territories)).argsort(1)
+        seats = np.arange(self.num_territories) % self.num_players
+
+        self.territories[games, dealt, 0] = self.turn_order[games, seats]
+        self.territories[games, dealt, 1] = 1
+
+    def place_starting_troops(self):
+        """
+        Players place their starting troops one by one in turn order
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        games = np.arange(self.num_games)
+        s_troops = Risk.starting_troops(self.num_players)
+        remaining = np.zeros((self.num_games, self.num_players), dtype=int)
+        for player in range(self.num_players):
+            remaining[:, player] = s_troops - self.owned(
+                games, np.repeat(player, self.num_games)).sum(1)
+
+        while remaining.any():
+            for seat in range(self.num_players):
+                players = self.turn_order[:, seat]
+                placing = remaining[games, players] > 0
+                self.place_troops(games[placing], players[placing], 10)
+                remaining[games[placing], players[placing]] -= 1
+
+    def place_troops(self, games, players, action_code=0):
+        """
+        Each player places a single troop in territory they own
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The player placing a troop in each game
+
+        Optional Parameters
+        -------------------
+        action_code : integer
+            0 by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        if len(games) == 0:
+            return
+
+        chosen = self.ask(games, players, action_code, self.owned(games, players))
+        self.territories[games, chosen, 1] += 1
+
+    def calculate_recruits(self, games, players):
+        """
+        Calculates the number of troops recruited at turn start
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The player recruiting in each game
+
+        Returns
+        -------
+        (n,) Numpy Array : The number of troops to be recruited
+        """
+
+        owned = self.owned(games, players)
+        recruits = np.maximum(owned.sum(1) // 3, 3)
+        continents_owned = owned.astype(int).dot(self.continent_matrix) == self.continent_sizes
+        return recruits + continents_owned.dot(self.continent_values)
+
+    def recruitment_phase(self, games, players):
+        """
+        Executes recruitment phase for every game
+
+        Places recruited troops, then lets players with a card set trade it
+        in (which is required once they hold 5 or more cards) and place the
+        troops awarded.
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The player taking their turn in each game
+
+        Returns
+        -------
+        None
+
+        """
+
+        recruits = self.calculate_recruits(games, players)
+        recruits += self.trade_in(games, players)
+        self.place_all(games, players, recruits)
+
+    def place_all(self, games, players, troops):
+        """
+        Each player places troops in territory they own
+
+        The territory of every troop is chosen seeing the board before any
+        of them is placed.
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The player placing troops in each game
+
+        troops : (n,) Numpy Array
+            The number of troops placed in each game
+
+        Returns
+        -------
+        None
+
+        """
+
+        #placing never changes which territories a player owns, so every
+        #troop is asked for at once, one row per troop
+        troops = np.asarray(troops)
+        games, players = np.repeat(games, troops), np.repeat(players, troops)
+        if len(games) == 0:
+            return
+
+        chosen = self.ask(games, players, 0, self.owned(games, players))
+        np.add.at(self.territories, (games, chosen, 1), 1)
+
+    def trade_in(self, games, players):
+        """
+        Lets players trade in a card set
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The player taking their turn in each game
+
+        Returns
+        -------
+        (n,) Numpy Array : The number of troops awarded in each game
+        """
+
+        awarded = np.zeros(len(games), dtype=int)
+
+        hands = self.cards[games] == players[:, None]
+        counts = np.zeros((len(games), 4), dtype=int)
+        for face in range(4):
+            counts[:, face] = (hands & (self.card_faces == face)).sum(1)
+
+        valid = (counts[:, None, :] >= SET_PATTERNS[None]).all(2)
+        trading = valid.any(1)
+        if not trading.any():
+            return awarded
+
+        #last column is choosing not to trade, allowed below 5 cards
+        mask = np.concatenate([valid, (hands.sum(1) < 5)[:, None]], 1)[trading]
+        rows = np.where(trading)[0]
+        chosen = self.ask(games[rows], players[rows], 8, mask)
+        traded = chosen < len(SET_PATTERNS)
+        rows, chosen = rows[traded], chosen[traded]
+
+        #return the lowest numbered cards of each required face to the deck
+        for face in range(4):
+            candidates = hands[rows] & (self.card_faces == face)
+            needed = SET_PATTERNS[chosen, face]
+            remove = candidates & (candidates.cumsum(1) <= needed[:, None])
+            cards = self.cards[games[rows]]
+            cards[remove] = 6
+            self.cards[games[rows]] = cards
+
+        awarded[rows] = self.trade_table[self.trade_ins[games[rows]]]
+        self.trade_ins[games[rows]] += 1
+
+        return awarded
+
+    def attack_phase(self, games, players):
+        """
+        Executes attack phase for every game
+
+        Each step every player still attacking chooses an attack (or to
+        stop), how many troops to risk, and a single round of combat is
+        fought in all those games at once. Players may choose a new attack
+        every round. Conquering a territory asks the player how many extra
+        troops to move in.
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The player taking their turn in each game
+
+        Returns
+        -------
+        None
+
+        """
+
+        conquered = np.zeros(len(games), dtype=bool)
+        attacking = np.ones(len(games), dtype=bool)
+        src, dst = self.edges[:, 0], self.edges[:, 1]
+
+        for _ in range(self.max_attacks):
+            rows = np.where(attacking)[0]
+            if len(rows) == 0:
+                break
+            gms, plrs = games[rows], players[rows]
+
+            owners = self.territories[gms, :, 0]
+            troops = self.territories[gms, :, 1]
+            valid = ((owners[:, src] == plrs[:, None]) & (owners[:, dst] != plrs[:, None]) &
+                     (troops[:, src] > 1))
+            mask = np.concatenate([valid, np.ones((len(rows), 1), dtype=bool)], 1)
+
+            chosen = self.ask(gms, plrs, 1, mask)
+            stop = chosen == len(self.edges)
+            attacking[rows[stop]] = False
+            rows, gms, plrs, chosen = rows[~stop], gms[~stop], plrs[~stop], chosen[~stop]
+
+            won = self.combat(gms, plrs, self.edges[chosen])
+            conquered[rows[won]] = True
+
+            if won.any():
+                self.after_attack_reinforce(gms[won], plrs[won], self.edges[chosen[won]])
+                victims = self.defeated_players(gms[won])
+                self.defeat(gms[won], victims, plrs[won])
+
+            #a player that owns the whole board stops attacking
+            attacking[rows[self.winner(gms)]] = False
+
+        if conquered.any():
+            self.reward_card(games[conquered], players[conquered])
+
+    def combat(self, games, players, attacks):
+        """
+        Fights one round of combat in every game
+
+        Attackers choose how many troops to risk and roll a die for each (up
+        to 3, always leaving one troop behind), defenders roll up to 2.
+        Highest pairs are compared and ties go to the defender. Conquered
+        territories change owner and the surviving attacking troops move in.
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The attacking player in each game
+
+        attacks : (n, 2) Numpy Array
+            The territory IDs of (attacking_from, attacking_to) per game
+
+        Returns
+        -------
+        (n,) Numpy Array of booleans : Whether the attack conquered the territory
+        """
+
+        frm, to = attacks[:, 0], attacks[:, 1]
+        attack_troops = self.territories[games, frm, 1]
+        defend_troops = self.territories[games, to, 1]
+
+        #column i of the choice is risking i+1 troops
+        mask = np.arange(3) < (attack_troops - 1)[:, None]
+        a_dice = self.ask(games, players, 3, mask) + 1
+        d_dice = np.minimum(defend_troops, 2)
+
+        #unused dice roll 0 so they sort to the back
+        a_rolls = self.rng.integers(1, 7, (len(games), 3))
+        d_rolls = self.rng.integers(1, 7, (len(games), 2))
+        a_rolls[np.arange(3) >= a_dice[:, None]] = 0
+        d_rolls[np.arange(2) >= d_dice[:, None]] = 0
+        a_rolls = -np.sort(-a_rolls, 1)[:, :2]
+        d_rolls = -np.sort(-d_rolls, 1)
+
+        compared = np.arange(2) < np.minimum(a_dice, d_dice)[:, None]
+        a_wins = compared & (a_rolls > d_rolls)
+        a_loss = (compared & ~a_wins).sum(1)
+        d_loss = a_wins.sum(1)
+
+        attack_troops -= a_loss
+        defend_troops -= d_loss
+        won = defend_troops == 0
+        moved = np.where(won, a_dice - a_loss, 0)
+
+        self.territories[games, frm, 1] = attack_troops - moved
+        self.territories[games, to, 1] = np.where(won, moved, defend_troops)
+        self.territories[games, to, 0] = np.where(
+            won, self.territories[games, frm, 0], self.territories[games, to, 0])
+
+        return won
+
+    def after_attack_reinforce(self, games, players, attacks):
+        """
+        Players choose how many extra troops follow into conquered territory
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The attacking player in each game
+
+        attacks : (n, 2) Numpy Array
+            The territory IDs of (attacking_from, attacking_to) per game
+
+        Returns
+        -------
+        None
+
+        """
+
+        frm, to = attacks[:, 0], attacks[:, 1]
+        movable = self.territories[games, frm, 1] - 1
+        mask = np.arange(movable.max() + 1) <= movable[:, None]
+
+        moved = self.ask(games, players, 7, mask)
+        self.territories[games, frm, 1] -= moved
+        self.territories[games, to, 1] += moved
+
+    def fortify_phase(self, games, players):
+        """
+        Executes fortify phase for every game
+
+        Players choose a pair of adjacent owned territories (or not to
+        fortify) and then how many troops to move between them.
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The player taking their turn in each game
+
+        Returns
+        -------
+        None
+
+        """
+
+        if len(games) == 0:
+            return
+
+        src, dst = self.edges[:, 0], self.edges[:, 1]
+        owners = self.territories[games, :, 0]
+        troops = self.territories[games, :, 1]
+        valid = ((owners[:, src] == players[:, None]) & (owners[:, dst] == players[:, None]) &
+                 (troops[:, src] > 1))
+        mask = np.concatenate([valid, np.ones((len(games), 1), dtype=bool)], 1)
+
+        chosen = self.ask(games, players, 4, mask)
+        moving = chosen < len(self.edges)
+        games, players, chosen = games[moving], players[moving], chosen[moving]
+        if len(games) == 0:
+            return
+
+        frm, to = self.edges[chosen, 0], self.edges[chosen, 1]
+        movable = self.territories[games, frm, 1] - 1
+        mask = (np.arange(movable.max() + 1) <= movable[:, None])
+        mask[:, 0] = False
+
+        moved = self.ask(games, players, 6, mask)
+        self.territories[games, frm, 1] -= moved
+        self.territories[games, to, 1] += moved
+
+    def reward_card(self, games, players):
+        """
+        Deals a random card from the deck to each player
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The player recieving a card in each game
+
+        Returns
+        -------
+        None
+
+        """
+
+        in_deck = self.cards[games] == 6
+        scores = self.rng.random(in_deck.shape)
+        scores[~in_deck] = -1
+        drawn = scores.argmax(1)
+        has_card = in_deck.any(1)
+        self.cards[games[has_card], drawn[has_card]] = players[has_card]
+
+    def defeated_players(self, games):
+        """
+        Finds players that were just defeated
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        Returns
+        -------
+        (n, players) Numpy Array of booleans : Newly defeated players
+        """
+
+        owners = self.territories[games, :, 0]
+        alive = (owners[:, :, None] == np.arange(self.num_players)).any(1)
+        return ~alive & ~self.defeated[games]
+
+    def defeat(self, games, victims, conquerers):
+        """
+        Marks players as defeated and hands over their cards
+
+        Defeated players' cards go back into the deck, or to the player
+        that defeated them if the rules say so. As in Risk, a conquerer left
+        with 6 or more cards must trade in sets until they hold 4 or fewer,
+        placing the troops awarded at once.
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        victims : (n, players) Numpy Array of booleans
+            Players defeated in each game
+
+        conquerers : (n,) Numpy Array
+            The player that defeated them
+
+        Returns
+        -------
+        None
+
+        """
+
+        rows, victim = np.where(victims)
+        if len(rows) == 0:
+            return
+
+        self.defeated[games[rows], victim] = True
+
+        new_owner = conquerers[rows] if self.steal_cards else np.repeat(6, len(rows))
+        cards = self.cards[games[rows]]
+        lost = cards == victim[:, None]
+        cards[lost] = np.broadcast_to(new_owner[:, None], cards.shape)[lost]
+        self.cards[games[rows]] = cards
+
+        if self.steal_cards:
+            self.forced_trades(games[rows], conquerers[rows])
+
+    def forced_trades(self, games, players):
+        """
+        Players holding too many cards after a defeat trade them in
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        players : (n,) Numpy Array
+            The player that took the cards in each game
+
+        Returns
+        -------
+        None
+
+        """
+
+        #more than 5 cards forces the first trade, more than 4 the ones after
+        limit = 5
+        while len(games):
+            held = (self.cards[games] == players[:, None]).sum(1)
+            games, players = games[held > limit], players[held > limit]
+            if len(games) == 0:
+                return
+            self.place_all(games, players, self.trade_in(games, players))
+            limit = 4
+
+    def winner(self, games):
+        """
+        Checks which games have a winner
+
+        Required Parameters
+        -------------------
+        games : (n,) Numpy Array
+            Indices of the games
+
+        Returns
+        -------
+        (n,) Numpy Array of booleans : Whether each game has a winner
+        """
+
+        owners = self.territories[games, :, 0]
+        return (owners == owners[:, :1]).all(1)
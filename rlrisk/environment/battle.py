@@ -0,0 +1,248 @@
+'''
+This module holds the BattleTable class, precomputed
+distributions of how a battle ends, used to resolve a
+whole attack ("blitz") in a single step
+'''
+
+import random
+import itertools
+import numpy as np
+
+_TABLES = {}
+
+def battle_table(cap=30):
+    """
+    Gets the shared BattleTable for a cap, building it on first use
+
+    Optional Parameters
+    -------------------
+    cap : integer
+        Largest troop count of either side stored in the table
+
+        30 by default
+
+    Returns
+    -------
+    BattleTable
+    """
+
+    if cap not in _TABLES:
+        _TABLES[cap] = BattleTable(cap)
+    return _TABLES[cap]
+
+def round_odds(attack_dice, defend_dice):
+    """
+    Probability of each result of a single round of combat
+
+    Enumerates every roll of the dice, comparing the highest pairs with
+    ties going to the defender.
+
+    Required Parameters
+    -------------------
+    attack_dice : integer
+        Number of dice rolled by the attacker, 1 to 3
+
+    defend_dice : integer
+        Number of dice rolled by the defender, 1 or 2
+
+    Returns
+    -------
+    Dictionary : (attacker losses, defender losses) as keys for probability values
+    """
+
+    odds = {}
+    rolls = list(itertools.product(range(1, 7), repeat=attack_dice + defend_dice))
+    for roll in rolls:
+        a_rolls = sorted(roll[:attack_dice], reverse=True)
+        d_rolls = sorted(roll[attack_dice:], reverse=True)
+        a_loss = sum(a <= d for a, d in zip(a_rolls, d_rolls))
+        losses = (a_loss, min(attack_dice, defend_dice) - a_loss)
+        odds[losses] = odds.get(losses, 0) + 1 / len(rolls)
+    return odds
+
+class BattleTable(object):
+    """Final troop count distributions for battles fought to a stop threshold"""
+
+    def __init__(self, cap=30):
+        """
+        BattleTable Constructor
+
+        Computes the odds of a single round for every number of dice.
+        The distributions of whole battles are built per stop threshold
+        the first time that threshold is used.
+
+        Optional Parameters
+        -------------------
+        cap : integer
+            Largest troop count of either side stored in the table, larger
+            battles are fought round by round until both sides are within it
+
+            30 by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.cap = cap
+        self.odds = {}
+        for attack_dice in range(1, 4):
+            for defend_dice in range(1, 3):
+                self.odds[(attack_dice, defend_dice)] = round_odds(attack_dice, defend_dice)
+        self.tables = {}
+
+    def outcomes(self, stop):
+        """
+        Final outcome distribution of every battle with a stop threshold
+
+        The attacker keeps rolling as many dice as possible while they have
+        more than stop troops and the defender has troops left. Distributions
+        are found with dynamic programming over (attacker, defender) troop
+        counts, which only ever decrease.
+
+        Required Parameters
+        -------------------
+        stop : integer
+            The attacker stops once they have this many troops or fewer, 1
+            fights until one side is defeated
+
+        Returns
+        -------
+        2 value tuple
+            (cap+1, cap+1, K) Numpy Array: Cumulative probability of the K final
+                outcomes indexed by starting (attacker, defender) troops
+            (K, 2) Numpy Array: The final (attacker, defender) troops of each outcome
+
+        """
+
+        if stop in self.tables:
+            return self.tables[stop]
+
+        cap = self.cap
+        stop_rows = [stop - 1, stop] if stop > 1 else [1]
+
+        #attacker victories with a troops left, then stops with (a, d) troops left
+        finals = [(a, 0) for a in range(2, cap + 1)]
+        finals += [(a, d) for a in stop_rows for d in range(1, cap + 1)]
+        index = dict((final, num) for num, final in enumerate(finals))
+
+        dist = np.zeros((cap + 1, cap + 1, len(finals)))
+        for final, num in index.items():
+            dist[final][num] = 1
+
+        for attack in range(stop + 1, cap + 1):
+            attack_dice = min(3, attack - 1)
+            for defend in range(1, cap + 1):
+                odds = self.odds[(attack_dice, min(2, defend))]
+                for (a_loss, d_loss), prob in odds.items():
+                    dist[attack, defend] += prob * dist[attack - a_loss, defend - d_loss]
+
+        self.tables[stop] = (dist.cumsum(2), np.array(finals))
+        return self.tables[stop]
+
+    def distribution(self, attack_troops, defend_troops, stop=1):
+        """
+        Probability of every final outcome of a battle
+
+        Required Parameters
+        -------------------
+        attack_troops : integer
+            Troops in the attacking territory, at most cap
+
+        defend_troops : integer
+            Troops in the defending territory, at most cap
+
+        Optional Parameters
+        -------------------
+        stop : integer
+            See outcomes
+
+            1 by default
+
+        Returns
+        -------
+        Dictionary : (attacker, defender) final troops as keys for probability values
+        """
+
+        cdf, finals = self.outcomes(stop)
+        probs = np.diff(cdf[attack_troops, defend_troops], prepend=0)
+        return dict((tuple(finals[num].tolist()), prob)
+                    for num, prob in enumerate(probs) if prob > 0)
+
+    def fight_round(self, attack_troops, defend_troops, rand=random.random):
+        """
+        Samples the result of a single round where the attacker risks all they can
+
+        Required Parameters
+        -------------------
+        attack_troops : integer
+            Troops in the attacking territory
+
+        defend_troops : integer
+            Troops in the defending territory
+
+        Optional Parameters
+        -------------------
+        rand : function
+            Source of uniform random numbers in [0, 1)
+
+            random.random by default
+
+        Returns
+        -------
+        2 value tuple : Remaining (attacker, defender) troops
+        """
+
+        odds = self.odds[(min(3, attack_troops - 1), min(2, defend_troops))]
+        chance = rand()
+        for (a_loss, d_loss), prob in odds.items():
+            chance -= prob
+            if chance < 0:
+                break
+        return (attack_troops - a_loss, defend_troops - d_loss)
+
+    def resolve(self, attack_troops, defend_troops, stop=1, rand=random.random):
+        """
+        Samples the final troop counts of a whole battle
+
+        Battles larger than the cap are fought round by round until both
+        sides are within it, after which the rest of the battle takes a
+        single draw from the table.
+
+        Required Parameters
+        -------------------
+        attack_troops : integer
+            Troops in the attacking territory, at least 2
+
+        defend_troops : integer
+            Troops in the defending territory, at least 1
+
+        Optional Parameters
+        -------------------
+        stop : integer
+            See outcomes
+
+            1 by default
+
+        rand : function
+            Source of uniform random numbers in [0, 1)
+
+            random.random by default
+
+        Returns
+        -------
+        2 value tuple : Remaining (attacker, defender) troops
+        """
+
+        while attack_troops > stop and defend_troops > 0 and \
+                (attack_troops > self.cap or defend_troops > self.cap):
+            attack_troops, defend_troops = self.fight_round(attack_troops, defend_troops, rand)
+
+        if attack_troops <= stop or defend_troops == 0:
+            return (attack_troops, defend_troops)
+
+        cdf, finals = self.outcomes(stop)
+        num = np.searchsorted(cdf[attack_troops, defend_troops], rand(), side='right')
+        attack_troops, defend_troops = finals[min(num, len(finals) - 1)].tolist()
+        return (attack_troops, defend_troops)
@@ -0,0 +1,250 @@
+'''
+This module holds the CompiledBoard class, an array and
+bitmask form of the adjacency lists from Risk.gen_board
+that answers the graph queries made every turn
+'''
+
+import numpy as np
+
+class CompiledBoard(object):
+    """CSR neighbor arrays, edge list and bitmasks for a board"""
+
+    def __init__(self, board, continents=None, con_rewards=None):
+        """
+        CompiledBoard Constructor
+
+        Builds every representation once, so they can be shared by
+        every query made during a game.
+
+        Required Parameters
+        -------------------
+        board : dictionary
+            Adjacency lists for territories with ID as key, IDs must
+            be 0 to len(board)-1
+
+        Optional Parameters
+        -------------------
+        continents : dictionary
+            Continents as keys with a list of possessed territories as values
+
+            None by default
+
+        con_rewards : dictionary
+            Maps continents to the defined troop rewards per continent
+
+            None by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.size = len(board)
+        self.nbytes = (self.size + 7) // 8
+
+        #the graph in CSR form, built without a dense matrix so that boards of
+        #thousands of territories stay small
+        links = [sorted(set(board[terr])) for terr in range(self.size)]
+        self.indptr = np.concatenate([[0], np.cumsum([len(adj) for adj in links])]).astype(int)
+        self.indices = np.array([adj for adj_list in links for adj in adj_list], dtype=int)
+
+        #directed edge list, sorted by source then destination
+        self.edge_src = np.repeat(np.arange(self.size), np.diff(self.indptr))
+        self.edge_dst = self.indices
+        self.edges = np.stack([self.edge_src, self.edge_dst], 1)
+
+        #one integer bitmask per territory, and of its neighbors
+        self.bits = [1 << terr for terr in range(self.size)]
+        self.neighbor_masks = []
+        for adj_list in links:
+            n_mask = 0
+            for adj in adj_list:
+                n_mask |= self.bits[adj]
+            self.neighbor_masks.append(n_mask)
+        self.full_mask = (1 << self.size) - 1
+
+        continents = continents or {}
+        con_rewards = con_rewards or {}
+        self.continent_names = sorted(continents)
+        self.continent_masks = [self.mask(continents[name]) for name in self.continent_names]
+        self.continent_rewards = [con_rewards.get(name, 0) for name in self.continent_names]
+
+    def mask(self, territories):
+        """
+        Converts territories to a bitmask
+
+        Required Parameters
+        -------------------
+        territories : List or Numpy Array
+            Territory IDs, or a boolean array indexed by territory ID
+
+        Returns
+        -------
+        integer : Bitmask with bit i set for territory i
+        """
+
+        territories = np.asarray(territories)
+        if territories.dtype != bool:
+            flags = np.zeros(self.size, dtype=bool)
+            flags[territories] = True
+            territories = flags
+
+        packed = np.packbits(territories, bitorder='little')
+        return int.from_bytes(packed.tobytes(), 'little')
+
+    def ids(self, mask):
+        """
+        Converts a bitmask to territory IDs
+
+        Required Parameters
+        -------------------
+        mask : integer
+            Bitmask of territories
+
+        Returns
+        -------
+        (?,) Numpy Array : Territory IDs in increasing order
+        """
+
+        packed = np.frombuffer(mask.to_bytes(self.nbytes, 'little'), dtype=np.uint8)
+        return np.where(np.unpackbits(packed, bitorder='little')[:self.size])[0]
+
+    def owned_mask(self, territories, player):
+        """
+        Bitmask of the territories a player owns
+
+        Required Parameters
+        -------------------
+        territories : (42, 2) Numpy Array
+            Territory owner and troop count
+
+        player : integer
+            The index of the player
+
+        Returns
+        -------
+        integer : Bitmask of owned territories
+        """
+
+        return self.mask(territories[:, 0] == player)
+
+    def neighbors(self, mask):
+        """
+        Bitmask of all territories adjacent to any territory in a bitmask
+
+        Required Parameters
+        -------------------
+        mask : integer
+            Bitmask of territories
+
+        Returns
+        -------
+        integer : Bitmask of adjacent territories
+        """
+
+        reach = 0
+        while mask:
+            low = mask & -mask
+            reach |= self.neighbor_masks[low.bit_length() - 1]
+            mask ^= low
+        return reach
+
+    def borders(self, owned):
+        """
+        Bitmask of owned territories adjacent to territory not owned
+
+        Required Parameters
+        -------------------
+        owned : integer
+            Bitmask of owned territories
+
+        Returns
+        -------
+        integer : Bitmask of border territories
+        """
+
+        outside = self.full_mask & ~owned
+        borders = 0
+        mask = owned
+        while mask:
+            low = mask & -mask
+            if self.neighbor_masks[low.bit_length() - 1] & outside:
+                borders |= low
+            mask ^= low
+        return borders
+
+    def connected(self, source, owned):
+        """
+        Bitmask of territories contiguous with source through owned territory
+
+        Required Parameters
+        -------------------
+        source : integer
+            Territory ID to start from
+
+        owned : integer
+            Bitmask of territories that can be passed through
+
+        Returns
+        -------
+        integer : Bitmask of the contiguous region, including source
+        """
+
+        region = frontier = self.bits[source]
+        while frontier:
+            frontier = self.neighbors(frontier) & owned & ~region
+            region |= frontier
+        return region
+
+    def attacks(self, territories, player, frm=-1):
+        """
+        Gets all (from, to) pairs a player may attack
+
+        Required Parameters
+        -------------------
+        territories : (42, 2) Numpy Array
+            Territory owner and troop count
+
+        player : integer
+            The index of the attacking player
+
+        Optional Parameters
+        -------------------
+        frm : integer
+            Only attacks from this territory, -1 for any territory
+
+            -1 by default
+
+        Returns
+        -------
+        (?, 2) Numpy Array : Valid (attacking_from, attacking_to) territory IDs
+        """
+
+        owners = territories[:, 0]
+        valid = (owners[self.edge_src] == player) & (owners[self.edge_dst] != player)
+        if frm == -1:
+            valid &= territories[self.edge_src, 1] > 1
+        else:
+            valid &= self.edge_src == frm
+        return self.edges[valid]
+
+    def continent_bonus(self, owned):
+        """
+        Total reward for continents fully owned
+
+        Required Parameters
+        -------------------
+        owned : integer
+            Bitmask of owned territories
+
+        Returns
+        -------
+        integer : Sum of the rewards of owned continents
+        """
+
+        bonus = 0
+        for index, c_mask in enumerate(self.continent_masks):
+            if owned & c_mask == c_mask:
+                bonus += self.continent_rewards[index]
+        return bonus
@@ -0,0 +1,269 @@
+'''
+This module renders recorded games offscreen, to PNG image
+sequences or arrays of frames, with SDL's dummy video driver
+so that no display is needed
+'''
+
+import os
+import struct
+import zlib
+import multiprocessing
+import numpy as np
+import pygame
+from rlrisk.environment.gui import GUI
+from rlrisk.environment.sink import TrajectoryDataset
+
+def headless():
+    """
+    Makes pygame draw offscreen, unless another video driver was chosen
+
+    Must be called before the first GUI is created in the process.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    None
+
+    """
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+def record_states(records):
+    """
+    The game states of a record
+
+    Required Parameters
+    -------------------
+    records : tuple
+        Record of a game as returned by Risk.play, or by a TrajectoryDataset
+
+    Returns
+    -------
+    Generator of 3 value tuples : The state of every record, in order
+    """
+
+    owners, troops, cards, trade_ins = records[:4]
+    for num in range(len(owners)):
+        territories = np.stack([owners[num], troops[num]], 1).astype(int)
+        yield territories, cards[num].astype(int), int(trade_ins[num])
+
+def frames(records, gui_class=GUI):
+    """
+    Renders every record of a game
+
+    Frames after the first are drawn from the previous one, redrawing only
+    what changed.
+
+    Required Parameters
+    -------------------
+    records : tuple
+        Record of a game as returned by Risk.play
+
+    Optional Parameters
+    -------------------
+    gui_class : callable
+        Returns the GUI to render with, such as SWGUI for SouthernWarfare
+
+        GUI by default
+
+    Returns
+    -------
+    Generator of (height, width, 3) uint8 Numpy Arrays : RGB frames
+    """
+
+    headless()
+    gui = gui_class()
+    try:
+        for state in record_states(records):
+            gui.recolor(state)
+            width, height = gui.screen.get_size()
+            pixels = pygame.image.tostring(gui.screen, 'RGB')
+            yield np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 3)
+    finally:
+        gui.quit_game()
+
+def frame_array(records, gui_class=GUI):
+    """
+    Renders every record of a game into one array
+
+    Required Parameters
+    -------------------
+    records : tuple
+        Record of a game as returned by Risk.play
+
+    Optional Parameters
+    -------------------
+    gui_class : callable
+        Same as for frames
+
+    Returns
+    -------
+    (records, height, width, 3) uint8 Numpy Array : RGB frames
+    """
+
+    return np.stack(list(frames(records, gui_class)))
+
+def save_frames(records, directory, gui_class=GUI, fmt="png"):
+    """
+    Renders every record of a game to files
+
+    Required Parameters
+    -------------------
+    records : tuple
+        Record of a game as returned by Risk.play
+
+    directory : String
+        Where the files are written, created if missing
+
+    Optional Parameters
+    -------------------
+    gui_class : callable
+        Same as for frames
+
+    fmt : String "png"/"npy"
+        "png" = One image per record, frame_00000.png and on
+        "npy" = All frames in frames.npy, as frame_array returns them
+
+        "png" by default
+
+    Returns
+    -------
+    integer : The number of frames
+    """
+
+    if fmt not in ["png", "npy"]:
+        raise ValueError("Invalid frame format " + str(fmt))
+    os.makedirs(directory, exist_ok=True)
+
+    if fmt == "npy":
+        array = frame_array(records, gui_class)
+        np.save(os.path.join(directory, 'frames.npy'), array)
+        return len(array)
+
+    count = 0
+    for count, frame in enumerate(frames(records, gui_class), 1):
+        write_png(os.path.join(directory, 'frame_%05d.png' % (count - 1)), frame)
+    return count
+
+def write_png(path, frame, level=1):
+    """
+    Writes an RGB frame as a PNG image
+
+    Encodes with zlib directly at a fast compression level, several times
+    faster than saving through pygame.
+
+    Required Parameters
+    -------------------
+    path : String
+        The file to write
+
+    frame : (height, width, 3) uint8 Numpy Array
+        The RGB frame
+
+    Optional Parameters
+    -------------------
+    level : integer
+        zlib compression level, 0 to 9
+
+        1 by default
+
+    Returns
+    -------
+    None
+
+    """
+
+    height, width = frame.shape[:2]
+
+    #every row starts with filter type 0, none
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 1:] = frame.reshape(height, -1)
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    with open(path, 'wb') as png:
+        png.write(b'\x89PNG\r\n\x1a\n')
+        png.write(chunk(b'IHDR', header))
+        png.write(chunk(b'IDAT', zlib.compress(rows.tobytes(), level)))
+        png.write(chunk(b'IEND', b''))
+
+def capture_game(task):
+    """
+    Renders one game of a dataset, in a worker process of capture_games
+
+    Required Parameters
+    -------------------
+    task : 5 value tuple
+        Dataset directory, game index, output directory, gui class and
+        format, see capture_games
+
+    Returns
+    -------
+    integer : The number of frames
+    """
+
+    dataset, game, directory, gui_class, fmt = task
+    records = TrajectoryDataset(dataset)[game]
+    return save_frames(records, os.path.join(directory, 'game_%06d' % game), gui_class, fmt)
+
+def capture_games(dataset, directory, games=None, gui_class=GUI, fmt="png", workers=None):
+    """
+    Renders games written by a TrajectorySink across a process pool
+
+    Every game is written to its own directory, game_000000 and on.
+
+    Required Parameters
+    -------------------
+    dataset : String
+        Directory a TrajectorySink wrote to
+
+    directory : String
+        Where the game directories are written
+
+    Optional Parameters
+    -------------------
+    games : List of integers
+        Indices of the games to render
+
+        All games by default
+
+    gui_class : callable
+        Same as for frames, must be picklable
+
+        GUI by default
+
+    fmt : String "png"/"npy"
+        Same as for save_frames
+
+        "png" by default
+
+    workers : integer
+        Number of processes
+
+        Number of CPUs by default
+
+    Returns
+    -------
+    List of integers : The number of frames of each game
+    """
+
+    if games is None:
+        games = range(len(TrajectoryDataset(dataset)))
+    tasks = [(dataset, game, directory, gui_class, fmt) for game in games]
+
+    headless()
+
+    #workers are let finish instead of terminated, as SDL catches the
+    #signal that terminating sends
+    pool = multiprocessing.Pool(workers)
+    try:
+        return pool.map(capture_game, tasks)
+    finally:
+        pool.close()
+        pool.join()
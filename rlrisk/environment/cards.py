@@ -0,0 +1,318 @@
+'''
+This module holds the CardDeck class which keeps track
+of the Risk cards, the draw pile and every player's hand
+'''
+
+import bisect
+import itertools
+import numpy as np
+from rlrisk.environment.rng import GameRNG
+
+#face values on cards, 99 is wild card
+FACES = (1, 5, 10, 99)
+
+#card set patterns as required counts of (1, 5, 10, wild) faces
+SET_PATTERNS = np.array([
+    [3, 0, 0, 0], [0, 3, 0, 0], [0, 0, 3, 0], [1, 1, 1, 0],
+    [2, 0, 0, 1], [0, 2, 0, 1], [0, 0, 2, 1],
+    [1, 1, 0, 1], [1, 0, 1, 1], [0, 1, 1, 1]])
+
+def gen_set_table():
+    """
+    Generates the card sets that can be traded for every hand
+
+    Hands are described by the count of cards of each face, capped at 3
+    for 1, 5 and 10 and at 2 for wild cards since more never allow another
+    set. Each set is a list of (face index, rank) pairs, rank being the
+    position of the card among the player's cards of that face when sorted
+    by card ID. Sets are in the order they have always been offered to
+    agents.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    Dictionary : Capped face counts as keys for lists of sets
+    """
+
+    table = {}
+    for key in itertools.product(range(4), range(4), range(4), range(3)):
+        one, five, ten, wild = key
+        set_list = []
+
+        #three of a kind
+        for face, count in enumerate([one, five, ten]):
+            if count >= 3:
+                set_list.append([(face, 0), (face, 1), (face, 2)])
+
+        #one of each kind
+        if one >= 1 and five >= 1 and ten >= 1:
+            set_list.append([(0, 0), (1, 0), (2, 0)])
+
+        #wild card sets
+        for rank in range(wild):
+            for face, count in enumerate([one, five, ten]):
+                if count >= 2:
+                    set_list.append([(face, 0), (face, 1), (3, rank)])
+            if one != 0 and five != 0:
+                set_list.append([(0, 0), (1, 0), (3, rank)])
+            if one != 0 and ten != 0:
+                set_list.append([(0, 0), (2, 0), (3, rank)])
+            if ten != 0 and five != 0:
+                set_list.append([(2, 0), (1, 0), (3, rank)])
+
+        table[key] = set_list
+
+    return table
+
+SET_TABLE = gen_set_table()
+
+class CardDeck(object):
+    """Cards of a game, as a draw pile, discard pile and players' hands"""
+
+    def __init__(self, card_faces, players, status=None, rng=None):
+        """
+        CardDeck Constructor
+
+        Builds the hands of every player from the status of each card, and
+        shuffles all cards in the deck into the draw pile.
+
+        Required Parameters
+        -------------------
+        card_faces : dictionary
+            Card IDs as keys for card face values
+
+        players : integer
+            The number of players
+
+        Optional Parameters
+        -------------------
+        status : (44,) Numpy Array
+            The status of each card, either the player number for ownership
+            by that player or 6 representing unowned. Used in place, and all
+            changes made through the deck are reflected in it
+
+            All cards unowned by default
+
+        rng : GameRNG
+            Source of randomness for shuffling
+
+            A freshly seeded GameRNG by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.faces = np.array([FACES.index(card_faces[card]) for card in sorted(card_faces)])
+        if status is None:
+            status = np.repeat(6, len(self.faces))
+        self.status = status
+        self.rng = rng or GameRNG()
+
+        #sorted card IDs of each face for every player
+        self.hands = [[[] for face in FACES] for player in range(players)]
+        for card in np.where(status != 6)[0].tolist():
+            self.hands[status[card]][self.faces[card]].append(card)
+
+        self.pile = self.rng.permutation(np.where(status == 6)[0])
+        self.pointer = 0
+        self.discarded = []
+
+        #undo journal shared with the environment, see Risk.mark
+        self.journal = None
+
+    def counts(self, player):
+        """
+        Number of cards of each face in a player's hand
+
+        Required Parameters
+        -------------------
+        player : integer
+            The index of the player
+
+        Returns
+        -------
+        List : Counts of faces 1, 5, 10 and wild
+        """
+
+        return [len(cards) for cards in self.hands[player]]
+
+    def hand_size(self, player):
+        """
+        Number of cards in a player's hand
+
+        Required Parameters
+        -------------------
+        player : integer
+            The index of the player
+
+        Returns
+        -------
+        integer
+        """
+
+        return sum(len(cards) for cards in self.hands[player])
+
+    def give(self, card, player):
+        """
+        Puts a card in a player's hand
+
+        Required Parameters
+        -------------------
+        card : integer
+            The card ID
+
+        player : integer
+            The index of the player
+
+        Returns
+        -------
+        None
+
+        """
+
+        if self.journal is not None:
+            self.journal.append(('give', card, self.status[card]))
+        bisect.insort(self.hands[player][self.faces[card]], card)
+        self.status[card] = player
+
+    def draw(self, player):
+        """
+        Deals the top card of the draw pile to a player
+
+        When the draw pile runs out the discard pile is shuffled into a new
+        draw pile. Nothing is dealt if every card is in a player's hand.
+
+        Required Parameters
+        -------------------
+        player : integer
+            The index of the player
+
+        Returns
+        -------
+        integer : The card ID drawn, or None
+        """
+
+        if self.pointer == len(self.pile):
+            if self.journal is not None:
+                self.journal.append(('reshuffle', self.pile, self.pointer, self.discarded))
+            self.pile = self.rng.permutation(self.discarded)
+            self.pointer = 0
+            self.discarded = []
+            if not self.pile:
+                return None
+
+        card = self.pile[self.pointer]
+        if self.journal is not None:
+            self.journal.append(('draw',))
+        self.pointer += 1
+        self.give(card, player)
+        return card
+
+    def discard(self, cards):
+        """
+        Returns cards from players' hands to the discard pile
+
+        Required Parameters
+        -------------------
+        cards : List
+            The card IDs
+
+        Returns
+        -------
+        None
+
+        """
+
+        for card in cards:
+            if self.journal is not None:
+                self.journal.append(('discard', card, self.status[card]))
+            self.hands[self.status[card]][self.faces[card]].remove(card)
+            self.status[card] = 6
+            self.discarded.append(card)
+
+    def transfer(self, victim, conquerer):
+        """
+        Moves all cards of a defeated player
+
+        Required Parameters
+        -------------------
+        victim : integer
+            The index of the player losing their cards
+
+        conquerer : integer
+            The index of the player recieving them, or 6 to discard them
+
+        Returns
+        -------
+        None
+
+        """
+
+        cards = [card for hand in self.hands[victim] for card in hand]
+        if conquerer == 6:
+            self.discard(cards)
+            return
+
+        for card in cards:
+            self.give(card, conquerer)
+        self.hands[victim] = [[] for face in FACES]
+
+    def undo(self, change):
+        """
+        Undoes a journaled change to the deck
+
+        Required Parameters
+        -------------------
+        change : tuple
+            The journal entry, the last deck change not yet undone
+
+        Returns
+        -------
+        None
+
+        """
+
+        kind = change[0]
+        if kind == 'give':
+            card, previous = change[1:]
+            self.hands[self.status[card]][self.faces[card]].remove(card)
+            if previous != 6:
+                bisect.insort(self.hands[previous][self.faces[card]], card)
+            self.status[card] = previous
+        elif kind == 'discard':
+            card, previous = change[1:]
+            self.discarded.pop()
+            bisect.insort(self.hands[previous][self.faces[card]], card)
+            self.status[card] = previous
+        elif kind == 'draw':
+            self.pointer -= 1
+        elif kind == 'reshuffle':
+            self.pile, self.pointer, self.discarded = change[1:]
+
+    def sets(self, player):
+        """
+        All unique card sets a player can trade in
+
+        Looks up the sets for the player's face counts, then fills in the
+        card IDs.
+
+        Required Parameters
+        -------------------
+        player : integer
+            The index of the player
+
+        Returns
+        -------
+        List of Lists : Card IDs of each set
+        """
+
+        hand = self.hands[player]
+        one, five, ten, wild = [len(cards) for cards in hand]
+        key = (min(one, 3), min(five, 3), min(ten, 3), min(wild, 2))
+
+        return [[hand[face][rank] for face, rank in card_set] for card_set in SET_TABLE[key]]
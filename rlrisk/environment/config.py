@@ -4,9 +4,9 @@ for the configuration of the game in either
 GUI or headless modes
 '''
 
-import random
+from rlrisk.environment.rng import GameRNG
 
-def get_turn_order(players, order_setting="c"):
+def get_turn_order(players, order_setting="c", rng=None):
     '''
     Generate what order players take their turns
 
@@ -22,11 +22,17 @@ def get_turn_order(players, order_setting="c"):
 
         "c" by default as per Risk World Domination stadard ruleset
 
+    rng : GameRNG
+        Source of randomness
+
+        A freshly seeded GameRNG by default
+
     Returns
     -------
     list : player indices placed sequencially representing the order in which
         they take their turns
     '''
+    rng = rng or GameRNG()
     p_list = list(range(players))
     op_list = list(p_list)
 
@@ -34,14 +40,14 @@ def get_turn_order(players, order_setting="c"):
 
     if order_setting.lower() == "c":
 
-        first = random.choice(p_list)
+        first = rng.choice(p_list)
         order = [player if player <= players - 1 else p_list[player-players]
                  for player in range(first, players + first)]
 
     elif order_setting.lower() == "r":
 
         for player in range(players):
-            chosen = random.choice(p_list)
+            chosen = rng.choice(p_list)
             p_list.remove(chosen)
             order.append(chosen)
 
@@ -4,13 +4,20 @@ it can be used by setting the GUI flag when creating a Risk object
 '''
 
 import os
+import numpy as np
 import pygame
 
+#troop counts whose labels are rendered before the first frame
+CACHED_COUNTS = 100
+
 class GUI(object):
     '''
     The GUI for the game, which is optional, and functions related to the GUI
     '''
 
+    #whether recolor drops pending events, False when they are read elsewhere
+    clear_events = True
+
     def __init__(self):
         """Loading the images and setting fonts and defaults"""
         self.colors = self.gen_colors()
@@ -30,8 +37,6 @@ class GUI(object):
         self.background = self.background.convert()
         self.positions = self.gen_positions()
         self.background_rect = self.background.get_rect()
-        self.init_draw()
-
 
         #get fonts working
         pygame.font.init()
@@ -39,13 +44,19 @@ class GUI(object):
         self.id_font = pygame.font.Font(self.d_font, 20)
         self.font = pygame.font.Font(self.d_font, 12)
 
+        #rendered text surfaces by (font, text, color)
+        self.glyphs = {}
+
+        self.init_draw()
 
     def init_draw(self):
         """
         Displays the pregame-start screen
 
         Sets up the pygame display, draws the background,
-        and empty positions (as white).
+        and empty positions (as white). Also finds the area every
+        territory is drawn in, and renders the labels of territory
+        IDs and of small troop counts ahead of time.
 
         Parameters
         -------------------
@@ -63,6 +74,28 @@ class GUI(object):
             pygame.draw.circle(self.screen, self.colors["white"], (xpos, ypos), 14, 0)
         pygame.display.flip()
 
+        for key in self.positions:
+            self.glyph(self.id_font, str(key), 'white')
+        for count in range(CACHED_COUNTS):
+            self.glyph(self.font, str(count), 'black')
+
+        #area of each territory, large enough for a four digit troop count
+        widest = self.font.size("8888")
+        self.rects = {}
+        for key, (xpos, ypos) in self.positions.items():
+            rect = pygame.Rect(xpos - 14, ypos - 14, 29, 29)
+            rect.union_ip(pygame.Rect((xpos - 12, ypos - 6), widest))
+            rect.union_ip(pygame.Rect((xpos - 6, ypos - 30),
+                                      self.id_font.size(str(key))))
+            self.rects[key] = rect
+
+        #area of the player colors, card counts and trade ins
+        self.players_rect = pygame.Rect(600 - 14, 550 - 30, 30 * 5 + 29, 45)
+        self.players_rect.union_ip(pygame.Rect((600, 520), self.font.size("Trade ins: 8888")))
+
+        #what is on screen, nothing until the first full frame
+        self.shown = None
+
     def recolor(self, state):
         """
         Updates the display for the current state
@@ -72,6 +105,10 @@ class GUI(object):
         territory. Also shows the number of cards in each player's hand
         and the player color.
 
+        After the first frame only the territories that changed since the
+        last frame, and the player colors if cards or trade ins changed, are
+        drawn and updated on the display.
+
         Required Parameters
         -------------------
         State : 3 value tuple
@@ -86,17 +123,72 @@ class GUI(object):
         """
 
         #not interested in events
-        pygame.event.clear()
+        if self.clear_events:
+            pygame.event.clear()
+
+        territories = np.array(state[0])
+        cards = np.bincount(state[1][state[1] < 6], minlength=6)[:6]
+        players = (cards.tolist(), state[2])
+
+        if self.shown is None:
+            #first frame is drawn whole
+            self.shown = territories, players
+            self.redraw(state, self.background_rect)
+            pygame.display.flip()
+            return
+
+        shown_territories, shown_players = self.shown
+        self.shown = territories, players
+
+        changed = np.where((territories != shown_territories).any(1))[0].tolist()
+        dirty = [self.rects[key] for key in changed if key in self.rects]
+        if players != shown_players:
+            dirty.append(self.players_rect)
+
+        screen_rect = self.screen.get_rect()
+        dirty = [rect.clip(screen_rect) for rect in dirty]
+        dirty = [rect for rect in dirty if rect.width and rect.height]
+        for rect in dirty:
+            self.redraw(state, rect)
+
+        pygame.display.update(dirty)
+
+    def redraw(self, state, rect):
+        """
+        Draws the part of the frame inside a rectangle
+
+        Everything overlapping the rectangle is drawn again in the order the
+        whole frame is drawn, clipped to it, so the pixels are the same as
+        those of a whole frame.
+
+        Required Parameters
+        -------------------
+        State : 3 value tuple
+            Same as recolor
+
+        rect : pygame Rect
+            The area of the screen to draw
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.screen.set_clip(rect)
 
         #reload original background
-        self.screen.blit(self.background, self.background_rect)
+        self.screen.blit(self.background, rect, rect.move(-self.background_rect.x,
+                                                          -self.background_rect.y))
 
         #get the territories dictionary
         territories = state[0]
 
-
         #now color and text cirlces
         for key in self.positions:
+            if not self.rects[key].colliderect(rect):
+                continue
+
             #get owner and troop values
             territory = territories[key]
 
@@ -105,18 +197,44 @@ class GUI(object):
                                self.positions[key], 14, 0)
 
             #now add the troop count font
-            label = self.font.render(str(territory[1]), 1, self.colors['black'])
+            label = self.glyph(self.font, str(territory[1]), 'black')
 
             #and the province id
-            label_id = self.id_font.render(str(key), 1, self.colors['white'])
+            label_id = self.glyph(self.id_font, str(key), 'white')
 
             xpos, ypos = self.positions[key]
             self.screen.blit(label, (xpos - 12, ypos - 6))
             self.screen.blit(label_id, (xpos - 6, ypos - 30))
 
-        self.draw_players(state)
+        if self.players_rect.colliderect(rect):
+            self.draw_players(state)
 
-        pygame.display.flip()
+        self.screen.set_clip(None)
+
+    def glyph(self, font, text, color):
+        """
+        Rendered text, from the cache when rendered before
+
+        Required Parameters
+        -------------------
+        font : pygame Font
+            The font to render with
+
+        text : String
+            The text to render
+
+        color : String
+            Name of the color, see gen_colors
+
+        Returns
+        -------
+        pygame Surface
+        """
+
+        key = (font, text, color)
+        if key not in self.glyphs:
+            self.glyphs[key] = font.render(text, 1, self.colors[color])
+        return self.glyphs[key]
 
     def quit_game(self):
         """
@@ -271,7 +389,7 @@ class GUI(object):
         ypos = 550
         orig_x = 600
 
-        label = self.font.render("Trade ins: " + str(trade_ins), 1, self.colors['black'])
+        label = self.glyph(self.font, "Trade ins: " + str(trade_ins), 'black')
         self.screen.blit(label, (orig_x, ypos - 30))
 
         for i, player in enumerate(players):
@@ -279,5 +397,5 @@ class GUI(object):
             #color all the circles their respective colors
             pygame.draw.circle(self.screen, self.colors[self.p2c[player]],
                                (xpos, ypos), 14, 0)
-            label = self.font.render(str(players_cards[player]), 1, self.colors['black'])
+            label = self.glyph(self.font, str(players_cards[player]), 'black')
             self.screen.blit(label, (xpos - 12, ypos - 6))
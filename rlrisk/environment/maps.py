@@ -0,0 +1,445 @@
+'''
+This module holds the Map class, a board kept as arrays
+that is loaded from a map file or generated synthetically
+with any number of territories, and MapGUI to draw it
+'''
+
+import json
+import math
+import numpy as np
+import pygame
+from rlrisk.environment.cards import FACES
+from rlrisk.environment.gui import GUI
+
+class Map(object):
+    """Territories, edges, continents and cards of a board"""
+
+    def __init__(self, names, edges, continents, rewards, cards, positions=None, name="map"):
+        """
+        Map Constructor
+
+        Territories are numbered by their place in names. Edges are stored
+        once in CSR form, neighbors sorted, with both directions of every
+        edge. The board must be connected, or a game on it could never end.
+
+        Required Parameters
+        -------------------
+        names : List of Strings
+            Name of every territory, all different
+
+        edges : (?, 2) Numpy Array or List
+            Pairs of adjacent territory IDs, in either direction
+
+        continents : dictionary
+            Continent names as keys for lists of territory IDs
+
+        rewards : dictionary
+            Continent names as keys for the troops rewarded for owning them
+
+        cards : List of integers
+            The face of every card in the deck, 1, 5, 10 or 99 for wild
+
+        Optional Parameters
+        -------------------
+        positions : (len(names), 2) Numpy Array or List
+            Position of every territory on screen, in pixels
+
+            None by default, the map cannot be drawn
+
+        name : String
+            Name of the map
+
+            "map" by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.name = name
+        self.names = list(names)
+        size = len(self.names)
+        if size < 2:
+            raise ValueError("A map needs at least two territories")
+        if len(set(self.names)) != size:
+            raise ValueError("Territory names of a map must be different")
+
+        edges = np.asarray(edges, dtype=int).reshape(-1, 2)
+        if edges.size and (edges.min() < 0 or edges.max() >= size):
+            raise ValueError("Edges must join territory IDs 0 to " + str(size - 1))
+        if np.any(edges[:, 0] == edges[:, 1]):
+            raise ValueError("A territory cannot be adjacent to itself")
+
+        #both directions of every edge, once, sorted by source then destination
+        keys = np.unique(np.concatenate([edges[:, 0] * size + edges[:, 1],
+                                         edges[:, 1] * size + edges[:, 0]]))
+        self.indices = keys % size
+        self.indptr = np.searchsorted(keys // size, np.arange(size + 1))
+
+        self.continents = dict((continent, [int(terr) for terr in members])
+                               for continent, members in continents.items())
+        for continent, members in self.continents.items():
+            if not members or min(members) < 0 or max(members) >= size:
+                raise ValueError("Invalid territories of continent " + str(continent))
+        self.rewards = dict((continent, int(rewards[continent])) for continent in self.continents)
+
+        self.cards = [int(face) for face in cards]
+        if any(face not in FACES for face in self.cards):
+            raise ValueError("Card faces must be one of " + str(FACES))
+
+        self.positions = None
+        if positions is not None:
+            self.positions = np.asarray(positions, dtype=int).reshape(size, 2)
+
+        if not self.connected():
+            raise ValueError("The territories of a map must be connected")
+
+    def __len__(self):
+        return len(self.names)
+
+    def neighbors(self, territory):
+        """
+        Territories adjacent to a territory
+
+        Required Parameters
+        -------------------
+        territory : integer
+            The territory ID
+
+        Returns
+        -------
+        (?,) Numpy Array : Adjacent territory IDs in increasing order
+        """
+
+        return self.indices[self.indptr[territory]:self.indptr[territory + 1]]
+
+    def connected(self):
+        """Whether every territory can be reached from every other"""
+
+        seen = np.zeros(len(self), dtype=bool)
+        seen[0] = True
+        frontier = np.array([0])
+        while frontier.size:
+            #neighbors of the whole frontier at once, from the CSR arrays
+            starts, ends = self.indptr[frontier], self.indptr[frontier + 1]
+            reached = self.indices[np.concatenate([np.arange(start, end)
+                                                   for start, end in zip(starts, ends)])]
+            frontier = np.unique(reached[~seen[reached]])
+            seen[frontier] = True
+        return bool(seen.all())
+
+    def tables(self):
+        """
+        The board as Risk.gen_board returns it
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        4 value tuple
+            Same as Risk.gen_board
+        """
+
+        neighbors = np.split(self.indices, self.indptr[1:-1])
+        board = dict((terr, adjacent.tolist()) for terr, adjacent in enumerate(neighbors))
+        continents = dict((continent, list(members))
+                          for continent, members in self.continents.items())
+        card_faces = dict(enumerate(self.cards))
+        return board, continents, card_faces, dict(self.rewards)
+
+    def id_names(self):
+        """
+        Territory names as Risk.id_names returns them
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        2 value tuple
+            Same as Risk.id_names
+        """
+
+        return (dict(enumerate(self.names)),
+                dict((name, num) for num, name in enumerate(self.names)))
+
+    def gui(self):
+        """
+        The MapGUI of the map
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        MapGUI
+        """
+
+        return MapGUI(self)
+
+    def to_dict(self):
+        """
+        The map as the JSON object of a map file
+
+        A map file holds one object:
+            name = Name of the map
+            territories = Names of the territories, by ID
+            edges = Pairs of adjacent territory IDs, each given once
+            continents = Continent names as keys for objects with
+                         territories (a list of IDs) and reward
+            cards = Face of every card, 1, 5, 10 or 99 for wild
+            positions = Optional, [x, y] on screen of every territory
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dictionary
+        """
+
+        sources = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+        once = sources < self.indices
+        data = {'name': self.name,
+                'territories': self.names,
+                'edges': np.stack([sources[once], self.indices[once]], 1).tolist(),
+                'continents': dict((continent, {'territories': members,
+                                                'reward': self.rewards[continent]})
+                                   for continent, members in self.continents.items()),
+                'cards': self.cards}
+        if self.positions is not None:
+            data['positions'] = self.positions.tolist()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        A map from the JSON object of a map file, see to_dict
+
+        Edges and continents may name territories instead of giving IDs.
+
+        Required Parameters
+        -------------------
+        data : dictionary
+            The JSON object
+
+        Returns
+        -------
+        Map
+        """
+
+        names = data['territories']
+        ids = dict((name, num) for num, name in enumerate(names))
+        to_id = lambda terr: ids[terr] if isinstance(terr, str) else terr
+
+        edges = [(to_id(frm), to_id(to)) for frm, to in data['edges']]
+        continents = dict((continent, [to_id(terr) for terr in value['territories']])
+                          for continent, value in data['continents'].items())
+        rewards = dict((continent, value['reward'])
+                       for continent, value in data['continents'].items())
+        return cls(names, edges, continents, rewards, data['cards'],
+                   data.get('positions'), data.get('name', "map"))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a map file
+
+        Required Parameters
+        -------------------
+        path : String
+            The JSON map file, see to_dict
+
+        Returns
+        -------
+        Map
+        """
+
+        with open(path) as map_file:
+            return cls.from_dict(json.load(map_file))
+
+    def save(self, path):
+        """
+        Writes a map file
+
+        Required Parameters
+        -------------------
+        path : String
+            Where the JSON map file is written
+
+        Returns
+        -------
+        None
+
+        """
+
+        with open(path, 'w') as map_file:
+            json.dump(self.to_dict(), map_file)
+
+    @classmethod
+    def classic(cls):
+        """
+        The classic 42 territory map of Risk.gen_board
+
+        Map edges are always both ways, so Kamchatka is adjacent to Mongolia
+        here, which gen_board only lists the other way around.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Map
+        """
+
+        from rlrisk.environment.risk import Risk
+
+        board, continents, card_faces, rewards = Risk.gen_board()
+        names = [Risk.id_names()[0][terr] for terr in range(len(board))]
+        edges = [(terr, adjacent) for terr in board for adjacent in board[terr]]
+        cards = [card_faces[card] for card in sorted(card_faces)]
+        return cls(names, edges, continents, rewards, cards, name="classic")
+
+    @classmethod
+    def synthetic(cls, territories, continent_size=7, wild_cards=2, spacing=60, seed=None):
+        """
+        Generates a map of any number of territories
+
+        Territories are laid out on a jittered grid twice as wide as it is
+        tall, each adjacent to the territories beside and below it and to one
+        diagonal neighbor at random, so the map is connected and planar like
+        the classic one. Continents are grown breadth first from the lowest
+        unclaimed territory until they hold continent_size territories, so
+        each is connected, though one boxed in by claimed territories stays
+        smaller. They reward half their size in troops. The deck has a card per territory with the
+        faces 1, 5 and 10 in equal shares, and wild cards.
+
+        Required Parameters
+        -------------------
+        territories : integer
+            Number of territories, at least 2
+
+        Optional Parameters
+        -------------------
+        continent_size : integer
+            Territories in a continent, at least 1
+
+            7 by default, as on the classic map
+
+        wild_cards : integer
+            Number of wild cards in the deck
+
+            2 by default
+
+        spacing : integer
+            Pixels between neighboring territories on screen
+
+            60 by default
+
+        seed : integer or Numpy SeedSequence
+            Seed of the layout and card faces
+
+            None by default, for fresh entropy
+
+        Returns
+        -------
+        Map
+        """
+
+        if territories < 2:
+            raise ValueError("A map needs at least two territories")
+        if continent_size < 1:
+            raise ValueError("Continents need at least one territory")
+        rng = np.random.default_rng(seed)
+
+        cols = max(int(math.ceil(math.sqrt(territories * 2))), 2)
+        ids = np.arange(territories)
+        col, row = ids % cols, ids // cols
+
+        #right and down neighbors, and one diagonal of every grid square
+        right = ids[(col < cols - 1) & (ids + 1 < territories)]
+        down = ids[ids + cols < territories]
+        edges = [np.stack([right, right + 1], 1), np.stack([down, down + cols], 1)]
+        squares = ids[(col < cols - 1) & (ids + cols + 1 < territories)]
+        falling = rng.random(len(squares)) < 0.5
+        edges.append(np.stack([squares[falling], squares[falling] + cols + 1], 1))
+        edges.append(np.stack([squares[~falling] + 1, squares[~falling] + cols], 1))
+
+        #continents grow breadth first from the first unclaimed territory
+        edges = np.concatenate(edges)
+        adjacent = [[] for _ in range(territories)]
+        for first, second in sorted(edges.tolist()):
+            adjacent[first].append(second)
+            adjacent[second].append(first)
+        claimed = np.zeros(territories, dtype=bool)
+        continents, rewards = {}, {}
+        for start in range(territories):
+            if claimed[start]:
+                continue
+            members, claimed[start] = [start], True
+            for member in members:
+                for neighbor in sorted(adjacent[member]):
+                    if len(members) < continent_size and not claimed[neighbor]:
+                        members.append(neighbor)
+                        claimed[neighbor] = True
+            continent = "C" + str(len(continents))
+            continents[continent] = sorted(members)
+            rewards[continent] = max(len(members) // 2, 1)
+
+        cards = rng.permutation(np.resize([1, 5, 10], territories)).tolist() + [99] * wild_cards
+
+        jitter = rng.integers(-spacing // 4, spacing // 4 + 1, (territories, 2))
+        positions = np.stack([col, row], 1) * spacing + spacing + jitter
+
+        digits = len(str(territories - 1))
+        names = ["T" + str(num).zfill(digits) for num in range(territories)]
+
+        return cls(names, edges, continents, rewards, cards, positions,
+                   "synthetic_" + str(territories))
+
+class MapGUI(GUI):
+    """GUI drawing a map on a plain background, with its edges as lines"""
+
+    def __init__(self, board_map):
+        """
+        Constructor for GUI of a map with positions
+
+        Required Parameters
+        -------------------
+        board_map : Map
+            The map drawn, which must have positions
+
+        Returns
+        -------
+        None
+
+        """
+
+        if board_map.positions is None:
+            raise ValueError("Map " + board_map.name + " has no positions to draw")
+
+        super(MapGUI, self).__init__()
+
+        #room for the player colors below the territories
+        size = (max(int(board_map.positions[:, 0].max()) + 40, 800),
+                max(int(board_map.positions[:, 1].max()) + 40, 600))
+        self.background = pygame.Surface(size).convert()
+        self.background.fill((40, 70, 110))
+        self.background_rect = self.background.get_rect()
+
+        self.positions = dict((num, tuple(pos))
+                              for num, pos in enumerate(board_map.positions.tolist()))
+        for terr, position in self.positions.items():
+            for adjacent in board_map.neighbors(terr).tolist():
+                if adjacent > terr:
+                    pygame.draw.line(self.background, (150, 150, 150), position,
+                                     self.positions[adjacent], 2)
+
+        self.init_draw()
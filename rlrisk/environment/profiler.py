@@ -0,0 +1,328 @@
+'''
+This module holds the Profiler class, which times the
+phases of games and the decisions of every agent, and
+exports a summary or a Chrome trace of the games
+'''
+
+import json
+import time
+
+#short names of the action codes, see BaseAgent.take_action
+ACTION_NAMES = {0: 'place troops', 1: 'choose attack', 2: 'press attack', 3: 'risk troops',
+                4: 'fortify from', 5: 'fortify to', 6: 'split fortify',
+                7: 'split conquest', 8: 'trade cards', 9: 'pick territory',
+                10: 'place initial troops', 11: 'attack again', 12: 'blitz stop',
+                13: 'bulk place troops', 14: 'bulk place initial troops',
+                15: 'bulk split fortify', 16: 'bulk split conquest'}
+
+#methods of Risk timed as phases, with the argument that gives the player
+PHASES = {'setup': ('allocate_territories', None),
+          'starting troops': ('place_starting_troops', None),
+          'recruitment': ('recruitment_phase', 0),
+          'attack': ('attack_phase', 0),
+          'combat': ('combat', 'attacker'),
+          'blitz combat': ('blitz_combat', 'attacker'),
+          'fortify': ('fortify_phase', 0)}
+
+class Profiler(object):
+    """Wall time and counts of game phases and agent decisions"""
+
+    def __init__(self, trace=True):
+        """
+        Profiler Constructor
+
+        A profiler is attached to an environment, by the environment's
+        profiler argument or by attach. Environments without one run their
+        methods as they are, so profiling costs nothing when off.
+
+        Phases are timed from start to end, including the decisions made
+        during them, which are also counted as agent time. Phases nest, the
+        time of combat is also in the time of the attack phase. Decisions are
+        timed from the moment the game asks for them until it is sent the
+        action, by player and action code. Games played one after another,
+        or by several environments, add up in one profiler.
+
+        Optional Parameters
+        -------------------
+        trace : boolean
+            Whether to keep every phase and decision as an event for
+            chrome_trace, otherwise only the totals are kept
+
+            True by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.trace = trace
+        self.origin = time.perf_counter()
+
+        #[calls, seconds, agent seconds] by (phase, player) and by (player, action code)
+        self.phases = {}
+        self.decisions = {}
+
+        #agent seconds so far, phases take the difference from start to end
+        self.agent_seconds = 0.0
+
+        #(name, category, player, start, duration, arguments) of every event
+        self.events = []
+
+    def attach(self, env):
+        """
+        Starts timing the phases and decisions of an environment
+
+        The environment's game generator and phase methods are replaced
+        by timed ones on the instance.
+
+        Required Parameters
+        -------------------
+        env : Risk
+            The environment, before its game is started
+
+        Returns
+        -------
+        None
+
+        """
+
+        for name, (method, player_arg) in PHASES.items():
+            setattr(env, method, self.timed_phase(env, name, getattr(env, method), player_arg))
+        env.game = self.timed_game(env.game)
+
+    def timed_game(self, game):
+        """
+        Wraps a game generator method to time every decision
+
+        Required Parameters
+        -------------------
+        game : method
+            Risk.game of the environment
+
+        Returns
+        -------
+        function : Same as game
+        """
+
+        def timed(*args, **kwargs):
+            decisions = game(*args, **kwargs)
+            try:
+                decision = next(decisions)
+                while True:
+                    start = time.perf_counter()
+                    action = yield decision
+                    self.add_decision(decision[0], decision[1], start)
+                    decision = decisions.send(action)
+            except StopIteration as stop:
+                return stop.value
+        return timed
+
+    def timed_phase(self, env, name, phase, player_arg):
+        """
+        Wraps a phase generator method to time it
+
+        Required Parameters
+        -------------------
+        env : Risk
+            The environment of the phase
+
+        name : String
+            The name of the phase, see PHASES
+
+        phase : method
+            The phase generator method
+
+        player_arg : integer, "attacker" or None
+            Index of the argument that is the player, "attacker" to take the
+            owner of the attacking territory, or None for every player
+
+        Returns
+        -------
+        function : Same as phase
+        """
+
+        def timed(*args):
+            if player_arg == 'attacker':
+                player = int(env.state[0][args[0][0], 0])
+            elif player_arg is None:
+                player = -1
+            else:
+                player = int(args[player_arg])
+
+            start, agent_start = time.perf_counter(), self.agent_seconds
+            result = yield from phase(*args)
+            self.add_phase(name, player, start, self.agent_seconds - agent_start)
+            return result
+        return timed
+
+    def add_decision(self, player, action_code, start):
+        """
+        Counts a decision that ends now
+
+        Required Parameters
+        -------------------
+        player : integer
+            The player that decided
+
+        action_code : integer
+            The action code of the decision
+
+        start : float
+            time.perf_counter when the decision was asked for
+
+        Returns
+        -------
+        None
+
+        """
+
+        seconds = time.perf_counter() - start
+        self.agent_seconds += seconds
+        player, action_code = int(player), int(action_code)
+        totals = self.decisions.setdefault((player, action_code), [0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+        if self.trace:
+            self.events.append((ACTION_NAMES.get(action_code, str(action_code)), 'decision',
+                                player, start, seconds, {'action_code': action_code}))
+
+    def add_phase(self, name, player, start, agent_seconds):
+        """
+        Counts a phase that ends now
+
+        Required Parameters
+        -------------------
+        name : String
+            The name of the phase
+
+        player : integer
+            The player of the phase, -1 for every player
+
+        start : float
+            time.perf_counter when the phase started
+
+        agent_seconds : float
+            Time spent in decisions during the phase
+
+        Returns
+        -------
+        None
+
+        """
+
+        seconds = time.perf_counter() - start
+        totals = self.phases.setdefault((name, player), [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+        totals[2] += agent_seconds
+        if self.trace:
+            self.events.append((name, 'phase', player, start, seconds, {}))
+
+    def summary(self):
+        """
+        Totals of every phase and decision
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dictionary
+            phases : Phase names as keys for dictionaries of
+                calls, seconds, agent_seconds and engine_seconds, and of
+                players, which has the calls and seconds of each player
+            decisions : Player indices as keys for dictionaries with action
+                codes as keys for dictionaries of calls, seconds and
+                us_per_call
+            agent_seconds : Time spent in all decisions
+        """
+
+        phases = {}
+        for (name, player), (calls, seconds, agent_seconds) in sorted(self.phases.items()):
+            totals = phases.setdefault(name, {'calls': 0, 'seconds': 0.0, 'agent_seconds': 0.0,
+                                              'players': {}})
+            totals['calls'] += calls
+            totals['seconds'] += seconds
+            totals['agent_seconds'] += agent_seconds
+            totals['players'][player] = {'calls': calls, 'seconds': seconds}
+        for totals in phases.values():
+            totals['engine_seconds'] = totals['seconds'] - totals['agent_seconds']
+
+        decisions = {}
+        for (player, action_code), (calls, seconds) in sorted(self.decisions.items()):
+            decisions.setdefault(player, {})[action_code] = {
+                'calls': calls, 'seconds': seconds, 'us_per_call': 1e6 * seconds / calls}
+
+        return {'phases': phases, 'decisions': decisions, 'agent_seconds': self.agent_seconds}
+
+    def report(self):
+        """
+        The summary as a table
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        String
+        """
+
+        summary = self.summary()
+        lines = ["%-24s %8s %10s %10s %10s" % ("phase", "calls", "seconds", "engine", "agents")]
+        for name, totals in summary['phases'].items():
+            lines.append("%-24s %8d %10.4f %10.4f %10.4f" % (
+                name, totals['calls'], totals['seconds'], totals['engine_seconds'],
+                totals['agent_seconds']))
+
+        lines.append("")
+        lines.append("%-8s %-28s %8s %10s %12s" % ("player", "decision", "calls", "seconds",
+                                                     "us/call"))
+        for player, codes in summary['decisions'].items():
+            for action_code, totals in codes.items():
+                lines.append("%-8d %-28s %8d %10.4f %12.1f" % (
+                    player + 1, str(action_code) + " " + ACTION_NAMES.get(action_code, ""),
+                    totals['calls'], totals['seconds'], totals['us_per_call']))
+        return "\n".join(lines)
+
+    def chrome_trace(self, path=None):
+        """
+        The events as Chrome trace event JSON
+
+        Open the file in chrome://tracing or https://ui.perfetto.dev to
+        see the games as a timeline with a row per player. Phases of
+        every player, such as setup, are on a row of their own.
+
+        Optional Parameters
+        -------------------
+        path : String
+            Where the JSON is written
+
+            None by default, only returned
+
+        Returns
+        -------
+        dictionary : The JSON object
+        """
+
+        if not self.trace:
+            raise ValueError("The profiler was made without trace, it has no events")
+
+        players = sorted(set(event[2] for event in self.events))
+        trace_events = [{'name': 'thread_name', 'ph': 'M', 'pid': 0, 'tid': player + 1,
+                         'args': {'name': "Player " + str(player + 1) if player >= 0
+                                          else "Game"}}
+                        for player in players]
+        for name, cat, player, start, seconds, args in self.events:
+            trace_events.append({'name': name, 'cat': cat, 'ph': 'X', 'pid': 0,
+                                 'tid': player + 1,
+                                 'ts': 1e6 * (start - self.origin), 'dur': 1e6 * seconds,
+                                 'args': args})
+
+        trace = {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+        if path is not None:
+            with open(path, 'w') as trace_file:
+                json.dump(trace, trace_file)
+        return trace
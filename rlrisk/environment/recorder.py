@@ -0,0 +1,198 @@
+'''
+This module holds the Recorder class, which keeps the
+record of a game's states in preallocated compact arrays
+'''
+
+import numpy as np
+
+class Recorder(object):
+    """Growable int8/int16 buffers of recorded game states"""
+
+    def __init__(self, granularity="turn", capacity=256, sink=None, board_size=42,
+                 num_cards=44):
+        """
+        Recorder Constructor
+
+        Buffers are allocated by the first record, so they match the size
+        of the board and deck being recorded. Until then they are empty,
+        with a row the size of the board and deck given.
+
+        Optional Parameters
+        -------------------
+        granularity : String "turn"/"phase", integer or None
+            How often the state is recorded
+            "turn" = At the beginning of every turn
+            "phase" = At the beginning of every turn and after recruitment
+                      and attack phases
+            integer k = At the beginning of every k-th turn
+            None (or False, "off") = Never, recording costs nothing
+
+            "turn" by default
+
+        capacity : integer
+            Number of records to allocate room for at first. Buffers double
+            in size when full
+
+            256 by default
+
+        sink : TrajectorySink
+            Where to stream records to instead of keeping them in memory
+
+            None by default
+
+        board_size : integer
+            Number of territories of the board recorded
+
+            42 by default
+
+        num_cards : integer
+            Number of cards of the deck recorded
+
+            44 by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.granularity = granularity
+        if granularity in [None, False, "off"]:
+            self.every, self.phases = None, False
+        elif granularity == "turn":
+            self.every, self.phases = 1, False
+        elif granularity == "phase":
+            self.every, self.phases = 1, True
+        elif (isinstance(granularity, int) and not isinstance(granularity, bool)
+              and granularity > 0):
+            self.every, self.phases = granularity, False
+        else:
+            raise ValueError("Invalid recording granularity " + str(granularity))
+
+        self.sink = sink
+        self.size = 0
+        self.capacity = capacity
+        self.owners = np.empty((0, board_size), dtype=np.int8)
+        self.troops = np.empty((0, board_size), dtype=np.int16)
+        self.cards = np.empty((0, num_cards), dtype=np.int8)
+        self.trade_ins = np.empty(0, dtype=np.int16)
+
+    def wants(self, turn, phase=0):
+        """
+        Whether a state should be recorded at this point of the game
+
+        Required Parameters
+        -------------------
+        turn : integer
+            The turn count
+
+        Optional Parameters
+        -------------------
+        phase : integer
+            0 for the beginning of the turn, 1 after recruitment and
+            2 after attack
+
+            0 by default
+
+        Returns
+        -------
+        boolean
+        """
+
+        if self.every is None or (phase != 0 and not self.phases):
+            return False
+        return turn % self.every == 0
+
+    def append(self, state):
+        """
+        Records a state
+
+        Troop counts too large for the troop buffer widen it.
+
+        Required Parameters
+        -------------------
+        state : 3 value tuple
+            The game state
+
+        Returns
+        -------
+        None
+
+        """
+
+        if self.sink is not None:
+            self.sink.append(state)
+            return
+
+        territories, cards, trade_ins = state
+
+        if self.size == 0 and len(self.trade_ins) == 0:
+            self.owners = np.empty((self.capacity, len(territories)), dtype=np.int8)
+            self.troops = np.empty((self.capacity, len(territories)), dtype=np.int16)
+            self.cards = np.empty((self.capacity, len(cards)), dtype=np.int8)
+            self.trade_ins = np.empty(self.capacity, dtype=np.int16)
+        elif self.size == len(self.trade_ins):
+            self.owners, self.troops, self.cards, self.trade_ins = [
+                np.concatenate([buffer, np.empty_like(buffer)])
+                for buffer in [self.owners, self.troops, self.cards, self.trade_ins]]
+
+        troops = territories[:, 1]
+        if troops.max() > np.iinfo(self.troops.dtype).max:
+            self.troops = self.troops.astype(np.int64)
+
+        self.owners[self.size] = territories[:, 0]
+        self.troops[self.size] = troops
+        self.cards[self.size] = cards
+        self.trade_ins[self.size] = trade_ins
+        self.size += 1
+
+    def arrays(self):
+        """
+        The records so far, without copying, streamed records are views
+        of the sink's shard
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        4 value tuple
+            (Records,42) Numpy Array: Record of territory ownership
+            (Records,42) Numpy Array: Record of troops per territory
+            (Records,44) Numpy Array: Record of card ownership
+            (Records,)   Numpy Array: Record of number of card set trade ins
+
+        """
+
+        if self.sink is not None:
+            return self.sink.game(self.owners.shape[1], self.cards.shape[1])
+
+        return (self.owners[:self.size], self.troops[:self.size],
+                self.cards[:self.size], self.trade_ins[:self.size])
+
+    def finish(self, turn_order, steal_cards):
+        """
+        Ends the recording of a game
+
+        Streamed games are added to the sink's index.
+
+        Required Parameters
+        -------------------
+        turn_order : List
+            The turn order of the game
+
+        steal_cards : boolean
+            Whether or not defeated player's card go to the player that defeated them
+
+        Returns
+        -------
+        4 value tuple
+            Same as arrays
+
+        """
+
+        records = self.arrays()
+        if self.sink is not None:
+            self.sink.end_game(turn_order, steal_cards)
+        return records
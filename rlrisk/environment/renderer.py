@@ -0,0 +1,168 @@
+'''
+This module holds the Renderer class, which draws a GUI on
+its own thread at a capped frame rate, showing the latest
+state a game published
+'''
+
+import threading
+import time
+import numpy as np
+
+class Renderer(object):
+    """A GUI drawn on a background thread"""
+
+    def __init__(self, gui_class, fps=30, timeout=10):
+        """
+        Renderer Constructor
+
+        Starts the thread, which creates the GUI and waits for states. The
+        game publishes states through recolor without waiting for them to
+        be drawn. At most fps frames are drawn a second, states published
+        while a frame is waited for replace each other, so only the latest
+        one is drawn. Returns once the GUI is up, and raises the error of
+        the thread if the GUI could not be created.
+
+        Pygame displays cannot be opened off the main thread on macOS, so
+        Risk draws in the game loop there instead of using a Renderer.
+
+        Required Parameters
+        -------------------
+        gui_class : callable
+            Returns the GUI, such as GUI or SWGUI. Called on the thread
+
+        Optional Parameters
+        -------------------
+        fps : float
+            Largest number of frames drawn a second
+
+            30 by default
+
+        timeout : float
+            Seconds to wait for the GUI to be created
+
+            10 by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.interval = 1 / fps
+        self.gui = None
+
+        #the latest published state, None once drawn
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.latest = None
+        self.closing = False
+
+        self.published = 0
+        self.frames = 0
+
+        #set by the thread if the GUI could not be created
+        self.error = None
+
+        started = threading.Event()
+        self.thread = threading.Thread(target=self.run, args=(gui_class, started),
+                                       daemon=True)
+        self.thread.start()
+        if not started.wait(timeout):
+            raise RuntimeError("The GUI was not created within " + str(timeout) + " seconds")
+        if self.error is not None:
+            raise self.error
+
+    def recolor(self, state):
+        """
+        Publishes a state to be drawn
+
+        Same as GUI.recolor, but returns at once. The state is copied, so
+        the game can go on changing it.
+
+        Required Parameters
+        -------------------
+        State : 3 value tuple
+            The game state
+
+        Returns
+        -------
+        None
+
+        """
+
+        state = (np.array(state[0]), np.array(state[1]), state[2])
+        with self.lock:
+            self.latest = state
+            self.published += 1
+        self.ready.set()
+
+    def quit_game(self):
+        """
+        Draws the last published state, then closes the GUI
+
+        Waits for the thread to finish.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        with self.lock:
+            self.closing = True
+        self.ready.set()
+        self.thread.join()
+
+    def run(self, gui_class, started):
+        """
+        The rendering loop of the thread
+
+        Required Parameters
+        -------------------
+        gui_class : callable
+            Returns the GUI
+
+        started : threading Event
+            Set once the GUI is up, or failed to come up
+
+        Returns
+        -------
+        None
+
+        """
+
+        try:
+            self.gui = gui_class()
+        except Exception as error:
+            self.error = error
+            return
+        finally:
+            started.set()
+
+        next_frame = time.time()
+        while True:
+            self.ready.wait()
+
+            #states published until the next frame are coalesced
+            wait = next_frame - time.time()
+            if wait > 0:
+                time.sleep(wait)
+
+            with self.lock:
+                state, self.latest = self.latest, None
+                closing = self.closing
+                self.ready.clear()
+
+            if state is not None:
+                self.gui.recolor(state)
+                self.frames += 1
+                next_frame = time.time() + self.interval
+
+            if closing:
+                break
+
+        self.gui.quit_game()
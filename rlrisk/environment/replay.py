@@ -0,0 +1,312 @@
+'''
+This module holds the Replay class, a viewer that plays
+back the records of a game on the GUI at any speed, without
+simulating the game again
+'''
+
+import time
+import pygame
+from rlrisk.environment.gui import GUI
+from rlrisk.environment.sink import TrajectoryDataset
+from rlrisk.environment.capture import record_states
+
+class Replay(object):
+    """Seekable playback of a recorded game"""
+
+    def __init__(self, records, gui_class=GUI, speed=10, fps=30):
+        """
+        Replay Constructor
+
+        Opens the GUI on the first record, paused. Records are states at the
+        points the game was recorded at, every turn unless the game was
+        recorded with another granularity.
+
+        While run, the keys are:
+            space = Play/pause
+            right/left = Step one record forward/back
+            up/down = Double/halve the speed
+            page up/page down = Seek a tenth of the game forward/back
+            home/end = Seek to the first/last record
+            escape = Quit
+
+        Required Parameters
+        -------------------
+        records : tuple
+            Record of a game as returned by Risk.play, or by a
+            TrajectoryDataset
+
+        Optional Parameters
+        -------------------
+        gui_class : callable
+            Returns the GUI to draw on, such as SWGUI for SouthernWarfare
+
+            GUI by default
+
+        speed : float
+            Records played a second
+
+            10 by default
+
+        fps : float
+            Largest number of frames drawn a second. When playing faster the
+            records in between are skipped
+
+            30 by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.states = list(record_states(records))
+        if not self.states:
+            raise ValueError("The game has no records to replay")
+
+        self.speed = speed
+        self.fps = fps
+        self.playing = False
+        self.closed = False
+
+        #position as a fraction of records, the record shown is its floor
+        self.position = 0.0
+        self.shown = None
+
+        self.gui = gui_class()
+        #keys pressed while a record is drawn are handled by run
+        self.gui.clear_events = False
+        self.show()
+
+    @classmethod
+    def load(cls, directory, game, **kwargs):
+        """
+        Replay of a game written by a TrajectorySink
+
+        Required Parameters
+        -------------------
+        directory : String
+            Directory the TrajectorySink wrote to
+
+        game : integer
+            The index of the game
+
+        Optional Parameters
+        -------------------
+        kwargs : Keyword arguments of the constructor
+
+        Returns
+        -------
+        Replay
+        """
+
+        return cls(TrajectoryDataset(directory)[game], **kwargs)
+
+    def __len__(self):
+        return len(self.states)
+
+    @property
+    def record(self):
+        """The index of the record shown"""
+
+        return int(self.position)
+
+    def seek(self, record):
+        """
+        Moves to a record and draws it
+
+        Only the territories that differ from the record shown are drawn
+        again, however far apart the two are.
+
+        Required Parameters
+        -------------------
+        record : integer
+            The index of the record, clipped to the game
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.position = float(min(max(int(record), 0), len(self.states) - 1))
+        self.show()
+
+    def step(self, count=1):
+        """
+        Pauses and moves a number of records, back for negative counts
+
+        Required Parameters
+        -------------------
+        count : integer
+            Records to move
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.playing = False
+        self.seek(self.record + count)
+
+    def play(self):
+        """Plays from the record shown, from the start at the last one"""
+
+        if self.record == len(self.states) - 1:
+            self.position = 0.0
+        self.playing = True
+
+    def pause(self):
+        """Stops at the record shown"""
+
+        self.playing = False
+
+    def toggle(self):
+        """Plays when paused and pauses when playing"""
+
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+
+    def set_speed(self, speed):
+        """
+        Changes the number of records played a second
+
+        Required Parameters
+        -------------------
+        speed : float
+            Records a second, at least 0.25
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.speed = max(speed, 0.25)
+        self.show_caption()
+
+    def advance(self, seconds):
+        """
+        Plays on for some time and draws the record reached
+
+        Records passed over are never drawn. Playing stops at the last
+        record.
+
+        Required Parameters
+        -------------------
+        seconds : float
+            Time since the last advance
+
+        Returns
+        -------
+        None
+
+        """
+
+        if not self.playing:
+            return
+
+        self.position += self.speed * seconds
+        if self.position >= len(self.states) - 1:
+            self.position = float(len(self.states) - 1)
+            self.playing = False
+        self.show()
+
+    def show(self):
+        """
+        Draws the record at the position, if it is not already shown
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        record = self.record
+        if record != self.shown:
+            self.gui.recolor(self.states[record])
+            self.shown = record
+        self.show_caption()
+
+    def show_caption(self):
+        """Shows the record, speed and whether playing in the window title"""
+
+        pygame.display.set_caption("RLRisk Replay - record %d/%d - %g records/s - %s" % (
+            self.record + 1, len(self.states), self.speed,
+            "playing" if self.playing else "paused"))
+
+    def handle(self, event):
+        """
+        Carries out the command of a pygame event
+
+        Required Parameters
+        -------------------
+        event : pygame Event
+            A key press or the window closing, other events are ignored
+
+        Returns
+        -------
+        None
+
+        """
+
+        if event.type == pygame.QUIT:
+            self.close()
+        if event.type != pygame.KEYDOWN:
+            return
+
+        tenth = max(len(self.states) // 10, 1)
+        commands = {pygame.K_SPACE: self.toggle,
+                    pygame.K_RIGHT: lambda: self.step(1),
+                    pygame.K_LEFT: lambda: self.step(-1),
+                    pygame.K_UP: lambda: self.set_speed(self.speed * 2),
+                    pygame.K_DOWN: lambda: self.set_speed(self.speed / 2),
+                    pygame.K_PAGEUP: lambda: self.seek(self.record + tenth),
+                    pygame.K_PAGEDOWN: lambda: self.seek(self.record - tenth),
+                    pygame.K_HOME: lambda: self.seek(0),
+                    pygame.K_END: lambda: self.seek(len(self.states) - 1),
+                    pygame.K_ESCAPE: self.close}
+        if event.key in commands:
+            commands[event.key]()
+        if not self.closed:
+            self.show_caption()
+
+    def run(self):
+        """
+        Shows the replay until the window is closed
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        clock = pygame.time.Clock()
+        last = time.time()
+        while not self.closed:
+            for event in pygame.event.get():
+                self.handle(event)
+            if self.closed:
+                break
+
+            now = time.time()
+            self.advance(now - last)
+            last = now
+            clock.tick(self.fps)
+
+    def close(self):
+        """Closes the GUI"""
+
+        if not self.closed:
+            self.closed = True
+            self.gui.quit_game()
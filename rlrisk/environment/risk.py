@@ -4,18 +4,33 @@ framework from which game environment objects can
 be created
 '''
 
-import random
 import itertools
 import math
+import sys
 import numpy as np
 from rlrisk.environment import config, GUI
+from rlrisk.environment.board import CompiledBoard
+from rlrisk.environment.actions import ActionSpace
+from rlrisk.environment.battle import battle_table
+from rlrisk.environment.cards import CardDeck
+from rlrisk.environment.recorder import Recorder
+from rlrisk.environment.renderer import Renderer
+from rlrisk.environment.rng import GameRNG
+from rlrisk.environment.snapshot import Snapshot, Mark
+from rlrisk.environment.trades import TradeTable
 
 class Risk(object):
     """Game Environment for Risk World Domination Ruleset"""
 
+    #the gui drawn when has_gui is set
+    gui_class = GUI
+
     def __init__(self, agents, turn_order="c", trade_vals="s",
                  steal_cards=False, deal=True, fortify_adjacent=True,
-                 has_gui=False, verbose_gui=False, turn_cap=math.inf):
+                 has_gui=False, verbose_gui=False, turn_cap=math.inf,
+                 blitz=False, blitz_cap=30, bulk_allocation=False, record="turn",
+                 sink=None, verbose=True, seed=None, gui_fps=None, board_map=None,
+                 profiler=None):
         """
         Risk Constructor
 
@@ -44,14 +59,15 @@ class Risk(object):
 
             "c" by default
 
-        trade_vals : String "s"/"1" (letter one) or Generator
+        trade_vals : String "s"/"1" (letter one), Generator or TradeTable
             Options for the sequence that generate card set trade in rewards
             "s" = Standard Risk trade in rewards
             "1" = Increasing by 1
             Generator = Generator representing a unique sequence of integers to reward
+            TradeTable = The rewards of another game, shared with it
 
-            A copy of the generator used to get trade values is in
-            instance variable gen_backup
+            The rewards are looked up in instance variable trade_table by the
+            number of trade ins so far
 
             "s" by default
 
@@ -88,6 +104,81 @@ class Risk(object):
 
             Infinity by default
 
+        blitz : boolean
+            Whether attacks are resolved in a single step. Instead of choosing
+            dice every round (action code 3) and whether to press the attack
+            (action code 2), the attacker chooses the troop count at which they
+            stop (action code 12) and the outcome is drawn from a precomputed
+            table of battle outcomes
+
+            False by default
+
+        blitz_cap : integer
+            Largest troop count of either side kept in the blitz outcome table.
+            Larger battles are fought round by round until within the cap
+
+            30 by default
+
+        bulk_allocation : boolean
+            Whether agents distribute troops with a single decision instead of
+            one decision per troop. Placing troops asks for a count per
+            territory (action codes 13 and 14 in place of 0 and 10) and moving
+            troops between two territories asks for the count sent to the
+            destination (action codes 15 and 16 in place of 6 and 7)
+
+            False by default
+
+        record : String "turn"/"phase", integer or None
+            How often the game state is recorded for the record play returns
+            "turn" = At the beginning of every turn
+            "phase" = At the beginning of every turn and after the recruitment
+                      and attack phases
+            integer k = At the beginning of every k-th turn
+            None = Never, play returns empty records
+
+            "turn" by default
+
+        sink : TrajectorySink
+            Where records are streamed to as the game is played instead of
+            being kept in memory. play then returns views of the sink's files
+
+            None by default
+
+        verbose : boolean
+            Whether or not to print the outcome when the game is over
+
+            True by default
+
+        seed : integer, Numpy SeedSequence or GameRNG
+            Seed of the game's random stream, used for the turn order, dealing,
+            dice and cards. Games with the same seed and agents play out the
+            same. Independent streams for other games can be made with
+            self.rng.spawn
+
+            None by default, for fresh entropy
+
+        gui_fps : float
+            Draw the gui on its own thread at up to this many frames a second.
+            The game publishes its state without waiting for it to be drawn,
+            and states published between frames are skipped. Ignored on
+            macOS, where pygame cannot open a display off the main thread
+
+            None by default, the gui is drawn in the game loop
+
+        board_map : Map
+            The board to play on, such as a map loaded from a map file or a
+            synthetic map, see rlrisk.environment.maps. Starting troops scale
+            with the size of larger boards, and the gui is the map's MapGUI
+
+            None by default, the board of gen_board
+
+        profiler : Profiler
+            Times the phases of the game and the decisions of every agent,
+            see rlrisk.environment.profiler. Simulators of the game are not
+            profiled
+
+            None by default, nothing is timed
+
         Returns
         -------
         None
@@ -98,130 +189,698 @@ class Risk(object):
             raise ValueError("Invalid size for agents. Must be 2<=len(agents)<=6")
 
         self.players = agents
+        self.rng = seed if isinstance(seed, GameRNG) else GameRNG(seed)
 
+        self.turn_setting = turn_order
         if isinstance(turn_order, str):
-            self.turn_order = config.get_turn_order(len(agents), turn_order)
+            self.turn_order = config.get_turn_order(len(agents), turn_order, self.rng)
         else:
             self.turn_order = turn_order
 
-        if isinstance(trade_vals, str):
-            self.orig_trade_vals = config.get_trade_vals(trade_vals)
+        if isinstance(trade_vals, TradeTable):
+            self.trade_table = trade_vals
+        else:
+            self.trade_table = TradeTable(trade_vals)
+
+        self.steal_cards = steal_cards
+        self.fortify_adjacent = fortify_adjacent
+        self.has_gui = has_gui
+        self.verbose_gui = verbose_gui
+        self.deal = deal
+        self.turn_cap = turn_cap
+        self.verbose = verbose
+        self.blitz = blitz
+        self.bulk_allocation = bulk_allocation
+        if blitz:
+            self.battles = battle_table(blitz_cap)
+
+        #rules copies of the game are set up with, see simulator
+        self.rules = {'trade_vals': self.trade_table, 'steal_cards': steal_cards, 'deal': deal,
+                      'fortify_adjacent': fortify_adjacent, 'turn_cap': turn_cap,
+                      'blitz': blitz, 'blitz_cap': blitz_cap,
+                      'bulk_allocation': bulk_allocation, 'board_map': board_map}
+
+        self.turn_count = 0
+        self.game_over = False
+
+        #undo journal, off until a mark is made
+        self.journal = None
+        self.phase_journal = None
+
+        self.board_map = board_map
+        if board_map is None:
+            self.board, self.continents, self.card_faces, self.con_rewards = self.gen_board()
+            self.node2name, self.name2node = self.id_names()
         else:
-            self.orig_trade_vals = trade_vals
+            self.board, self.continents, self.card_faces, self.con_rewards = board_map.tables()
+            self.node2name, self.name2node = board_map.id_names()
+        self.compiled = CompiledBoard(self.board, self.continents, self.con_rewards)
+        self.action_space = ActionSpace(self.compiled, self.card_faces, blitz_cap)
+        self.state = self.gen_init_state(len(self.board), len(self.card_faces))
+        self.index_state()
+        self.recorder = Recorder(record, sink=sink, board_size=len(self.board),
+                                 num_cards=len(self.card_faces))
+
+        #game generator and results of games played through reset and step
+        self.decisions = None
+        self.results = None
+        self.current_player = None
+        self.pending = None
+
+        #mark unmade to since the generator last ran, see rebuild
+        self.rewound = None
+
+        #position at the start of the current phase, its Snapshot once one is
+        #asked for, and the actions since
+        self.phase_marker = None
+        self.phase_start = None
+        self.phase_actions = []
+
+        #pygame displays must be opened on the main thread on macOS
+        self.gui_fps = gui_fps if sys.platform != 'darwin' else None
+        gui_class = self.gui_class if board_map is None else board_map.gui
+        if has_gui and self.gui_fps is not None:
+            self.gui = Renderer(gui_class, self.gui_fps)
+        elif has_gui:
+            self.gui = gui_class()
+
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.attach(self)
+
+        self.setup_agents()
+
+    def setup_agents(self):
+        """
+        Provides every agent with the static game information
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        for plr_num, player in enumerate(self.players):
+            setup_values = [plr_num, self.trade_table,
+                            self.turn_order, self.steal_cards, self.board,
+                            self.continents, self.con_rewards, self.action_space, self]
+            player.pregame_setup(setup_values)
+
+    def simulator(self, agents, seed=None):
+        """
+        A copy of the game's rules for searching ahead
+
+        The copy has the same class, rules and turn order, and no gui or
+        records. Positions of this game can be restored into it.
+
+        Required Parameters
+        -------------------
+        agents : List
+            The players of the copy, one per player of this game
+
+        Optional Parameters
+        -------------------
+        seed : integer, Numpy SeedSequence or GameRNG
+            Seed of the copy's random stream
+
+            None by default, for fresh entropy
+
+        Returns
+        -------
+        Risk
+
+        """
+
+        rules = dict(self.rules, turn_order=list(self.turn_order))
+        simulator = type(self)(agents, record=None, seed=seed, **rules)
+        simulator.verbose = False
+        return simulator
+
+    def play(self):
+        """
+        Play the game
+
+        Begins the game with the rules and variations set forth during
+        instantiation. Games start with territory allotment, and then
+        proceed to the main portion of the game, turn taking. Every
+        decision is made by the agents in self.players.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        6 value tuple
+            (Records,42) int8 Numpy Array: Record of territory ownership
+            (Records,42) int16 Numpy Array: Record of troops per territory
+            (Records,44) int8 Numpy Array: Record of card ownership
+            (Records,)   int16 Numpy Array: Record of number of card set trade ins
+            List: In order numbering of each players turn order 0->n players
+            boolean: Whether or not defeated player's card go to the player that
+                     defeated them
+
+        """
+
+        return self.drive(self.game())
+
+    def drive(self, decisions):
+        """
+        Runs a game generator, asking the agents for every decision
+
+        Required Parameters
+        -------------------
+        decisions : Generator
+            Yields (player, action_code, options) decision points and is sent
+            the action chosen for each, such as the one made by game
+
+        Returns
+        -------
+        The value the generator returns
+
+        """
+
+        try:
+            player, action_code, options = next(decisions)
+            while True:
+                action = self.players[player].take_action(self.state, action_code, options)
+                self.phase_actions.append(action)
+                player, action_code, options = decisions.send(action)
+        except StopIteration as stop:
+            return stop.value
+
+    def reset(self):
+        """
+        Starts a game that is played by calling step
+
+        Instead of the environment asking the agents in self.players, the
+        caller is given every decision point and sends back the action
+        through step. The index of the player making the decision is kept in
+        self.current_player. Games after the first are set up again with the
+        same rules, a new turn order (unless it was given as a list) and a
+        new deal.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        3 value tuple
+            3 value tuple: The game state
+            integer: The action code of the first decision
+            The options of the decision, as given to take_action
+
+        """
+
+        if self.decisions is not None:
+            self.new_game()
+
+        self.rewound = None
+        self.decisions = self.game()
+        self.results = None
+        self.current_player, action_code, options = next(self.decisions)
+        self.pending = (action_code, options)
+        return self.state, action_code, options
+
+    def step(self, action):
+        """
+        Makes a decision and plays on until the next one
+
+        Required Parameters
+        -------------------
+        action : Any
+            The choice for the pending decision, what an agent's take_action
+            would return for it
+
+        Returns
+        -------
+        4 value tuple
+            3 value tuple: The game state
+            integer: The action code of the next decision, None if the game is over
+            The options of the next decision, None if the game is over
+            boolean: Whether or not the game is over, the records play would
+                     have returned are then in self.results
+
+        """
+
+        if self.rewound is not None:
+            self.rebuild()
+
+        try:
+            self.phase_actions.append(action)
+            self.current_player, action_code, options = self.decisions.send(action)
+        except StopIteration as stop:
+            if self.results is None:
+                self.results = stop.value
+            self.current_player = None
+            self.pending = None
+            return self.state, None, None, True
+
+        self.pending = (action_code, options)
+        return self.state, action_code, options, False
+
+    def mark_phase(self, phase):
+        """
+        Takes the position at the start of a phase, which snapshots build on
+
+        Only copies of the parts that change during the phase are kept, the
+        Snapshot is built by the first call to snapshot in the phase.
+
+        Required Parameters
+        -------------------
+        phase : integer
+            -1 for the start of the game, 0 for recruitment, 1 for attack
+            and 2 for fortify
+
+        Returns
+        -------
+        None
+
+        """
+
+        territories, cards, trade_ins = self.state
+        if self.journal is not None:
+            self.phase_journal = len(self.journal)
+
+        #the draw pile is replaced when reshuffled, never changed in place
+        self.phase_marker = (territories.copy(), cards.copy(), trade_ins, self.turn_count, phase,
+                             [player.defeated for player in self.players],
+                             self.rng.get_state(), self.deck.pile, self.deck.pointer,
+                             list(self.deck.discarded))
+        self.phase_start = None
+        self.phase_actions = []
+
+    def snapshot(self):
+        """
+        The position of the game
+
+        Holds the arrays at the start of the current phase, the random
+        stream, the deck and the actions made since the start of the phase,
+        so it can be pickled and restored in another environment with the
+        same rules.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Snapshot
+
+        """
+
+        if self.phase_start is None:
+            self.phase_start = Snapshot(*self.phase_marker)
+        return self.phase_start.after(self.phase_actions)
+
+    def restore(self, snapshot):
+        """
+        Puts the game back at the position of a snapshot
+
+        The game is then played through step, from the decision that was
+        pending when the snapshot was taken. Agents' defeated flags are set
+        to those of the position. Ends the undo journal.
+
+        Required Parameters
+        -------------------
+        snapshot : Snapshot
+            From snapshot of an environment with the same rules and players
+
+        Returns
+        -------
+        3 value tuple
+            Same as reset
+
+        """
+
+        self.end_journal()
+
+        self.state = (snapshot.territories.astype(int), snapshot.cards.astype(int),
+                      snapshot.trade_ins)
+        self.turn_count = snapshot.turn_count
+        self.game_over = False
+        for player, defeated in zip(self.players, snapshot.defeated.tolist()):
+            player.defeated = defeated
+
+        self.index_state()
+        self.deck.pile = snapshot.pile.tolist()
+        self.deck.pointer = snapshot.pointer
+        self.deck.discarded = list(snapshot.discarded)
+
+        return self.resume(snapshot)
+
+    def resume(self, snapshot):
+        """
+        Plays from the start of a snapshot's phase to its pending decision
+
+        The state must already be that of the start of the phase.
+
+        Required Parameters
+        -------------------
+        snapshot : Snapshot
+            The position to resume
+
+        Returns
+        -------
+        3 value tuple
+            Same as reset
+
+        """
+
+        self.rng.set_state(snapshot.rng_state)
+
+        self.rewound = None
+        self.decisions = self.game(snapshot.phase)
+        self.results = None
+        self.current_player, action_code, options = next(self.decisions)
+        self.pending = (action_code, options)
+
+        #the actions since the start of the phase lead back to the position
+        for action in snapshot.actions:
+            state, action_code, options, done = self.step(action)
+        return self.state, action_code, options
+
+    def mark(self):
+        """
+        Marks the current position to unmake back to
+
+        Starts the undo journal if it is not on. While it is on, every
+        change to troops, owners, cards, trade ins, defeated players, the
+        turn count and game over is journaled. Records are not.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        Mark
+
+        """
+
+        if self.journal is None:
+            self.journal = []
+            self.deck.journal = self.journal
+            self.phase_journal = None
+
+        snapshot = None
+        if self.phase_marker is not None:
+            snapshot = self.snapshot()
+        return Mark(len(self.journal), self.rng.get_state(), self.phase_journal, snapshot,
+                    (self.current_player, self.pending))
+
+    def unmake(self, mark):
+        """
+        Undoes every change made since a mark
+
+        The changes are undone from the journal in reverse order, and games
+        played through reset and step are back at the decision pending at
+        the mark. Their decisions generator cannot be rewound, so the next
+        step rebuilds it, see rebuild.
+
+        Required Parameters
+        -------------------
+        mark : Mark
+            From mark, since which the journal has not ended
+
+        Returns
+        -------
+        3 value tuple
+            Same as reset, or None for games not played through reset and step
+
+        """
+
+        self.revert(mark.length)
+        self.rng.set_state(mark.rng_state)
+        if self.decisions is None or mark.snapshot is None:
+            return None
+
+        #the phase bookkeeping of the mark, so snapshots and marks made
+        #before the next step are the position at the mark
+        self.current_player, self.pending = mark.decision
+        self.results = None
+        self.phase_journal = mark.phase_length
+        self.phase_start = mark.snapshot.after([])
+        self.phase_actions = list(mark.snapshot.actions)
+        self.rewound = mark
+
+        action_code, options = self.pending
+        return self.state, action_code, options
+
+    def rebuild(self):
+        """
+        Rebuilds the decisions generator at the mark last unmade to
+
+        A generator's frame cannot be copied or rewound, so the actions made
+        in the mark's phase are played again from its start. This is only
+        done once a game is stepped after unmake, unmaking to look at a
+        position and unmaking several marks in a row stay within the journal.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        mark, self.rewound = self.rewound, None
+        if mark.phase_length is None or self.journal is None:
+            #the phase started before the journal, so the position is rebuilt
+            journal = self.journal
+            self.restore(mark.snapshot)
+            self.journal = self.deck.journal = journal
+            self.phase_journal = None
+        else:
+            self.revert(mark.phase_length)
+            self.resume(mark.snapshot)
+
+    def revert(self, length):
+        """
+        Undoes the journaled changes past a length of the journal
+
+        Required Parameters
+        -------------------
+        length : integer
+            Number of changes to keep
+
+        Returns
+        -------
+        None
+
+        """
+
+        journal = self.journal
+        self.journal = self.deck.journal = None
+        territories = self.state[0]
+
+        while len(journal) > length:
+            change = journal.pop()
+            kind = change[0]
+            if kind == 'troops':
+                territories[change[1], 1] = change[2]
+            elif kind == 'owner':
+                self.set_owner(change[1], change[2])
+            elif kind == 'defeat':
+                self.players[change[1]].defeated = False
+            elif kind == 'trade_ins':
+                self.state = (territories, self.state[1], change[1])
+            elif kind == 'turn':
+                self.turn_count = change[1]
+            elif kind == 'game_over':
+                self.game_over = change[1]
+            else:
+                self.deck.undo(change)
+
+        self.journal = self.deck.journal = journal
+
+    def end_journal(self):
+        """
+        Stops journaling changes, marks can no longer be unmade
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.journal = self.deck.journal = None
+        self.phase_journal = None
+
+    def legal_actions(self):
+        """
+        Mask of the legal columns of the pending decision
+
+        Columns follow the fixed encoding of self.action_space, see
+        ActionSpace. Only for games played through reset and step
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        (action_space.size,) Numpy Array of booleans
+
+        """
+
+        return self.action_space.mask(*self.pending)
+
+    def decode_action(self, index):
+        """
+        Option value of a column of the pending decision
+
+        Required Parameters
+        -------------------
+        index : integer
+            A legal column of the fixed action encoding
+
+        Returns
+        -------
+        ? : The action to pass to step
+
+        """
+
+        action_code, options = self.pending
+        return self.action_space.decode(action_code, index, options)
+
+    def new_game(self):
+        """
+        Sets the environment up for another game with the same rules
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
 
-        #A backup of the trade vals generator
-        self.trade_vals, self.gen_backup = itertools.tee(self.orig_trade_vals)
+        """
 
-        self.steal_cards = steal_cards
-        self.fortify_adjacent = fortify_adjacent
-        self.has_gui = has_gui
-        self.verbose_gui = verbose_gui
-        self.deal = deal
-        self.turn_cap = turn_cap
+        if isinstance(self.turn_setting, str):
+            self.turn_order = config.get_turn_order(len(self.players), self.turn_setting,
+                                                    self.rng)
 
         self.turn_count = 0
         self.game_over = False
-        self.board, self.continents, self.card_faces, self.con_rewards = self.gen_board()
-        self.state = self.gen_init_state()
-        self.node2name, self.name2node = self.id_names()
-        self.record = {0:[], 1:[], 2:[], 3:[]}
-
-        if has_gui:
-            self.gui = GUI()
-
-        for plr_num, player in enumerate(agents):
-            setup_values = [plr_num, itertools.tee(self.orig_trade_vals, 1),
-                            turn_order, steal_cards, self.board,
-                            self.continents, self.con_rewards]
-            player.pregame_setup(setup_values)
+        self.state = self.gen_init_state(len(self.board), len(self.card_faces))
+        self.index_state()
+        self.recorder = Recorder(self.recorder.granularity, sink=self.recorder.sink,
+                                 board_size=len(self.board), num_cards=len(self.card_faces))
+        self.setup_agents()
 
-    def play(self):
+    def game(self, phase=-1):
         """
-        Play the game
+        The game as a generator of decision points
 
-        Begins the game with the rules and variations set forth during
-        instantiation. Games start with territory allotment, and then
-        proceed to the main portion of the game, turn taking.
+        Plays the game like play, but rather than asking an agent, yields
+        (player, action_code, options) whenever a decision is needed and
+        expects to be sent the action chosen. See drive and step.
 
-        Parameters
-        ----------
-        None
+        Optional Parameters
+        -------------------
+        phase : integer
+            Where to start, -1 for the start of the game, or 0, 1 or 2 for
+            the recruitment, attack or fortify phase of the current turn
+            when resuming a restored position
+
+            -1 by default
 
         Returns
         -------
         6 value tuple
-            (TurnCount,42) Numpy Array: Record of territory ownership
-            (TurnCount,42) Numpy Array: Record of troops per territory
-            (TurnCount,44) Numpy Array: Record of card ownership
-            (TurnCount,)   Numpy Array: Record of number of card set trade ins
-            List: In order numbering of each players turn order 0->n players
-            boolean: Whether or not defeated player's card go to the player that
-                     defeated them
+            Same as play, as the value of StopIteration
 
         """
 
         num_players = len(self.players)
 
-        #divy up territories at game start
-        self.allocate_territories()
+        #a resumed turn was recorded before the position was taken
+        resumed = phase != -1
 
-        #place starting troops
-        self.place_starting_troops()
-        self.gui_update()
+        if phase == -1:
+            self.mark_phase(-1)
+
+            #divy up territories at game start
+            yield from self.allocate_territories()
+
+            #place starting troops
+            yield from self.place_starting_troops()
+            self.gui_update()
+            phase = 0
 
         #Main game loop
         while not self.game_over:
             #record state
-            self.record_state()
+            if not resumed:
+                self.record_state()
+            resumed = False
 
             #get the index of player whose turn it is
             turn = self.turn_order[self.turn_count%num_players]
 
             #check if player is defeated, if so skip turn
             while self.players[turn].defeated:
-                self.turn_count += 1
+                self.next_turn()
                 turn = self.turn_order[self.turn_count%num_players]
 
             #perform recruitment phase
-            self.recruitment_phase(turn)
-            self.gui_update()
+            if phase == 0:
+                self.mark_phase(0)
+                yield from self.recruitment_phase(turn)
+                self.record_state(1)
+                self.gui_update()
 
             #perform attack phase
-            self.attack_phase(turn)
-            self.gui_update()
-
-            #Don't allow reinforcement phase if player has won the game
-            if self.winner():
-                self.game_over = True
-                break
+            if phase <= 1:
+                self.mark_phase(1)
+                yield from self.attack_phase(turn)
+                self.record_state(2)
+                self.gui_update()
+
+                #Don't allow reinforcement phase if player has won the game
+                if self.winner():
+                    self.end_game()
+                    break
 
             #perform recruitment phase
-            self.fortify_phase(turn)
+            self.mark_phase(2)
+            yield from self.fortify_phase(turn)
             self.gui_update()
 
             #increase turn count
-            self.turn_count += 1
+            self.next_turn()
+            phase = 0
 
             if self.turn_count > self.turn_cap:
-                self.game_over = True
+                self.end_game()
                 break
 
         #exit message
-        if self.turn_count > self.turn_cap:
-            print("The game is over! Turn Cap was reached.")
-        else:
-            winner = self.turn_order[self.turn_count%num_players] + 1
-            print("The game is over! Player", winner, "won the game!")
+        if self.verbose:
+            if self.turn_count > self.turn_cap:
+                print("The game is over! Turn Cap was reached.")
+            else:
+                winner = self.turn_order[self.turn_count%num_players] + 1
+                print("The game is over! Player", winner, "won the game!")
 
         #quit gui
         self.gui_update()
 
-        return (np.array(self.record[0]),
-                np.array(self.record[1]),
-                np.array(self.record[2]),
-                np.array(self.record[3]),
-                self.turn_order,
-                self.steal_cards)
+        records = self.recorder.finish(self.turn_order, self.steal_cards)
+        return records + (self.turn_order, self.steal_cards)
 
     def recruitment_phase(self, player):
         """
@@ -244,15 +903,15 @@ class Risk(object):
 
         recruited = self.calculate_recruits(player)
 
-        self.place_troops(player, recruited)
+        yield from self.place_troops(player, recruited)
 
         #gets card sets, if they have card sets ask the player if they want to trade
         set_list, card_count = self.get_sets(player)
         if len(set_list) != 0:
-            recruited = self.trade_in(player, set_list, card_count)
+            recruited = yield from self.trade_in(player, set_list, card_count)
             #zero is they chose not to trade in a set
             if recruited != 0:
-                self.place_troops(player, recruited)
+                yield from self.place_troops(player, recruited)
 
     def attack_phase(self, player):
         """
@@ -286,7 +945,7 @@ class Risk(object):
         territories = self.state[0]
 
         targets = self.get_targets(player)
-        choice = self.players[player].take_action(self.state, 1, targets)
+        choice = yield player, 1, targets
 
         card_eligible = True
 
@@ -295,13 +954,16 @@ class Risk(object):
             defending_player = territories[choice[1], 0]
 
             #-1 is defeat, 1 is victory, 0 is undecided
-            result = self.combat(choice)
+            if self.blitz:
+                result = yield from self.blitz_combat(choice)
+            else:
+                result = yield from self.combat(choice)
 
             if result == -1:
                 break
             elif result == 0:
                 #agent asked if they want to continue attacking after undecided
-                press_attack = self.players[player].take_action(self.state, 2, (True, False))
+                press_attack = yield player, 2, (True, False)
                 if not press_attack:
                     break
             else:
@@ -310,16 +972,16 @@ class Risk(object):
                     self.reward_card(player)
                     card_eligible = False
 
-                self.after_attack_reinforce(player, choice)
+                yield from self.after_attack_reinforce(player, choice)
 
                 #check if this defeated the other player
-                self.defeated(defending_player, player)
+                yield from self.defeated(defending_player, player)
 
                 territories = self.state[0]
 
                 if territories[choice[1], 1] > 1:
                     targets = self.get_targets(player, frm=choice[1])
-                    choice = self.players[player].take_action(self.state, 11, targets)
+                    choice = yield player, 11, targets
                 else:
                     break
 
@@ -357,36 +1019,42 @@ class Risk(object):
         valid_source = owned[np.where(territories[owned, 1] > 1)[0]].tolist()
         source = False
         if len(valid_source) > 0:
-            source = self.players[player].take_action(self.state, 4, valid_source+[False])
+            source = yield player, 4, valid_source+[False]
 
         if source != False:
             if self.fortify_adjacent:
-                valid_destinations = np.intersect1d(owned, self.board[source])
+                valid_destinations = self.compiled.ids(
+                    self.compiled.neighbor_masks[source] & self.owned_masks[player])
             else:
                 valid_destinations = self.map_connected_territories(source, owned)
 
             #Could have chosen a dead-end province
             if len(valid_destinations) > 0:
 
-                destination = self.players[player].take_action(self.state, 5, valid_destinations)
+                destination = yield player, 5, valid_destinations
 
-                self.fortify(player, source, destination)
+                yield from self.fortify(player, source, destination)
 
-    def record_state(self):
+    def record_state(self, phase=0):
         """
         Records the state of the game
 
-        Creates a list of the game state at the beginning of each turn.
-        At the end of the game, these are changed to numpy arrays and
+        Writes the game state into the recorder's buffers if the
+        recording granularity asks for it at this point of the turn.
+        At the end of the game, the filled part of the buffers is
         returned.
 
         The game state is the 3 value tuple, but the recording of the game
         state breaks the 1st value (the territories with owner and troop count)
         into 2 seperate arrays, the owner and troop count
 
-        Parameters
-        ----------
-        None
+        Optional Parameters
+        -------------------
+        phase : integer
+            0 for the beginning of the turn, 1 after recruitment and
+            2 after attack
+
+            0 by default
 
         Returns
         -------
@@ -394,10 +1062,8 @@ class Risk(object):
 
         """
 
-        self.record[0].append(np.copy(self.state[0][:, 0]))
-        self.record[1].append(np.copy(self.state[0][:, 1]))
-        self.record[2].append(np.copy(self.state[1]))
-        self.record[3].append(self.state[2])
+        if self.recorder.wants(self.turn_count, phase):
+            self.recorder.append(self.state)
 
     def place_starting_troops(self):
         """
@@ -405,7 +1071,8 @@ class Risk(object):
 
         Gathers the number of starting troops alloted for the number of players,
         subtracts the number of territories each player recieved, and then asks
-        the players to place troops one by one totating by turn order
+        the players to place troops one by one totating by turn order, or all
+        at once in turn order when allocating in bulk
 
         Parameters
         ----------
@@ -418,14 +1085,20 @@ class Risk(object):
         """
 
         troops_to_place = {}
-        s_troops = self.starting_troops(len(self.players))
+        s_troops = self.starting_troops(len(self.players), len(self.board))
         for player_index in self.turn_order:
-            troops_per = s_troops - self.get_owned_territories(player_index).shape[0]
+            troops_per = s_troops - self.territory_counts[player_index]
             troops_to_place[player_index] = troops_per
 
+        if self.bulk_allocation:
+            #each player places all their troops at once
+            for player_index in self.turn_order:
+                yield from self.place_troops(player_index, troops_to_place[player_index], 10)
+            return
+
         for player_index in itertools.cycle(self.turn_order):
             if player_index in troops_to_place:
-                self.place_troops(player_index, 1, 10)
+                yield from self.place_troops(player_index, 1, 10)
                 troops_to_place[player_index] -= 1
                 if troops_to_place[player_index] == 0:
                     troops_to_place.pop(player_index)
@@ -438,7 +1111,7 @@ class Risk(object):
 
         Calculates all troops from source province elegible to transfer
         to destination province, and then prompts agent to place them
-        one by one
+        one by one, or for how many to send when allocating in bulk
 
         Required Parameters
         -------------------
@@ -460,18 +1133,25 @@ class Risk(object):
         territories, cards, trade_ins = self.state
 
         distribute = territories[source, 1] - 1
-        territories[source, 1] = 1
+        self.set_troops(source, 1)
+
+        if self.bulk_allocation:
+            moved = yield from self.ask_split(player, 6, distribute, (source, destination))
+            self.add_troops(destination, moved)
+            self.add_troops(source, distribute - moved)
+            self.gui_update(True)
+            return
 
         for troop in range(distribute):
             #repack state
             self.state = (territories, cards, trade_ins)
 
-            choice = self.players[player].take_action(self.state, 6, (source, destination))
+            choice = yield player, 6, (source, destination)
 
             if choice == destination:
-                territories[destination][1] += 1
+                self.add_troops(destination, 1)
             else:
-                territories[source][1] += 1
+                self.add_troops(source, 1)
 
             self.gui_update(True)
 
@@ -479,9 +1159,9 @@ class Risk(object):
         """
         Generates all territories connected to a given territory owned by a player
 
-        Performs breadth first search on the board to construct the breadth
-        first traversal of the spanner tree rooted at the source province.
-        Only counts territory owned by the same player.
+        Grows the region around the source province one ring of neighbors
+        at a time using the compiled board's bitmasks. Only counts territory
+        owned by the same player.
 
         Required Parameters
         -------------------
@@ -498,18 +1178,8 @@ class Risk(object):
 
         """
 
-        contiguous = [source]
-
-        index = 0
-        while True:
-            for terr in self.board[contiguous[index]]:
-                if terr in owned and terr not in contiguous:
-                    contiguous.append(terr)
-            index += 1
-            if index >= len(contiguous):
-                break
-
-        return contiguous
+        region = self.compiled.connected(source, self.compiled.mask(owned))
+        return self.compiled.ids(region).tolist()
 
     def get_targets(self, player, frm=-1):
         """
@@ -541,19 +1211,8 @@ class Risk(object):
 
         territories = self.state[0]
 
-        owned = self.get_owned_territories(player)
-
-        if frm == -1:
-            valid_from = owned[np.where(territories[owned, 1] > 1)[0]]
-        else:
-            valid_from = [frm]
-
-        attacks = []
-        for vf_terr in valid_from:
-            links = set(self.board[vf_terr])
-            valid_to = links - set(owned)
-            for vt_terr in valid_to:
-                attacks.append((vf_terr, vt_terr))
+        attacks = [tuple(attack) for attack in
+                   self.compiled.attacks(territories, player, frm).tolist()]
 
         attacks.append(False)
 
@@ -603,17 +1262,11 @@ class Risk(object):
 
         #prompt attacker for how many troops to risk
         attacking_player_index = territories[attacking_from, 0]
-        attacking_player = self.players[attacking_player_index]
-        attacking_troops = attacking_player.take_action(self.state, 3, options)
+        attacking_troops = yield attacking_player_index, 3, options
 
         #emulate 6 sided dice
-        a_rolls = []
-        for roll in range(attacking_troops):
-            a_rolls.append(random.randrange(1, 7))
-
-        d_rolls = []
-        for roll in range(defending_troops):
-            d_rolls.append(random.randrange(1, 7))
+        a_rolls = self.rng.dice(attacking_troops)
+        d_rolls = self.rng.dice(defending_troops)
 
         #compare highest pairs
         for roll in range(min((len(d_rolls), len(a_rolls)))):
@@ -629,16 +1282,16 @@ class Risk(object):
                 max_attack_troops -= 1
 
         if max_defend_troops == 0:
-            territories[attacking_from, 1] = max_attack_troops-attacking_troops
-            territories[attacking_to, 1] = attacking_troops
-            territories[attacking_to, 0] = attacking_player_index
+            self.set_troops(attacking_from, max_attack_troops-attacking_troops)
+            self.set_troops(attacking_to, attacking_troops)
+            self.set_owner(attacking_to, attacking_player_index)
             result = 1
         elif max_attack_troops == 1:
-            territories[attacking_from, 1] = max_attack_troops
+            self.set_troops(attacking_from, max_attack_troops)
             result = -1
         else:
-            territories[attacking_from, 1] = max_attack_troops
-            territories[attacking_to, 1] = max_defend_troops
+            self.set_troops(attacking_from, max_attack_troops)
+            self.set_troops(attacking_to, max_defend_troops)
             result = 0
 
         #repack state
@@ -646,11 +1299,65 @@ class Risk(object):
 
         return result
 
+    def blitz_combat(self, attack):
+        """
+        Performs a whole battle for a given attack in one step
+
+        The attacker is prompted for the number of troops at which they
+        will stop attacking (1 to fight until one side is defeated). The
+        battle is then fought as if the attacker always risked the most
+        troops they could, with the final troop counts drawn from the
+        battle outcome table. On victory the attacker moves in as many
+        troops as they would have risked in the last round.
+
+        Required Parameters
+        -------------------
+        attack : 2 integer tuple
+            The territory IDs of (attacking_from, attacking_to)
+
+        Returns
+        -------
+        integer :
+            -1 if the attack ended in failure or was stopped
+             1 if attack resulted in victory
+
+        """
+
+        territories, cards, trade_ins = self.state
+
+        attacking_from, attacking_to = attack
+
+        attack_troops = territories[attacking_from, 1]
+        attacking_player_index = territories[attacking_from, 0]
+
+        #prompt attacker for when to stop
+        options = list(range(1, attack_troops))
+        stop = yield attacking_player_index, 12, options
+
+        attack_troops, defend_troops = self.battles.resolve(
+            attack_troops, territories[attacking_to, 1], stop, self.rng.random)
+
+        if defend_troops == 0:
+            moved = min(3, attack_troops - 1)
+            self.set_troops(attacking_from, attack_troops - moved)
+            self.set_troops(attacking_to, moved)
+            self.set_owner(attacking_to, attacking_player_index)
+            result = 1
+        else:
+            self.set_troops(attacking_from, attack_troops)
+            self.set_troops(attacking_to, defend_troops)
+            result = -1
+
+        #repack state
+        self.state = territories, cards, trade_ins
+
+        return result
+
     def reward_card(self, player):
         """
         Deals a random card to a player
 
-        Assigns an unowned card to a given player
+        Assigns the top card of the shuffled draw pile to a given player
 
         Required Parameters
         -------------------
@@ -662,20 +1369,15 @@ class Risk(object):
         None
 
         """
-        territories, cards, trade_ins = self.state
-
-        unowned = np.where(cards[cards == 6])[0]
-        cards[np.random.choice(unowned)] = player
-
-        #repack state
-        self.state = (territories, cards, trade_ins)
+        self.deck.draw(player)
 
     def after_attack_reinforce(self, player, attack):
         """
         Handles moving troops into newly acquired territory
 
         Asks the agent to place troops from the attacking territory
-        to the new territory (or not) one by one
+        to the new territory (or not) one by one, or for how many to
+        send when allocating in bulk
 
         Required Parameters
         -------------------
@@ -696,16 +1398,23 @@ class Risk(object):
         att_frm, att_to = attack
 
         divy_up = territories[att_frm, 1]-1
-        territories[att_frm, 1] = 1
+        self.set_troops(att_frm, 1)
+
+        if self.bulk_allocation:
+            moved = yield from self.ask_split(player, 7, divy_up, attack)
+            self.add_troops(att_to, moved)
+            self.add_troops(att_frm, divy_up - moved)
+            self.gui_update(True)
+            return
 
         for troop in range(divy_up):
             #repack state
             self.state = (territories, cards, trade_ins)
-            choice = self.players[player].take_action(self.state, 7, attack)
+            choice = yield player, 7, attack
             if choice == att_to:
-                territories[att_to, 1] += 1
+                self.add_troops(att_to, 1)
             else:
-                territories[att_frm, 1] += 1
+                self.add_troops(att_frm, 1)
             self.gui_update(True)
 
     def defeated(self, victim, conquerer):
@@ -737,13 +1446,16 @@ class Risk(object):
 
         territories, cards, trade_ins = self.state
 
-        if victim not in territories[:, 0]:
+        if self.territory_counts[victim] == 0:
             #they own no territories, so they are defeated
             self.players[victim].defeated = True
+            if self.journal is not None:
+                self.journal.append(('defeat', victim))
 
-            if not self.steal_cards:
-                cards[cards == victim] = 6
-            cards[cards == victim] = conquerer
+            if self.steal_cards:
+                self.deck.transfer(victim, conquerer)
+            else:
+                self.deck.transfer(victim, 6)
 
             #repack state
             self.state = (territories, cards, trade_ins)
@@ -751,8 +1463,8 @@ class Risk(object):
             set_list, cards_owned = self.get_sets(conquerer)
             first_trade = True
             while (first_trade and cards_owned > 5) or (not first_trade and cards_owned > 4):
-                troops_awarded = self.trade_in(conquerer, set_list, cards_owned)
-                self.place_troops(conquerer, troops_awarded)
+                troops_awarded = yield from self.trade_in(conquerer, set_list, cards_owned)
+                yield from self.place_troops(conquerer, troops_awarded)
                 set_list, cards_owned = self.get_sets(conquerer)
                 first_trade = False
 
@@ -761,7 +1473,8 @@ class Risk(object):
         Checks if the game is over
 
         Checks to see if all territories are owned by the same player,
-        if so the game is over
+        if so the game is over. Uses the ownership index, so only the
+        owner of the first territory needs to be looked at
 
         Required Parameters
         -------------------
@@ -775,7 +1488,7 @@ class Risk(object):
         """
 
         territories = self.state[0]
-        return np.array_equal(territories[:, 0], np.repeat(territories[0, 0], len(self.board)))
+        return self.territory_counts[territories[0, 0]] == len(self.board)
 
     def get_owned_territories(self, player):
         """
@@ -789,12 +1502,178 @@ class Risk(object):
         Returns
         -------
         (?,) Numpy Array:
-            The IDs of territories owned by the player
+            The IDs of territories owned by the player, shared until the
+            player's territories change so it must not be modified
+
+        """
+
+        if player not in self.owned_cache:
+            self.owned_cache[player] = self.compiled.ids(self.owned_masks[player])
+        return self.owned_cache[player]
+
+    def index_state(self):
+        """
+        Rebuilds everything kept alongside the state
+
+        Rebuilds the ownership index and the card deck, which shuffles
+        the unowned cards into a new draw pile. Must be called whenever
+        the state is replaced.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.index_ownership()
+        self.deck = CardDeck(self.card_faces, len(self.players), self.state[1], self.rng)
+        self.deck.journal = self.journal
+
+    def index_ownership(self):
+        """
+        Rebuilds the ownership index from the current state
+
+        The index keeps a bitmask of owned territories and a territory count
+        for each player, with one extra last entry for unowned territories
+        so that an owner of -1 indexes it. It is kept up to date by set_owner,
+        and must be rebuilt if the state is replaced.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        owners = self.state[0][:, 0]
+        self.owned_masks = [self.compiled.mask(owners == player)
+                            for player in list(range(len(self.players))) + [-1]]
+        self.territory_counts = [bin(mask).count("1") for mask in self.owned_masks]
+        self.owned_cache = {}
+
+    def set_troops(self, territory, troops):
+        """
+        Sets the troop count of territories
+
+        Required Parameters
+        -------------------
+        territory : integer or Numpy Array
+            Territory ID or IDs
+
+        troops : integer or Numpy Array
+            The new troop counts
+
+        Returns
+        -------
+        None
+
+        """
+
+        territories = self.state[0]
+        if self.journal is not None:
+            self.journal.append(('troops', territory, territories[territory, 1]))
+        territories[territory, 1] = troops
+
+    def add_troops(self, territory, troops):
+        """
+        Adds troops to territories
+
+        Required Parameters
+        -------------------
+        territory : integer or Numpy Array
+            Territory ID or IDs, without repeats
+
+        troops : integer or Numpy Array
+            The number of troops added to each
+
+        Returns
+        -------
+        None
+
+        """
+
+        territories = self.state[0]
+        if self.journal is not None:
+            self.journal.append(('troops', territory, territories[territory, 1]))
+        territories[territory, 1] += troops
+
+    def next_turn(self):
+        """
+        Increases the turn count
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        if self.journal is not None:
+            self.journal.append(('turn', self.turn_count))
+        self.turn_count += 1
+
+    def end_game(self):
+        """
+        Marks the game as over
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        if self.journal is not None:
+            self.journal.append(('game_over', self.game_over))
+        self.game_over = True
+
+    def set_owner(self, territory, player):
+        """
+        Transfers a territory to a player and updates the ownership index
+
+        Required Parameters
+        -------------------
+        territory : integer
+            The territory ID
+
+        player : integer
+            The index of the new owner in self.players
+
+        Returns
+        -------
+        None
 
         """
 
         territories = self.state[0]
-        return np.where(territories[:, 0] == player)[0]
+        previous = territories[territory, 0]
+        bit = self.compiled.bits[territory]
+
+        if self.journal is not None:
+            self.journal.append(('owner', territory, previous))
+
+        self.owned_masks[previous] &= ~bit
+        self.territory_counts[previous] -= 1
+        self.owned_masks[player] |= bit
+        self.territory_counts[player] += 1
+
+        self.owned_cache.pop(previous, None)
+        self.owned_cache.pop(player, None)
+
+        territories[territory, 0] = player
 
     def calculate_recruits(self, player):
         """
@@ -814,24 +1693,17 @@ class Risk(object):
 
         """
 
-        territories_owned = self.get_owned_territories(player)
+        owned = self.owned_masks[player]
 
         #Risk rules say # of owned territories then floor division by 3
-        recruitment = len(territories_owned) // 3
+        recruitment = self.territory_counts[player] // 3
 
         #you always get at least 3
         if recruitment < 3:
             recruitment = 3
 
         #Calculate for continents
-        for continent in self.continents:
-            c_owned = True
-            for territory in self.continents[continent]:
-                if territory not in territories_owned:
-                    c_owned = False
-
-            if c_owned:
-                recruitment += self.con_rewards[continent]
+        recruitment += self.compiled.continent_bonus(owned)
 
         return recruitment
 
@@ -839,7 +1711,9 @@ class Risk(object):
         """
         Place troops into owned territory
 
-        Prompts the player for a territory to place troops one at a time
+        Prompts the player for a territory to place troops one at a time,
+        or for the number of troops to place in each owned territory when
+        allocating in bulk
 
         Required Parameters
         -------------------
@@ -864,21 +1738,102 @@ class Risk(object):
         """
 
         territories, cards, trade_ins = self.state
-        current_player = self.players[player]
+
+        if self.bulk_allocation:
+            valid = self.get_owned_territories(player)
+            counts = yield from self.ask_allocation(player, action_code, troops, valid)
+            self.add_troops(valid, counts)
+            self.state = (territories, cards, trade_ins)
+            self.gui_update(True)
+            return
 
         for troop in range(troops):
             valid = self.get_owned_territories(player)
-            chosen = current_player.take_action(self.state, action_code, valid)
-            territories[chosen][1] += 1
+            chosen = yield player, action_code, valid
+            self.add_troops(chosen, 1)
             self.state = (territories, cards, trade_ins)
             self.gui_update(True)
 
+    def ask_allocation(self, player, action_code, troops, valid):
+        """
+        Asks an agent to distribute troops over territories in one decision
+
+        The agent is given the number of troops and the territories they may
+        go to, and must return how many troops go to each of them.
+
+        Required Parameters
+        -------------------
+        player : integer
+            The index of the agent in self.players
+
+        action_code : integer
+            The per troop action code this allocation replaces, 0 or 10
+
+        troops : integer
+            Number of troops to distribute
+
+        valid : (?,) Numpy Array
+            Territory IDs the troops may be placed in
+
+        Returns
+        -------
+        (?,) Numpy Array :
+            The number of troops for each territory in valid
+
+        """
+
+        bulk_code = {0:13, 10:14}[action_code]
+        counts = yield player, bulk_code, (troops, valid)
+        counts = np.asarray(counts)
+
+        if counts.shape != valid.shape or counts.dtype.kind not in 'iu' or \
+                (counts < 0).any() or counts.sum() != troops:
+            raise ValueError("Invalid allocation " + str(counts) + " of " + str(troops) +
+                             " troops over territories " + str(valid))
+
+        return counts
+
+    def ask_split(self, player, action_code, troops, pair):
+        """
+        Asks an agent how many troops to send from one territory to another
+
+        Required Parameters
+        -------------------
+        player : integer
+            The index of the agent in self.players
+
+        action_code : integer
+            The per troop action code this split replaces, 6 or 7
+
+        troops : integer
+            Number of troops to split
+
+        pair : 2 integer tuple
+            The territory IDs of (source, destination)
+
+        Returns
+        -------
+        integer :
+            The number of troops sent to the destination, the rest stay
+
+        """
+
+        bulk_code = {6:15, 7:16}[action_code]
+        moved = yield player, bulk_code, (troops, pair)
+
+        if not isinstance(moved, (int, np.integer)) or moved < 0 or moved > troops:
+            raise ValueError("Invalid split " + str(moved) + " of " + str(troops) +
+                             " troops between territories " + str(pair))
+
+        return int(moved)
+
     def get_sets(self, player):
         """
         Calculates the number of unique tradable card sets
 
-        Generates all unique combination of cards the player owns
-        that may be traded in. Valid sets are:
+        Looks up all unique combination of cards the player owns
+        that may be traded in from the counts of each face in their
+        hand. Valid sets are:
             - any 3 of same kind
             - set of 1,5,10
             - any 2 and a wild card
@@ -898,60 +1853,7 @@ class Risk(object):
 
         """
 
-        cards = self.state[1]
-
-        cards_owned = np.where(cards == player)[0]
-
-        one = []
-        five = []
-        ten = []
-        wild = []
-        set_list = []
-
-        for card in cards_owned:
-            if self.card_faces[card] == 1:
-                one.append(card)
-            elif self.card_faces[card] == 5:
-                five.append(card)
-            elif self.card_faces[card] == 10:
-                ten.append(card)
-            else:
-                wild.append(card)
-
-        #three of a kind
-        if len(one) >= 3:
-            set_list.append(one[:3])
-        if len(five) >= 3:
-            set_list.append(five[:3])
-        if len(ten) >= 3:
-            set_list.append(ten[:3])
-
-        #one of each kind
-        if len(one) >= 1 and len(five) >= 1 and len(ten) >= 1:
-            set_list.append([one[0], five[0], ten[0]])
-
-        #wild card sets
-        for card in wild:
-            if len(one) >= 2:
-                #two of ones
-                set_list.append([one[0], one[1], card])
-            if len(five) >= 2:
-                #two of fives
-                set_list.append([five[0], five[1], card])
-            if len(ten) >= 2:
-                #two of tens
-                set_list.append([ten[0], ten[1], card])
-            if len(one) != 0 and len(five) != 0:
-                #one 1 and one 5
-                set_list.append([one[0], five[0], card])
-            if len(one) != 0 and len(ten) != 0:
-                #one 1 and one 10
-                set_list.append([one[0], ten[0], card])
-            if len(ten) != 0 and len(five) != 0:
-                #one 5 and one 10
-                set_list.append([ten[0], five[0], card])
-
-        return (set_list, len(cards_owned))
+        return (self.deck.sets(player), self.deck.hand_size(player))
 
     def trade_in(self, player, options, card_count):
         """
@@ -985,20 +1887,21 @@ class Risk(object):
         if card_count < 5:
             options.append(False)
 
-        chosen = self.players[player].take_action(self.state, 8, options)
+        chosen = yield player, 8, options
 
         troops_awarded = 0
 
         if chosen != False:
-            trade_ins += 1
             #place cards traded in back in deck
-            cards[chosen] = 6
+            self.deck.discard(chosen)
 
             #award troops
-            troops_awarded = next(self.trade_vals)
+            territories, cards, trade_ins = self.state
+            troops_awarded = self.trade_table[trade_ins]
 
             #update state
-            territories, cards, trade_ins = self.state
+            if self.journal is not None:
+                self.journal.append(('trade_ins', trade_ins))
             trade_ins += 1
             self.state = (territories, cards, trade_ins)
 
@@ -1031,14 +1934,15 @@ class Risk(object):
             turn = self.turn_order[index % len(self.turn_order)]
 
             if self.deal:
-                chosen = random.choice(remaining)
+                chosen = self.rng.choice(remaining)
             else:
-                chosen = self.players[turn].take_action(self.state, 9, remaining)
+                #a copy, so the options a mark keeps are not changed
+                chosen = yield turn, 9, list(remaining)
 
             remaining.remove(chosen)
 
-            territories[chosen, 0] = turn
-            territories[chosen, 1] = 1
+            self.set_owner(chosen, turn)
+            self.set_troops(chosen, 1)
 
             self.state = (territories, cards, trade_ins)
 
@@ -1176,37 +2080,57 @@ class Risk(object):
         return (node2name, name2node)
 
     @staticmethod
-    def starting_troops(players):
+    def starting_troops(players, territories=42):
         """
         Get the number of starting troops for each player
 
         2 player variation from rules is that they get 40 troops
         in place of 'neutral 3rd player'
 
+        Boards larger than the classic 42 territories scale the troops
+        by their size, so every player keeps as many troops to place
+        per territory they are dealt.
+
         Required Parameters
         -------------------
         players : integer
             The number of players in the game
 
+        Optional Parameters
+        -------------------
+        territories : integer
+            The number of territories on the board
+
+            42 by default
+
         Returns
         -------
         integer
             The number a troops each player should start with
 
         """
-        return {2:40, 3:35, 4:30, 5:25, 6:20}[players]
+        troops = {2:40, 3:35, 4:30, 5:25, 6:20}[players]
+        return max(troops, troops * territories // 42)
 
     @staticmethod
-    def gen_init_state(board_size=42):
+    def gen_init_state(board_size=42, num_cards=44):
         """
         Generate the pregame state of the environment
 
         Not normally a valid state, this is just a place holder for
         the game until territories are allocated
 
-        Parameters
-        ----------
-        None
+        Optional Parameters
+        -------------------
+        board_size : integer
+            The number of territories
+
+            42 by default
+
+        num_cards : integer
+            The number of cards in the deck
+
+            44 by default
 
         Returns
         -------
@@ -1218,6 +2142,6 @@ class Risk(object):
         """
         territory = np.array([-1, 0])
         territories = np.array([territory]*board_size)
-        cards = np.repeat(6, 44)
+        cards = np.repeat(6, num_cards)
         return (territories, cards, 0)
 
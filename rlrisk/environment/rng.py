@@ -0,0 +1,224 @@
+'''
+This module holds the GameRNG class, the seedable source
+of randomness of a game, which hands out dice and uniform
+numbers from pre-filled blocks
+'''
+
+import numpy as np
+
+class GameRNG(object):
+    """Seedable, spawnable random stream drawing dice in blocks"""
+
+    def __init__(self, seed=None, block_size=4096):
+        """
+        GameRNG Constructor
+
+        Optional Parameters
+        -------------------
+        seed : integer, Numpy SeedSequence or None
+            Seed of the stream. Streams built from the same seed produce the
+            same numbers, and streams spawned from a stream are independent
+            of it and of each other
+
+            None by default, for fresh entropy
+
+        block_size : integer
+            Number of dice and of uniform numbers drawn from the generator at a
+            time
+
+            4096 by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_seq = seed
+        else:
+            self.seed_seq = np.random.SeedSequence(seed)
+        self.generator = np.random.Generator(np.random.PCG64(self.seed_seq))
+        self.block_size = block_size
+
+        #blocks are python lists, so handing out a number costs no numpy call
+        self.dice_block, self.dice_pointer = [], 0
+        self.uniform_block, self.uniform_pointer = [], 0
+
+        #generator states the blocks were drawn from, to redraw them on restore
+        self.dice_origin, self.uniform_origin = None, None
+
+    def reseed(self, seed):
+        """
+        Restarts the stream from a new seed
+
+        Unlike building a new stream, everything holding this stream, such as
+        a game's card deck, draws from the new one.
+
+        Required Parameters
+        -------------------
+        seed : integer or Numpy SeedSequence
+            Seed of the stream
+
+        Returns
+        -------
+        None
+
+        """
+
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed_seq = seed
+        self.generator = np.random.Generator(np.random.PCG64(seed))
+        self.dice_block, self.dice_pointer = [], 0
+        self.uniform_block, self.uniform_pointer = [], 0
+        self.dice_origin, self.uniform_origin = None, None
+
+    def spawn(self, count):
+        """
+        Creates independent child streams, e.g. one per worker process
+
+        Required Parameters
+        -------------------
+        count : integer
+            Number of streams
+
+        Returns
+        -------
+        List of GameRNG
+        """
+
+        return [GameRNG(child, self.block_size) for child in self.seed_seq.spawn(count)]
+
+    def dice(self, count):
+        """
+        Rolls six sided dice
+
+        Required Parameters
+        -------------------
+        count : integer
+            Number of dice, at most block_size
+
+        Returns
+        -------
+        List of integers : The rolls, 1 to 6
+        """
+
+        if self.dice_pointer + count > len(self.dice_block):
+            self.dice_origin = self.generator.bit_generator.state
+            self.dice_block = self.generator.integers(1, 7, self.block_size).tolist()
+            self.dice_pointer = 0
+
+        rolls = self.dice_block[self.dice_pointer:self.dice_pointer + count]
+        self.dice_pointer += count
+        return rolls
+
+    def random(self):
+        """
+        A uniform random number in [0, 1)
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        float
+        """
+
+        if self.uniform_pointer == len(self.uniform_block):
+            self.uniform_origin = self.generator.bit_generator.state
+            self.uniform_block = self.generator.random(self.block_size).tolist()
+            self.uniform_pointer = 0
+
+        self.uniform_pointer += 1
+        return self.uniform_block[self.uniform_pointer - 1]
+
+    def choice(self, options):
+        """
+        A uniformly chosen element
+
+        Required Parameters
+        -------------------
+        options : List
+            Elements to choose from, not empty
+
+        Returns
+        -------
+        An element of options
+        """
+
+        return options[int(self.random() * len(options))]
+
+    def permutation(self, items):
+        """
+        A shuffled copy of items
+
+        Required Parameters
+        -------------------
+        items : List or Numpy Array
+            Elements to shuffle
+
+        Returns
+        -------
+        List
+        """
+
+        return self.generator.permutation(np.asarray(items, dtype=int)).tolist()
+
+    def get_state(self):
+        """
+        The position of the stream, small enough to pickle cheaply
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        5 value tuple
+            dictionary: State of the generator
+            dictionary: State the dice block was drawn from, or None
+            integer: Dice used from the block
+            dictionary: State the uniform block was drawn from, or None
+            integer: Uniform numbers used from the block
+        """
+
+        return (self.generator.bit_generator.state, self.dice_origin, self.dice_pointer,
+                self.uniform_origin, self.uniform_pointer)
+
+    def set_state(self, state):
+        """
+        Moves the stream to a position from get_state
+
+        The blocks in use are drawn again from the states they were drawn
+        from, so the stream continues exactly as it did from that position.
+
+        Required Parameters
+        -------------------
+        state : 5 value tuple
+            From get_state of a stream with the same block size
+
+        Returns
+        -------
+        None
+
+        """
+
+        current, dice_origin, self.dice_pointer, uniform_origin, self.uniform_pointer = state
+
+        #blocks drawn from the same state are kept, as when restoring a
+        #position over and over again
+        if dice_origin is None:
+            self.dice_block = []
+        elif dice_origin != self.dice_origin:
+            self.generator.bit_generator.state = dice_origin
+            self.dice_block = self.generator.integers(1, 7, self.block_size).tolist()
+        if uniform_origin is None:
+            self.uniform_block = []
+        elif uniform_origin != self.uniform_origin:
+            self.generator.bit_generator.state = uniform_origin
+            self.uniform_block = self.generator.random(self.block_size).tolist()
+
+        self.dice_origin, self.uniform_origin = dice_origin, uniform_origin
+        self.generator.bit_generator.state = current
@@ -0,0 +1,407 @@
+'''
+This module holds the TrajectorySink class, which streams
+recorded game states into memory-mapped shard files, and
+the TrajectoryDataset class which reads them back
+'''
+
+import os
+import json
+import numpy as np
+
+#columns of the index, turn order is padded with -1 up to 6 players
+INDEX_WIDTH = 10
+
+class TrajectorySink(object):
+    """Append-only, memory-mapped, sharded storage for game records"""
+
+    def __init__(self, directory, shard_size=None, troop_dtype=None):
+        """
+        TrajectorySink Constructor
+
+        Games are written to the directory as they are played. Each shard
+        holds up to shard_size recorded states in one raw file per array,
+        and an index holds the shard, first row and length of every game.
+        A directory that already holds a sink is appended to, starting a
+        new shard, with the shard size and troop type it was made with.
+
+        Required Parameters
+        -------------------
+        directory : String
+            Where shards, the index and the metadata are kept
+
+        Optional Parameters
+        -------------------
+        shard_size : integer
+            Number of states per shard, also the longest game a shard fits.
+            Must match the shard size of a sink appended to
+
+            None by default, 65536 or that of the sink appended to
+
+        troop_dtype : Numpy dtype
+            Type troop counts are stored as. Must match the troop type of a
+            sink appended to
+
+            None by default, int16 or that of the sink appended to
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        meta_path = os.path.join(directory, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as meta_file:
+                self.meta = json.load(meta_file)
+
+            #appended shards must be laid out like the ones already written
+            if shard_size is not None and shard_size != self.meta['shard_size']:
+                raise ValueError("Sink in " + directory + " has shard size " +
+                                 str(self.meta['shard_size']) + ", not " + str(shard_size))
+            if troop_dtype is not None and np.dtype(troop_dtype).name != self.meta['troop_dtype']:
+                raise ValueError("Sink in " + directory + " stores troops as " +
+                                 self.meta['troop_dtype'] + ", not " +
+                                 np.dtype(troop_dtype).name)
+        else:
+            self.meta = {'shard_size': 65536 if shard_size is None else shard_size,
+                         'troop_dtype': np.dtype(np.int16 if troop_dtype is None
+                                                 else troop_dtype).name,
+                         'board_size': None, 'num_cards': None, 'shards': 0}
+
+        self.shard = None
+        self.rows = 0
+        self.game_start = None
+        self.arrays = None
+
+    def open_shard(self):
+        """
+        Creates the files of a new shard and maps them into memory
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.shard = self.meta['shards']
+        self.meta['shards'] += 1
+        self.rows = 0
+        self.arrays = shard_arrays(self.directory, self.meta, self.shard, 'w+')
+        self.write_meta()
+
+    def write_meta(self):
+        """
+        Saves the metadata of the sink
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        with open(os.path.join(self.directory, 'meta.json'), 'w') as meta_file:
+            json.dump(self.meta, meta_file)
+
+    def append(self, state):
+        """
+        Writes a state of the current game
+
+        Starts a game on the first state after the last game ended. If the
+        shard fills up the states of the current game so far move to a new
+        shard, so every game is stored contiguously.
+
+        Required Parameters
+        -------------------
+        state : 3 value tuple
+            The game state
+
+        Returns
+        -------
+        None
+
+        """
+
+        territories, cards, trade_ins = state
+
+        if self.meta['board_size'] is None:
+            self.meta['board_size'] = len(territories)
+            self.meta['num_cards'] = len(cards)
+        elif (len(territories), len(cards)) != (self.meta['board_size'], self.meta['num_cards']):
+            raise ValueError("Sink holds games with " + str(self.meta['board_size']) +
+                             " territories and " + str(self.meta['num_cards']) + " cards")
+
+        if self.shard is None:
+            self.open_shard()
+
+        if self.game_start is None:
+            self.game_start = self.rows
+
+        if self.rows == self.meta['shard_size']:
+            if self.game_start == 0:
+                raise ValueError("Game is longer than the shard size " +
+                                 str(self.meta['shard_size']))
+            #the old shard is cut at the last finished game, like in close
+            start = self.game_start
+            unfinished = [np.array(array[start:]) for array in self.arrays]
+            self.rows = start
+            self.close_shard()
+            self.open_shard()
+            for rows, new in zip(unfinished, self.arrays):
+                new[:len(rows)] = rows
+            self.rows = len(unfinished[0])
+            self.game_start = 0
+
+        troops = territories[:, 1]
+        if troops.max() > np.iinfo(self.arrays[1].dtype).max:
+            raise ValueError("Troop count " + str(troops.max()) + " does not fit " +
+                             self.meta['troop_dtype'] + ", use a larger troop_dtype")
+
+        owners, troop_counts, card_status, trades = self.arrays
+        owners[self.rows] = territories[:, 0]
+        troop_counts[self.rows] = troops
+        card_status[self.rows] = cards
+        trades[self.rows] = trade_ins
+        self.rows += 1
+
+    def game(self, board_size=42, num_cards=44):
+        """
+        The states of the current game, as views of the shard
+
+        Optional Parameters
+        -------------------
+        board_size : integer
+            Width of the territory arrays before the sink has seen a state
+
+            42 by default
+
+        num_cards : integer
+            Width of the card array before the sink has seen a state
+
+            44 by default
+
+        Returns
+        -------
+        4 value tuple
+            Same arrays as Recorder.arrays
+
+        """
+
+        if self.game_start is None:
+            return empty_arrays(self.meta, board_size, num_cards)
+
+        return tuple(array[self.game_start:self.rows] for array in self.arrays)
+
+    def end_game(self, turn_order, steal_cards):
+        """
+        Adds the current game to the index and flushes it to disk
+
+        Required Parameters
+        -------------------
+        turn_order : List
+            The turn order of the game
+
+        steal_cards : boolean
+            Whether or not defeated player's card go to the player that defeated them
+
+        Returns
+        -------
+        None
+
+        """
+
+        if self.game_start is None:
+            return
+
+        row = np.repeat(-1, INDEX_WIDTH).astype(np.int64)
+        row[:3] = (self.shard, self.game_start, self.rows - self.game_start)
+        row[3:3 + len(turn_order)] = turn_order
+        row[9] = steal_cards
+
+        for array in self.arrays:
+            array.flush()
+        with open(os.path.join(self.directory, 'index.bin'), 'ab') as index_file:
+            index_file.write(row.tobytes())
+
+        self.game_start = None
+
+    def close_shard(self):
+        """
+        Flushes the current shard and trims its files to the rows written
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        if self.shard is None:
+            return
+
+        paths = [array.filename for array in self.arrays]
+        sizes = [self.rows * array.strides[0] for array in self.arrays]
+        for array in self.arrays:
+            array.flush()
+        self.arrays = None
+
+        for path, size in zip(paths, sizes):
+            os.truncate(path, size)
+        self.shard = None
+
+    def close(self):
+        """
+        Closes the sink, dropping the states of an unfinished game
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        if self.game_start is not None:
+            self.rows = self.game_start
+            self.game_start = None
+        self.close_shard()
+
+class TrajectoryDataset(object):
+    """Zero-copy reader of the games written by a TrajectorySink"""
+
+    def __init__(self, directory):
+        """
+        TrajectoryDataset Constructor
+
+        Required Parameters
+        -------------------
+        directory : String
+            Directory a TrajectorySink wrote to
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json')) as meta_file:
+            self.meta = json.load(meta_file)
+
+        index_path = os.path.join(directory, 'index.bin')
+        if os.path.exists(index_path) and os.path.getsize(index_path) > 0:
+            self.index = np.memmap(index_path, dtype=np.int64, mode='r').reshape(-1, INDEX_WIDTH)
+        else:
+            self.index = np.zeros((0, INDEX_WIDTH), dtype=np.int64)
+        self.shards = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def shard(self, num):
+        """
+        Memory maps the arrays of a shard
+
+        Required Parameters
+        -------------------
+        num : integer
+            The shard number
+
+        Returns
+        -------
+        4 value tuple
+            Same arrays as Recorder.arrays, for every state in the shard
+
+        """
+
+        if num not in self.shards:
+            self.shards[num] = shard_arrays(self.directory, self.meta, num, 'r')
+        return self.shards[num]
+
+    def __getitem__(self, game):
+        """
+        The record of a game, as views of its shard
+
+        Required Parameters
+        -------------------
+        game : integer
+            The index of the game
+
+        Returns
+        -------
+        6 value tuple
+            Same as Risk.play
+
+        """
+
+        shard, start, length = self.index[game, :3].tolist()
+        turn_order = [int(player) for player in self.index[game, 3:9] if player != -1]
+        arrays = tuple(array[start:start + length] for array in self.shard(shard))
+        return arrays + (turn_order, bool(self.index[game, 9]))
+
+def empty_arrays(meta, board_size=0, num_cards=0):
+    """
+    Empty arrays with the dtypes and widths of a sink's states, the
+    widths given are used until the sink has seen a state
+    """
+
+    if meta['board_size'] is not None:
+        board_size, num_cards = meta['board_size'], meta['num_cards']
+    return (np.empty((0, board_size), dtype=np.int8),
+            np.empty((0, board_size), dtype=meta['troop_dtype']),
+            np.empty((0, num_cards), dtype=np.int8),
+            np.empty(0, dtype=np.int16))
+
+def shard_arrays(directory, meta, num, mode):
+    """
+    Memory maps the four arrays of a shard
+
+    Required Parameters
+    -------------------
+    directory : String
+        Directory of the sink
+
+    meta : dictionary
+        Metadata of the sink
+
+    num : integer
+        The shard number
+
+    mode : String
+        "w+" to create the shard with room for shard_size states, "r" to
+        read the states in it
+
+    Returns
+    -------
+    4 value tuple
+        Owners, troops, cards and trade in arrays
+    """
+
+    arrays = []
+    for name, array in zip(['owners', 'troops', 'cards', 'trade_ins'], empty_arrays(meta)):
+        path = os.path.join(directory, 'shard_%05d_%s.bin' % (num, name))
+        width = array.shape[1:]
+        if mode == 'r':
+            rows = os.path.getsize(path) // (array.dtype.itemsize * max(1, int(np.prod(width))))
+            if rows == 0:
+                arrays.append(array)
+                continue
+        else:
+            rows = meta['shard_size']
+        arrays.append(np.memmap(path, dtype=array.dtype, mode=mode, shape=(rows,) + width))
+    return tuple(arrays)
@@ -0,0 +1,142 @@
+'''
+This module holds the Snapshot class, a compact and
+picklable position of a game of Risk that an environment
+can be restored to, and the Mark class, a position in an
+environment's undo journal
+'''
+
+import numpy as np
+
+class Snapshot(object):
+    """Position of a game as a few small arrays"""
+
+    def __init__(self, territories, cards, trade_ins, turn_count, phase, defeated,
+                 rng_state, pile, pointer, discarded, actions=()):
+        """
+        Snapshot Constructor
+
+        A position is the state at the start of a phase, and the actions
+        made since then. Restoring it replays those actions from the start
+        of the phase with the same random stream, which puts the game back
+        at the same decision.
+
+        Required Parameters
+        -------------------
+        territories : (42, 2) Numpy Array
+            Territory owner and troop count
+
+        cards : (44,) Numpy Array
+            The status of each card
+
+        trade_ins : integer
+            The number of card sets traded in so far
+
+        turn_count : integer
+            The turn count
+
+        phase : integer
+            -1 for the start of the game, 0 for recruitment, 1 for attack
+            and 2 for fortify
+
+        defeated : (players,) Numpy Array of booleans
+            Which players are defeated
+
+        rng_state : tuple
+            From GameRNG.get_state
+
+        pile : (?,) Numpy Array
+            Card IDs of the draw pile in order
+
+        pointer : integer
+            Cards dealt from the draw pile
+
+        discarded : List
+            Card IDs of the discard pile
+
+        Optional Parameters
+        -------------------
+        actions : List
+            Actions made since the start of the phase
+
+            None made by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.territories = np.array(territories, dtype=np.int32)
+        self.cards = np.array(cards, dtype=np.int8)
+        self.trade_ins = int(trade_ins)
+        self.turn_count = int(turn_count)
+        self.phase = phase
+        self.defeated = np.array(defeated, dtype=bool)
+        self.rng_state = rng_state
+        self.pile = np.array(pile, dtype=np.int8 if len(self.cards) < 128 else np.int32)
+        self.pointer = pointer
+        self.discarded = list(discarded)
+        self.actions = list(actions)
+
+    def after(self, actions):
+        """
+        The same phase start with other actions made since
+
+        Arrays are shared with this snapshot, not copied.
+
+        Required Parameters
+        -------------------
+        actions : List
+            Actions made since the start of the phase
+
+        Returns
+        -------
+        Snapshot
+        """
+
+        position = Snapshot.__new__(Snapshot)
+        position.__dict__.update(self.__dict__)
+        position.actions = list(actions)
+        return position
+
+class Mark(object):
+    """Position in an environment's undo journal, see Risk.mark"""
+
+    def __init__(self, length, rng_state, phase_length, snapshot, decision=(None, None)):
+        """
+        Mark Constructor
+
+        Required Parameters
+        -------------------
+        length : integer
+            Length of the journal at the mark
+
+        rng_state : tuple
+            From GameRNG.get_state at the mark
+
+        phase_length : integer
+            Length of the journal at the start of the mark's phase, None if
+            the phase started before the journal
+
+        snapshot : Snapshot
+            The position at the mark, None before the game is started
+
+        Optional Parameters
+        -------------------
+        decision : 2 value tuple
+            The player deciding and the pending (action code, options) at
+            the mark
+
+            No decision by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        self.length = length
+        self.rng_state = rng_state
+        self.phase_length = phase_length
+        self.snapshot = snapshot
+        self.decision = decision
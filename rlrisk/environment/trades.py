@@ -0,0 +1,139 @@
+'''
+This module holds the TradeTable class, the troops rewarded
+for card set trade ins, materialized lazily from the
+trade in value sequence of a game
+'''
+
+import numpy as np
+from rlrisk.environment import config
+
+#values a table built from a generator keeps when pickled, it cannot
+#draw more from the generator afterwards
+PICKLED_VALUES = 1000
+
+class TradeTable(object):
+    """Troops rewarded for the n-th card set trade in"""
+
+    def __init__(self, values="s"):
+        """
+        TradeTable Constructor
+
+        Values are drawn from the sequence as trade ins reach them and kept,
+        so the reward of any trade in is a lookup by the trade in count of
+        the game state. A table is never changed by a lookup other than
+        growing, so one table is shared by an environment, its agents and
+        its simulators instead of copying the sequence for each.
+
+        Optional Parameters
+        -------------------
+        values : String "s"/"1" (letter one) or Iterable
+            "s" = Standard Risk trade in rewards
+            "1" = Increasing by 1
+            Iterable = A sequence of integers to reward, such as a generator
+
+            "s" by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        if isinstance(values, str):
+            if values not in ["s", "1"]:
+                raise ValueError("Invalid trade in values setting " + values)
+            self.setting = values
+            self.source = config.get_trade_vals(values)
+        else:
+            self.setting = None
+            self.source = iter(values)
+
+        self.values = []
+        self.array = np.empty(0, dtype=int)
+
+    def __len__(self):
+        """Number of values drawn so far"""
+
+        return len(self.values)
+
+    def __getitem__(self, trade_ins):
+        """
+        Troops rewarded for trading in a set after a number of trade ins
+
+        Required Parameters
+        -------------------
+        trade_ins : integer or Numpy Array of integers
+            The number of sets traded in so far
+
+        Returns
+        -------
+        integer, or Numpy Array of the same shape
+        """
+
+        if isinstance(trade_ins, (int, np.integer)):
+            if trade_ins >= len(self.values):
+                self.extend(trade_ins + 1)
+            return self.values[trade_ins]
+
+        trade_ins = np.asarray(trade_ins)
+        if trade_ins.size:
+            self.extend(int(trade_ins.max()) + 1)
+        return self.array[trade_ins]
+
+    def extend(self, size):
+        """
+        Draws values until the table has at least a number of them
+
+        Required Parameters
+        -------------------
+        size : integer
+            Number of values needed
+
+        Returns
+        -------
+        None
+
+        """
+
+        if size > len(self.values):
+            if self.source is None:
+                raise ValueError("The trade in values of this table end after " +
+                                 str(len(self.values)) + " trade ins")
+            try:
+                while len(self.values) < size:
+                    self.values.append(int(next(self.source)))
+            except StopIteration:
+                self.source = None
+                raise ValueError("The trade in values end after " +
+                                 str(len(self.values)) + " trade ins")
+
+        if len(self.array) < len(self.values):
+            self.array = np.array(self.values)
+
+    def __getstate__(self):
+        """
+        Pickles the drawn values in place of the sequence
+
+        Tables of a setting draw the sequence again when unpickled. Tables
+        built from a generator keep at least PICKLED_VALUES values.
+
+        """
+
+        if self.setting is None and self.source is not None:
+            try:
+                self.extend(PICKLED_VALUES)
+            except ValueError:
+                pass
+
+        state = dict(self.__dict__)
+        state['source'] = None
+        return state
+
+    def __setstate__(self, state):
+        """Draws the sequence of a setting again, see __getstate__"""
+
+        self.__dict__.update(state)
+        if self.setting is not None:
+            self.source = config.get_trade_vals(self.setting)
+            for value in self.values:
+                next(self.source)
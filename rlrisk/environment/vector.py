@@ -0,0 +1,374 @@
+'''
+This module holds the VecRisk class, which steps many Risk
+environments hosted in worker processes and gathers their
+observations through shared memory
+'''
+
+import traceback
+import multiprocessing
+import numpy as np
+from rlrisk.runner import load, ENVIRONMENTS
+
+def shared_array(shape, dtype):
+    """
+    A zeroed array in shared memory that can be given to child processes
+
+    Required Parameters
+    -------------------
+    shape : tuple
+        The shape of the array
+
+    dtype : Numpy dtype
+        The type of the array
+
+    Returns
+    -------
+    2 value tuple
+        multiprocessing RawArray: The shared memory
+        Numpy Array: View of it
+    """
+
+    dtype = np.dtype(dtype)
+    raw = multiprocessing.RawArray('b', int(np.prod(shape)) * dtype.itemsize)
+    return raw, as_array(raw, shape, dtype)
+
+def as_array(raw, shape, dtype):
+    """Views shared memory as a Numpy Array"""
+
+    return np.frombuffer(raw, dtype=dtype).reshape(shape)
+
+def worker(remote, env_ids, seeds, env, players, env_kwargs, buffers):
+    """
+    Hosts environments in a worker process
+
+    Waits for commands from VecRisk, decodes the actions VecRisk wrote
+    into the shared buffers, writes the observation of every environment
+    it hosts back into them and replies with the outcome of finished games.
+    Errors are replied with their traceback instead, and the worker keeps
+    waiting for commands so it can still be closed.
+
+    Required Parameters
+    -------------------
+    remote : multiprocessing Connection
+        Worker's end of the pipe to VecRisk
+
+    env_ids : List of integers
+        Indices of the hosted environments in the stacked arrays
+
+    seeds : List of Numpy SeedSequences
+        Seed of each hosted environment
+
+    env : String
+        Specification of the environment class, see runner.load
+
+    players : integer
+        Number of players in every game
+
+    env_kwargs : dictionary
+        Keyword arguments for the environments
+
+    buffers : dictionary
+        Names as keys for (RawArray, shape, dtype) values
+
+    Returns
+    -------
+    None
+
+    """
+
+    from rlrisk.agents import BaseAgent
+
+    arrays = dict((name, as_array(*buffer)) for name, buffer in buffers.items())
+
+    try:
+        env_class = load(env, ENVIRONMENTS)
+        envs = [env_class([BaseAgent() for player in range(players)], seed=seed, **env_kwargs)
+                for seed in seeds]
+        failure = None
+    except Exception:
+        #every command but close is answered with the error
+        envs, failure = [], traceback.format_exc()
+
+    def write(num, state, action_code, done):
+        index = env_ids[num]
+        arrays['territories'][index] = state[0]
+        arrays['cards'][index] = state[1]
+        arrays['trade_ins'][index] = state[2]
+        arrays['acting'][index] = envs[num].current_player
+        arrays['action_codes'][index] = action_code
+        arrays['masks'][index] = envs[num].legal_actions()
+        arrays['dones'][index] = done
+
+    def reset():
+        for num, game in enumerate(envs):
+            state, action_code, options = game.reset()
+            write(num, state, action_code, False)
+        return [None] * len(envs)
+
+    def step():
+        infos = []
+        for num, game in enumerate(envs):
+            action = game.decode_action(int(arrays['actions'][env_ids[num]]))
+            state, action_code, options, done = game.step(action)
+            info = None
+            if done:
+                #outcome of the game, then a new game in its place
+                winner = int(state[0][0, 0]) if game.winner() else -1
+                info = {'winner': winner, 'turns': game.turn_count}
+                state, action_code, options = game.reset()
+            write(num, state, action_code, done)
+            infos.append(info)
+        return infos
+
+    commands = {'reset': reset, 'step': step}
+    while True:
+        command, data = remote.recv()
+
+        if command == 'close':
+            remote.close()
+            break
+
+        if failure is not None:
+            remote.send(('error', failure))
+            continue
+
+        try:
+            remote.send(('ok', commands[command]()))
+        except Exception:
+            remote.send(('error', traceback.format_exc()))
+
+class VecRisk(object):
+    """Risk environments stepped together in worker processes"""
+
+    def __init__(self, num_envs, players=6, workers=None, env="risk", seed=None,
+                 env_kwargs=None):
+        """
+        VecRisk Constructor
+
+        Starts the worker processes, each hosting an equal share of the
+        environments. Actions and the observations of all environments are
+        stacked in shared memory, so stepping only sends a command and the
+        outcome of finished games through the pipes. Actions are columns of
+        the fixed action encoding, see ActionSpace.
+
+        Required Parameters
+        -------------------
+        num_envs : integer
+            Number of environments
+
+        Optional Parameters
+        -------------------
+        players : integer
+            Number of players in every game
+
+            6 by default
+
+        workers : integer
+            Number of worker processes, at most num_envs
+
+            Number of CPUs by default
+
+        env : String
+            Specification of the environment class, "risk", "southern" or
+            "module:Class"
+
+            "risk" by default
+
+        seed : integer
+            Seed every environment's seed is spawned from
+
+            None by default, for fresh entropy
+
+        env_kwargs : dictionary
+            Keyword arguments for the environments, records and printing
+            are off unless given
+
+            None by default
+
+        Returns
+        -------
+        None
+
+        """
+
+        from rlrisk.agents import BaseAgent
+
+        env_kwargs = dict({'record': None, 'verbose': False}, **(env_kwargs or {}))
+        workers = min(workers or multiprocessing.cpu_count(), num_envs)
+
+        #a throwaway environment gives the size of the board and deck
+        probe = load(env, ENVIRONMENTS)([BaseAgent() for player in range(players)],
+                                        **env_kwargs)
+        size, num_cards = len(probe.board), len(probe.state[1])
+        self.action_space = probe.action_space
+
+        self.num_envs = num_envs
+        self.num_players = players
+        shapes = {'territories': ((num_envs, size, 2), np.int64),
+                  'cards': ((num_envs, num_cards), np.int64),
+                  'trade_ins': ((num_envs,), np.int64),
+                  'acting': ((num_envs,), np.int64),
+                  'action_codes': ((num_envs,), np.int64),
+                  'masks': ((num_envs, self.action_space.size), bool),
+                  'dones': ((num_envs,), bool),
+                  'actions': ((num_envs,), np.int64)}
+
+        buffers = {}
+        for name, (shape, dtype) in shapes.items():
+            raw, array = shared_array(shape, dtype)
+            buffers[name] = (raw, shape, dtype)
+            setattr(self, name, array)
+
+        seeds = np.random.SeedSequence(seed).spawn(num_envs)
+        self.env_ids = np.array_split(np.arange(num_envs), workers)
+        self.remotes, self.processes = [], []
+        for env_ids in self.env_ids:
+            remote, worker_remote = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=worker, daemon=True,
+                args=(worker_remote, env_ids.tolist(), [seeds[num] for num in env_ids],
+                      env, players, env_kwargs, buffers))
+            process.start()
+            worker_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+
+        self.infos = [None] * num_envs
+        self.closed = False
+
+    def observation(self):
+        """
+        The stacked observation of every environment
+
+        The arrays are views of the shared buffers, overwritten by the
+        next step. Copy them to keep them.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        6 value tuple
+            (num_envs, 42, 2) Numpy Array: Territory owner and troop count
+            (num_envs, 44) Numpy Array: Card status
+            (num_envs,) Numpy Array: Number of card sets traded in
+            (num_envs,) Numpy Array: The player making each decision
+            (num_envs,) Numpy Array: The action code of each decision
+            (num_envs, action_space.size) Numpy Array: Legal columns of each
+                decision's fixed action encoding, see ActionSpace
+
+        """
+
+        return (self.territories, self.cards, self.trade_ins,
+                self.acting, self.action_codes, self.masks)
+
+    def gather(self):
+        """
+        Collects the replies of every worker
+
+        Every worker is heard from before an error is raised, so none is
+        left with a reply waiting in its pipe.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        errors = []
+        for env_ids, remote, process in zip(self.env_ids, self.remotes, self.processes):
+            try:
+                status, reply = remote.recv()
+            except EOFError:
+                errors.append("Worker process exited with code " + str(process.exitcode))
+                continue
+            if status == 'error':
+                errors.append(reply)
+                continue
+            for num, info in zip(env_ids, reply):
+                self.infos[num] = info
+
+        if errors:
+            raise RuntimeError("An environment failed in a worker process:\n" +
+                               "\n".join(errors))
+
+    def reset(self):
+        """
+        Starts a game in every environment
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        6 value tuple
+            Same as observation
+
+        """
+
+        for remote in self.remotes:
+            remote.send(('reset', None))
+        self.gather()
+        return self.observation()
+
+    def step(self, actions):
+        """
+        Makes the pending decision of every environment
+
+        Environments whose game ended are reset, and their observation is
+        the first decision of the new game.
+
+        Required Parameters
+        -------------------
+        actions : (num_envs,) Numpy Array
+            The legal column of the action encoding chosen for each
+            environment's decision
+
+        Returns
+        -------
+        3 value tuple
+            6 value tuple: Same as observation
+            (num_envs,) Numpy Array of booleans: Whether each game ended
+            List: For games that ended a dictionary with the winner (-1 if
+                  the turn cap was reached) and number of turns, else None
+
+        Raises RuntimeError with the traceback of the worker if an
+        environment failed, such as for an illegal action. The environments
+        of that worker are then left part way through the step.
+
+        """
+
+        self.actions[:] = actions
+        for remote in self.remotes:
+            remote.send(('step', None))
+        self.gather()
+        return self.observation(), self.dones, list(self.infos)
+
+    def close(self):
+        """
+        Stops the worker processes
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+
+        """
+
+        if self.closed:
+            return
+        for remote, process in zip(self.remotes, self.processes):
+            if process.is_alive():
+                remote.send(('close', None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
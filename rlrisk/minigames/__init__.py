@@ -16,10 +16,16 @@ southern_gui
 southern_warfare
     A minigame that is the full Risk environment mechanics
     restricted to just S. American and Africa
+
+submap
+    Sub-maps of any continents or territories, and factories
+    for environments and GUIs restricted to them
 '''
 
 from .pick_start_positions import SPMinigame
+from .submap import SubMap, SubMapGUI, restrict, submap
 from .southern_gui import SWGUI
 from .southern_warfare import SouthernWarfare
 
-__all__ = ['SPMinigame', 'SWGUI', 'SouthernWarfare']
+__all__ = ['SPMinigame', 'SWGUI', 'SouthernWarfare', 'SubMap', 'SubMapGUI',
+           'restrict', 'submap']
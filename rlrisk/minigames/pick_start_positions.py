@@ -6,13 +6,13 @@ over and over again, when players choose their initial territories
 import time
 from rlrisk.environment import Risk
 from rlrisk.agents import BaseAgent
-import numpy as np
 
 class SPMinigame(Risk):
     '''Minigame for choosing initial territories before game start'''
 
     def __init__(self, agents, turn_order="c", has_gui=False,
-                 fortify_adjacent=True, sleep_val=0.5):
+                 fortify_adjacent=True, sleep_val=0.5, record="turn", sink=None,
+                 seed=None, gui_fps=None):
 
         remove = False
         if not isinstance(agents, list):
@@ -20,13 +20,16 @@ class SPMinigame(Risk):
             remove = True
 
         super(SPMinigame, self).__init__(agents, turn_order, has_gui=has_gui,
-                                         fortify_adjacent=fortify_adjacent)
+                                         fortify_adjacent=fortify_adjacent,
+                                         record=record, sink=sink, seed=seed,
+                                         gui_fps=gui_fps)
 
         if remove:
             self.players = self.players[:1]
             self.turn_order = [0]
 
         self.sleep_val = sleep_val
+        self.rules = {'fortify_adjacent': fortify_adjacent}
 
     def play(self):
         """
@@ -41,12 +44,32 @@ class SPMinigame(Risk):
 
 	Returns
 	-------
-	(42, 42) Numpy Array :
+	(42, 42) int8 Numpy Array :
 	The pick-by-pick record of territory owners
 	"""
 
-        self.allocate_territories()
-        return np.array(self.record[0])
+        return self.drive(self.game())
+
+    def game(self, phase=-1):
+        """
+	The picks as a generator of decision points
+
+	Yields (player, action_code, options) for every pick, see Risk.game
+
+	Optional Parameters
+	-------------------
+	phase : integer
+	Only -1, the minigame is all territory picks
+
+	Returns
+	-------
+	(42, 42) int8 Numpy Array :
+	Same as play, as the value of StopIteration
+	"""
+
+        self.mark_phase(-1)
+        yield from self.allocate_territories()
+        return self.recorder.finish(self.turn_order, self.steal_cards)[0]
 
     def allocate_territories(self):
         """
@@ -73,22 +96,24 @@ class SPMinigame(Risk):
 
             turn = self.turn_order[index % len(self.turn_order)]
 
-            chosen = self.players[turn].take_action(self.state, 9, remaining)
+            #a copy, so the options a mark keeps are not changed
+            chosen = yield turn, 9, list(remaining)
 
             remaining.remove(chosen)
 
-            territories[chosen, 0] = turn
-            territories[chosen, 1] = 1
+            self.set_owner(chosen, turn)
+            self.set_troops(chosen, 1)
 
             self.state = (territories, cards, trade_ins)
-            self.record[0].append(np.copy(self.state[0][:, 0]))
+            self.record_state()
 
             self.gui_update()
 
-        self.game_over = True
+        self.end_game()
         self.gui_update()
 
     def gui_update(self, verbose=False):
         super(SPMinigame, self).gui_update(verbose)
-        if self.has_gui:
+        #a gui on its own thread is paced by its frame rate
+        if self.has_gui and self.gui_fps is None:
             time.sleep(self.sleep_val)
@@ -0,0 +1,257 @@
+"""
+Minigames on any part of the board. A sub-map is compiled
+once per selection of continents or territories, and the
+environment and GUI classes made from it are cached, so
+constructing a restricted game costs no more than a full one
+"""
+
+import functools
+import numpy as np
+from rlrisk.environment import Risk, GUI
+
+class SubMap(object):
+    """The board tables of a selection of territories, with new IDs"""
+
+    def __init__(self, territories):
+        """
+        SubMap Constructor
+
+        Kept territories get new IDs in the order of their original IDs.
+        Adjacency is kept between kept territories only, and continents
+        only when all of their territories are kept. The card deck is the
+        full deck.
+
+        Required Parameters
+        -------------------
+        territories : Iterable of integers
+            Original IDs of the territories kept, which must be connected
+
+        Returns
+        -------
+        None
+
+        """
+
+        board, continents, card_faces, con_rewards = Risk.gen_board()
+        node2name = Risk.id_names()[0]
+
+        kept = sorted(set(territories))
+        if not kept:
+            raise ValueError("A sub-map needs at least one territory")
+        if kept[0] < 0 or kept[-1] >= len(board):
+            raise ValueError("Invalid territory IDs " + str(kept))
+
+        #new ID of every original ID (-1 if dropped), and original ID of every new ID
+        self.backward = np.array(kept)
+        self.forward = np.repeat(-1, len(board))
+        self.forward[self.backward] = np.arange(len(kept))
+        forward = self.forward.tolist()
+
+        self.board = dict((forward[terr], [forward[adj] for adj in board[terr]
+                                           if forward[adj] != -1])
+                          for terr in kept)
+        self.continents = dict((name, [forward[terr] for terr in members])
+                               for name, members in continents.items()
+                               if all(forward[terr] != -1 for terr in members))
+        self.con_rewards = dict((name, con_rewards[name]) for name in self.continents)
+        self.card_faces = card_faces
+        self.names = [node2name[terr] for terr in kept]
+
+        if not self.connected():
+            raise ValueError("The territories of a sub-map must be connected")
+
+    def connected(self):
+        """Whether every territory can be reached from every other"""
+
+        seen, frontier = {0}, [0]
+        while frontier:
+            territory = frontier.pop()
+            for adjacent in self.board[territory]:
+                if adjacent not in seen:
+                    seen.add(adjacent)
+                    frontier.append(adjacent)
+        return len(seen) == len(self.board)
+
+    def tables(self):
+        """
+        Copies of the board tables, as Risk.gen_board returns them
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        4 value tuple
+            Same as Risk.gen_board
+        """
+
+        board = dict((terr, list(adjacent)) for terr, adjacent in self.board.items())
+        continents = dict((name, list(members)) for name, members in self.continents.items())
+        return board, continents, dict(self.card_faces), dict(self.con_rewards)
+
+    def id_names(self):
+        """
+        Names of the kept territories by new ID, as Risk.id_names returns them
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        2 value tuple
+            Dictionary: Territory IDs as keys for territory name values
+            Dictionary: Territory names as keys for territory IDs values
+        """
+
+        return dict(enumerate(self.names)), dict((name, num) for num, name in enumerate(self.names))
+
+@functools.lru_cache(maxsize=None)
+def compile_submap(territories):
+    """SubMap of a sorted tuple of territory IDs, compiled once"""
+
+    return SubMap(territories)
+
+def submap(continents=(), territories=()):
+    """
+    The compiled sub-map of a selection
+
+    Required Parameters
+    -------------------
+    None
+
+    Optional Parameters
+    -------------------
+    continents : Iterable of Strings
+        Names of continents kept whole, see Risk.gen_board
+
+        None by default
+
+    territories : Iterable of integers
+        Original IDs of other territories kept
+
+        None by default
+
+    Returns
+    -------
+    SubMap : Shared by every call with the same territories
+    """
+
+    all_continents = Risk.gen_board()[1]
+    kept = set(territories)
+    for name in continents:
+        if name not in all_continents:
+            raise ValueError("Invalid continent " + str(name))
+        kept.update(all_continents[name])
+    return compile_submap(tuple(sorted(kept)))
+
+class Restricted(object):
+    """Mixin that restricts an environment to the sub-map in its class"""
+
+    #the SubMap of the class
+    submap = None
+
+    @classmethod
+    def gen_board(cls):
+        """Board tables of the sub-map, see Risk.gen_board"""
+
+        return cls.submap.tables()
+
+    @classmethod
+    def id_names(cls):
+        """Territory names of the sub-map, see Risk.id_names"""
+
+        return cls.submap.id_names()
+
+class SubMapGUI(GUI):
+    """GUI showing only the territories of the sub-map in its class"""
+
+    #the SubMap of the class
+    submap = None
+
+    #area of the full board shown as (left, top, width, height), None to
+    #fit the territories
+    crop = None
+
+    def __init__(self):
+        """Constructor for GUI with the other territories and area removed"""
+
+        super(SubMapGUI, self).__init__()
+
+        full = self.positions
+        self.positions = dict((num, full[terr])
+                              for num, terr in enumerate(self.submap.backward.tolist()))
+
+        crop = self.crop
+        if crop is None:
+            crop = self.fit()
+        left, top = crop[:2]
+        self.background = self.background.subsurface(crop)
+        self.positions = dict((num, (xpos - left, ypos - top))
+                              for num, (xpos, ypos) in self.positions.items())
+        self.init_draw()
+
+    def fit(self):
+        """
+        Area of the board around the territories of the sub-map
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        pygame Rect : (left, top, width, height) in the full board
+        """
+
+        positions = np.array(list(self.positions.values()))
+        left, top = np.maximum(positions.min(0) - (40, 50), 0)
+        right, bottom = np.minimum(positions.max(0) + 40, self.background.get_size())
+        return (int(left), int(top), int(right - left), int(bottom - top))
+
+#environment classes made by restrict, by base class and sub-map
+RESTRICTED = {}
+
+def restrict(base=Risk, continents=(), territories=(), gui_class=None):
+    """
+    An environment class that plays base on a sub-map
+
+    Classes are made once per base class, sub-map and GUI class. They take
+    the same arguments as base, and players are told the restricted board.
+
+    Optional Parameters
+    -------------------
+    base : class
+        The environment class to restrict
+
+        Risk by default
+
+    continents : Iterable of Strings
+        Same as for submap
+
+        None by default
+
+    territories : Iterable of integers
+        Same as for submap
+
+        None by default
+
+    gui_class : class
+        A SubMapGUI subclass to draw with, given the sub-map as its submap
+
+        SubMapGUI by default
+
+    Returns
+    -------
+    class
+    """
+
+    selection = submap(continents, territories)
+    key = (base, selection, gui_class)
+    if key not in RESTRICTED:
+        gui = type((gui_class or SubMapGUI).__name__, (gui_class or SubMapGUI,),
+                   {'submap': selection})
+        RESTRICTED[key] = type('Restricted' + base.__name__, (Restricted, base),
+                               {'submap': selection, 'gui_class': gui})
+    return RESTRICTED[key]
@@ -0,0 +1,189 @@
+'''
+This module plays many games of Risk across a pool of
+worker processes and summarizes how the agents did
+'''
+
+import time
+import random
+import importlib
+import multiprocessing
+import numpy as np
+
+#agents that can be named instead of given as "module:Class"
+AGENTS = {'base': 'rlrisk.agents:BaseAgent',
+          'aggressive': 'rlrisk.agents:AggressiveAgent'}
+
+#environments that can be named instead of given as "module:Class"
+ENVIRONMENTS = {'risk': 'rlrisk.environment:Risk',
+                'southern': 'rlrisk.minigames:SouthernWarfare'}
+
+#agents and environment of a worker process, built once by init_worker
+_WORKER = {}
+
+def load(spec, names):
+    """
+    Gets the class a specification refers to
+
+    Required Parameters
+    -------------------
+    spec : String
+        A key of names, or "module:Class"
+
+    names : dictionary
+        Short names as keys for "module:Class" values
+
+    Returns
+    -------
+    Class
+    """
+
+    spec = names.get(spec, spec)
+    if ':' not in spec:
+        raise ValueError("Unknown name " + spec + ", expected one of " +
+                         str(sorted(names)) + " or module:Class")
+    module, name = spec.split(':', 1)
+    return getattr(importlib.import_module(module), name)
+
+def init_worker(agents, env, env_kwargs):
+    """
+    Builds the agents and finds the environment of a worker process
+
+    Agents are built once per worker and reused for every game the
+    worker plays, each game gives them the rules again.
+
+    Required Parameters
+    -------------------
+    agents : List of Strings
+        Specifications of the agent classes, see load
+
+    env : String
+        Specification of the environment class, see load
+
+    env_kwargs : dictionary
+        Keyword arguments for the environment
+
+    Returns
+    -------
+    None
+
+    """
+
+    _WORKER['agents'] = [load(agent, AGENTS)() for agent in agents]
+    _WORKER['env'] = load(env, ENVIRONMENTS)
+    _WORKER['env_kwargs'] = env_kwargs
+
+def play_chunk(seeds):
+    """
+    Plays a game for each seed with the worker's agents
+
+    Required Parameters
+    -------------------
+    seeds : List of integers
+        Seeds of the games
+
+    Returns
+    -------
+    List of 2 value tuples
+        Winner (-1 if the turn cap was reached) and number of turns of each game
+    """
+
+    results = []
+    for seed in seeds:
+        #the environment has its own stream, agents use the global ones
+        random.seed(seed)
+        np.random.seed(seed)
+
+        env = _WORKER['env'](_WORKER['agents'], seed=seed, **_WORKER['env_kwargs'])
+        env.play()
+
+        winner = int(env.state[0][0, 0]) if env.winner() else -1
+        results.append((winner, env.turn_count))
+    return results
+
+def simulate(games, agents=("aggressive",)*6, workers=None, chunk_size=16,
+             seed=None, env="risk", env_kwargs=None):
+    """
+    Plays many games across a pool of processes
+
+    Every game gets its own seed spawned from seed, so results do not
+    depend on the number of workers or how games are split between them.
+
+    Required Parameters
+    -------------------
+    games : integer
+        Number of games to play
+
+    Optional Parameters
+    -------------------
+    agents : List of Strings
+        Specifications of the agent classes in player order, "base",
+        "aggressive" or "module:Class" for any agent with a no argument
+        constructor
+
+        Six "aggressive" by default
+
+    workers : integer
+        Number of processes, 1 plays in this process
+
+        Number of CPUs by default
+
+    chunk_size : integer
+        Number of games sent to a worker at a time
+
+        16 by default
+
+    seed : integer
+        Seed all game seeds are spawned from
+
+        None by default, for fresh entropy
+
+    env : String
+        Specification of the environment class, "risk", "southern" or
+        "module:Class"
+
+        "risk" by default
+
+    env_kwargs : dictionary
+        Keyword arguments for the environment, records and printing
+        are off unless given
+
+        None by default
+
+    Returns
+    -------
+    dictionary
+        games : Number of games played
+        wins : Wins of each player
+        capped : Games stopped by the turn cap
+        lengths : (games,) Numpy Array of the number of turns of each game
+        seconds : Time taken
+        games_per_sec : Throughput
+    """
+
+    env_kwargs = dict({'record': None, 'verbose': False}, **(env_kwargs or {}))
+    workers = workers or multiprocessing.cpu_count()
+    agents = list(agents)
+
+    seeds = [int(child.generate_state(1)[0])
+             for child in np.random.SeedSequence(seed).spawn(games)]
+    chunks = [seeds[start:start + chunk_size] for start in range(0, games, chunk_size)]
+
+    start = time.perf_counter()
+    if workers == 1:
+        init_worker(agents, env, env_kwargs)
+        results = [result for chunk in chunks for result in play_chunk(chunk)]
+    else:
+        with multiprocessing.Pool(workers, init_worker, (agents, env, env_kwargs)) as pool:
+            results = [result for chunk_results in pool.imap(play_chunk, chunks)
+                       for result in chunk_results]
+    seconds = time.perf_counter() - start
+
+    winners = np.array([winner for winner, length in results], dtype=int)
+    lengths = np.array([length for winner, length in results], dtype=int)
+
+    return {'games': games,
+            'wins': np.bincount(winners[winners != -1], minlength=len(agents)).tolist(),
+            'capped': int((winners == -1).sum()),
+            'lengths': lengths,
+            'seconds': seconds,
+            'games_per_sec': games / seconds if seconds else float('inf')}
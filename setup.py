@@ -14,8 +14,9 @@ setup(
                 'rlrisk.minigames',
                 'rlrisk.environment'],
     package_data={'rlrisk': ['environment/*.bmp','*.txt','*.rst']},
+    entry_points={'console_scripts': ['rlrisk = rlrisk.cli:main']},
     python_requires='~=3.3',
     install_requires = [
-        'numpy>=1.14.1',
+        'numpy>=1.17',
         'pygame>=1.9.3']
 )
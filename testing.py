@@ -13,7 +13,7 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
-def plot_results(results, players, trade_gen, roll=20, lw=2):
+def plot_results(results, players, trade_table, roll=20, lw=2):
     '''
     Plotting the results of a game into meaningful graphs
     '''
@@ -40,8 +40,7 @@ def plot_results(results, players, trade_gen, roll=20, lw=2):
     for plr_num, plr in enumerate(troop_stats, 1):
         ax = plr.plot(ax=ax, kind='line', x='x', y='y', c=p2c[plr_num-1],label="Player "+str(plr_num),linewidth=lw)
 
-    trade_values = [next(trade_gen) for num in range(trade_r[-1]+1)]
-    trade_rv = np.array([trade_values[x] for x in trade_r])
+    trade_rv = trade_table[trade_r]
     plt.plot(trade_rv, label='Value of Set Trade In', color='blue', linestyle='--', linewidth=lw)
     
     plt.legend(loc='best')
@@ -64,8 +63,7 @@ def full_demo():
     players = [AggressiveAgent() for x in range(6)]
     env = Risk(players, has_gui=True)
     results = env.play()
-    trade_gen = env.gen_backup
-    plot_results(results, env.players, env.gen_backup, 5)
+    plot_results(results, env.players, env.trade_table, 5)
 
 def start_mg():
     players = [AggressiveAgent() for x in range(6)]
@@ -82,7 +80,7 @@ def sw_demo():
     players = [AggressiveAgent() for x in range(6)]
     env = SouthernWarfare(players, has_gui=True, verbose_gui=True, turn_cap=1000, sleep_val=0.03)
     results = env.play()
-    plot_results(results, env.players, env.gen_backup, 1)
+    plot_results(results, env.players, env.trade_table, 1)
 
 def sw_minigame():
     players = [AggressiveAgent() for x in range(6)]
@@ -0,0 +1,80 @@
+'''
+Tests of ActionSpace, the fixed size action encoding every
+decision's options are masked and decoded through
+'''
+
+import random
+import numpy as np
+import pytest
+from rlrisk.environment import Risk
+from rlrisk.environment.actions import BULK_CODES
+from rlrisk.agents import BaseAgent
+
+RULES = [{}, {'blitz': True, 'bulk_allocation': True, 'steal_cards': True},
+         {'deal': False, 'fortify_adjacent': False}]
+
+def check_decoded(action_code, value, options):
+    """Whether a decoded column is a choice the options allow"""
+
+    if action_code in BULK_CODES:
+        troops, valid = options
+        return value.sum() == troops and len(value) == len(valid)
+    if action_code in [2, 12, 15, 16]:
+        return True
+    return any(value is option or value == option for option in list(options))
+
+@pytest.mark.parametrize('rules', RULES)
+def test_columns_decode_to_options(rules):
+    random.seed(1)
+    np.random.seed(1)
+    env = Risk([BaseAgent() for _ in range(3)], seed=2, verbose=False, record=None,
+               turn_cap=30, **rules)
+    space = env.action_space
+    rng = np.random.default_rng(3)
+    seen = set()
+
+    (state, action_code, options), done = env.reset(), False
+    while not done:
+        mask = env.legal_actions()
+        width = space.widths[action_code]
+        assert mask.shape == (space.size,)
+        assert mask[:width].any() and not mask[width:].any()
+
+        legal = np.where(mask)[0]
+        for index in legal[:20].tolist():
+            value = env.decode_action(index)
+            assert check_decoded(action_code, value, options), (action_code, index)
+            if action_code == 8 and value is not False:
+                assert space.pattern(value) == index
+
+        if not mask[:width].all():
+            with pytest.raises(ValueError):
+                env.decode_action(int(np.where(~mask[:width])[0][0]))
+
+        seen.add(action_code)
+        state, action_code, options, done = env.step(env.decode_action(int(rng.choice(legal))))
+    assert 1 in seen and len(seen) >= 5
+
+def test_masks_of_options():
+    env = Risk([BaseAgent(), BaseAgent()], seed=0, verbose=False, record=None)
+    space = env.action_space
+    size = len(env.board)
+
+    mask = space.mask(0, [3, 7])
+    assert np.where(mask)[0].tolist() == [3, 7]
+    mask = space.mask(4, [2, False])
+    assert np.where(mask)[0].tolist() == [2, size]
+    assert space.decode(4, size, [2, False]) is False
+
+    edges = env.compiled.edges
+    attacks = [tuple(edges[5]), tuple(edges[9]), False]
+    mask = space.mask(1, attacks)
+    assert np.where(mask)[0].tolist() == [5, 9, len(edges)]
+    assert space.decode(1, 9, attacks) == tuple(edges[9])
+
+    assert np.where(space.mask(3, [1, 2]))[0].tolist() == [0, 1]
+    assert space.decode(3, 1, [1, 2]) == 2
+    assert space.pattern(False) == space.widths[8] - 1
+
+    valid = np.array([4, 8])
+    assert space.decode(13, 8, (5, valid)).tolist() == [0, 5]
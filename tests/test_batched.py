@@ -0,0 +1,69 @@
+'''
+Tests of BatchedRisk, games played in lockstep
+'''
+
+import numpy as np
+from rlrisk.environment import BatchedRisk, Risk
+from rlrisk.agents import AggressiveAgent
+from rlrisk.environment.batched import aggressive_policy, random_policy
+
+def play(seed, **kwargs):
+    """Plays a seeded batch of three player games"""
+
+    batch = BatchedRisk(8, [aggressive_policy, random_policy, aggressive_policy], seed=seed,
+                        turn_cap=60, **kwargs)
+    return batch, batch.play()
+
+def same_records(first, second):
+    """Whether two lists of game records are equal"""
+
+    return all(all(np.array_equal(mine, theirs) for mine, theirs in zip(record[:4], other[:4]))
+               and record[4] == other[4] for record, other in zip(first, second))
+
+def test_seed_repeats_games():
+    first, records = play(1, steal_cards=True)
+    again, repeated = play(np.random.default_rng(1), steal_cards=True)
+    assert same_records(records, repeated)
+    assert np.array_equal(first.winners, again.winners)
+
+    _, other = play(2, steal_cards=True)
+    assert not same_records(records, other)
+
+def test_games_follow_the_rules():
+    batch, records = play(3, steal_cards=True)
+    for game, (owners, troops, cards, trade_ins, turn_order, steal_cards) in enumerate(records):
+        assert (troops >= 1).all()
+        assert (np.diff(trade_ins) >= 0).all()
+        assert sorted(turn_order) == [0, 1, 2]
+        #nobody ends a turn holding more than a forced trade leaves, plus the card drawn
+        for player in range(3):
+            assert ((cards == player).sum(1) <= 6).all()
+        if batch.winners[game] != -1:
+            assert (batch.territories[game, :, 0] == batch.winners[game]).all()
+
+def test_records_match_single_games():
+    batch, records = play(4)
+    single = Risk([AggressiveAgent(), AggressiveAgent()], seed=4, verbose=False,
+                  turn_cap=5).play()
+    for game, record in enumerate(records):
+        assert [array.dtype for array in record[:4]] == [array.dtype for array in single[:4]]
+        assert record[0].shape[1:] == single[0].shape[1:]
+        assert record[2].shape[1:] == single[2].shape[1:]
+
+        #a state per turn taken, from the end of the starting placement
+        assert 0 < len(record[3]) <= batch.turn_count[game] + 1
+        assert record[1][0].sum() == Risk.starting_troops(3) * 3
+
+def test_placing_keeps_troop_totals():
+    batch = BatchedRisk(6, [random_policy, aggressive_policy], seed=5)
+    batch.allocate_territories()
+    games, players = np.arange(6), batch.turn_order[:, 0]
+    before = batch.territories[:, :, 1].sum(1)
+    owned = batch.owned(games, players)
+
+    troops = np.array([0, 1, 2, 5, 9, 30])
+    batch.place_all(games, players, troops)
+    assert np.array_equal(batch.territories[:, :, 1].sum(1), before + troops)
+    assert np.array_equal(batch.owned(games, players), owned)
+    placed = batch.territories[:, :, 1] - 1
+    assert (placed[~owned] == 0).all()
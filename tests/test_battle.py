@@ -0,0 +1,70 @@
+'''
+Tests of the blitz battle outcome tables against battles
+fought round by round
+'''
+
+import random
+import pytest
+from rlrisk.environment.battle import BattleTable, round_odds
+
+SAMPLES = 20000
+
+def fight(table, attack_troops, defend_troops, stop, rand):
+    """Fights a battle one round at a time until the stop threshold"""
+
+    while attack_troops > stop and defend_troops > 0:
+        attack_troops, defend_troops = table.fight_round(attack_troops, defend_troops, rand)
+    return (attack_troops, defend_troops)
+
+def frequencies(outcomes):
+    """Share of each outcome in a list of outcomes"""
+
+    counts = {}
+    for outcome in outcomes:
+        counts[outcome] = counts.get(outcome, 0) + 1
+    return dict((outcome, count / len(outcomes)) for outcome, count in counts.items())
+
+def largest_difference(dist, freq):
+    """Largest difference in probability of any outcome"""
+
+    return max(abs(dist.get(outcome, 0) - freq.get(outcome, 0))
+               for outcome in set(dist) | set(freq))
+
+def test_round_odds():
+    for attack_dice in range(1, 4):
+        for defend_dice in range(1, 3):
+            assert sum(round_odds(attack_dice, defend_dice).values()) == pytest.approx(1)
+
+    #the well known odds of three dice against two
+    odds = round_odds(3, 2)
+    assert odds[(0, 2)] == pytest.approx(2890 / 7776)
+    assert odds[(1, 1)] == pytest.approx(2611 / 7776)
+    assert odds[(2, 0)] == pytest.approx(2275 / 7776)
+
+@pytest.mark.parametrize('attack_troops, defend_troops, stop',
+                         [(2, 1, 1), (5, 3, 1), (10, 8, 1), (12, 6, 4), (30, 30, 1)])
+def test_distribution_sums_to_one(attack_troops, defend_troops, stop):
+    dist = BattleTable(30).distribution(attack_troops, defend_troops, stop)
+    assert sum(dist.values()) == pytest.approx(1)
+    for attack, defend in dist:
+        assert defend == 0 or attack <= stop
+
+@pytest.mark.parametrize('attack_troops, defend_troops, stop',
+                         [(4, 2, 1), (10, 8, 1), (12, 6, 4)])
+def test_distribution_matches_rounds(attack_troops, defend_troops, stop):
+    table = BattleTable(30)
+    rand = random.Random(attack_troops * 100 + defend_troops).random
+    fought = [fight(table, attack_troops, defend_troops, stop, rand) for _ in range(SAMPLES)]
+
+    dist = table.distribution(attack_troops, defend_troops, stop)
+    assert largest_difference(dist, frequencies(fought)) < 0.015
+
+@pytest.mark.parametrize('cap', [30, 8])
+def test_resolve_matches_distribution(cap):
+    #battles over the cap are fought round by round until within it
+    table = BattleTable(cap)
+    rand = random.Random(cap).random
+    resolved = [table.resolve(14, 10, 2, rand) for _ in range(SAMPLES)]
+
+    dist = BattleTable(30).distribution(14, 10, 2)
+    assert largest_difference(dist, frequencies(resolved)) < 0.015
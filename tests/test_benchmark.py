@@ -0,0 +1,64 @@
+'''
+Tests of the benchmark suite's comparison with a baseline,
+which must flag metrics that got worse beyond the tolerance
+'''
+
+import io
+from rlrisk import benchmark
+
+def report(games, results):
+    """A report as run returns it"""
+
+    return {'meta': {'games': games}, 'results': results}
+
+BASELINE = report(10, {'game/risk-2-base': {'games_per_sec': 10.0, 'agent_us_per_decision': 4.0},
+                       'micro/get_targets': {'us_per_call': 20.0},
+                       'micro/recruit': {'us_per_call': 0.0}})
+
+def flagged(rows):
+    """Benchmark and metric of every regression"""
+
+    return [(name, metric) for name, metric, base, value, ratio, worse in rows if worse]
+
+def test_regressions_are_flagged():
+    current = report(10, {'game/risk-2-base': {'games_per_sec': 7.0, 'agent_us_per_decision': 4.8},
+                          'micro/get_targets': {'us_per_call': 26.0},
+                          'micro/recruit': {'us_per_call': 3.0},
+                          'micro/new': {'us_per_call': 1.0}})
+    rows = benchmark.compare(current, BASELINE)
+
+    #metrics of benchmarks missing or zero in the baseline are not compared
+    assert [(name, metric) for name, metric, _, _, _, _ in rows] == [
+        ('game/risk-2-base', 'games_per_sec'), ('game/risk-2-base', 'agent_us_per_decision'),
+        ('micro/get_targets', 'us_per_call')]
+    assert flagged(rows) == [('game/risk-2-base', 'games_per_sec'),
+                             ('micro/get_targets', 'us_per_call')]
+    assert rows[0][4] == 0.7
+
+    assert flagged(benchmark.compare(current, BASELINE, tolerance=0.5)) == []
+    assert len(flagged(benchmark.compare(current, BASELINE, tolerance=0.1))) == 3
+
+def test_improvements_are_not_flagged():
+    current = report(10, {'game/risk-2-base': {'games_per_sec': 30.0, 'agent_us_per_decision': 1.0},
+                          'micro/get_targets': {'us_per_call': 5.0}})
+    assert flagged(benchmark.compare(current, BASELINE)) == []
+
+def test_games_need_the_same_count(tmp_path):
+    current = report(5, {'game/risk-2-base': {'games_per_sec': 1.0},
+                         'micro/get_targets': {'us_per_call': 100.0}})
+    path = str(tmp_path / 'baseline.json')
+    benchmark.save(BASELINE, path)
+
+    rows = benchmark.compare(current, path)
+    assert flagged(rows) == [('micro/get_targets', 'us_per_call')]
+
+    out = io.StringIO()
+    benchmark.print_report(current, rows, out)
+    assert "REGRESSION" in out.getvalue()
+
+def test_games_are_measured():
+    env, agents, env_kwargs = benchmark.GAMES['pick-2-base']
+    metrics = benchmark.bench_game(env, agents, env_kwargs, games=2)
+    assert metrics['games_per_sec'] > 0
+    assert set(benchmark.HIGHER_IS_BETTER) & set(metrics) == {
+        'games_per_sec', 'decisions_per_sec', 'agent_us_per_decision'}
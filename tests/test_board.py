@@ -0,0 +1,76 @@
+'''
+Tests of CompiledBoard, whose graph queries must answer
+the same as walking the adjacency lists of the board
+'''
+
+import numpy as np
+import pytest
+from rlrisk.environment import Risk, Map
+from rlrisk.environment.board import CompiledBoard
+from rlrisk.agents import AggressiveAgent
+
+BOARDS = [Risk.gen_board(), Map.synthetic(150, seed=4).tables()]
+
+def random_territories(size, players, rng):
+    """Territories owned at random, some of them unclaimed"""
+
+    territories = np.ones((size, 2), dtype=int)
+    territories[:, 0] = rng.integers(-1, players, size)
+    territories[:, 1] = rng.integers(1, 4, size)
+    return territories
+
+def region(board, source, owned):
+    """Territories reached from source through owned territory, by breadth first search"""
+
+    seen, frontier = {source}, [source]
+    for terr in frontier:
+        for link in board[terr]:
+            if link in owned and link not in seen:
+                seen.add(link)
+                frontier.append(link)
+    return seen
+
+@pytest.mark.parametrize('tables', BOARDS)
+def test_queries_match_adjacency_lists(tables):
+    board, continents, _, rewards = tables
+    compiled = CompiledBoard(board, continents, rewards)
+    rng = np.random.default_rng(0)
+
+    for _ in range(20):
+        territories = random_territories(len(board), 3, rng)
+        player = int(rng.integers(0, 3))
+        owned = set(np.where(territories[:, 0] == player)[0].tolist())
+        owned_mask = compiled.owned_mask(territories, player)
+        assert set(compiled.ids(owned_mask).tolist()) == owned
+        assert compiled.mask(sorted(owned)) == owned_mask
+
+        reached = set(link for terr in owned for link in board[terr])
+        assert set(compiled.ids(compiled.neighbors(owned_mask)).tolist()) == reached
+
+        borders = set(terr for terr in owned if set(board[terr]) - owned)
+        assert set(compiled.ids(compiled.borders(owned_mask)).tolist()) == borders
+
+        for source in list(owned)[:5]:
+            connected = compiled.ids(compiled.connected(source, owned_mask)).tolist()
+            assert set(connected) == region(board, source, owned)
+
+        bonus = sum(rewards[name] for name, members in continents.items()
+                    if set(members) <= owned)
+        assert compiled.continent_bonus(owned_mask) == bonus
+
+        attacks = set((terr, link) for terr in owned for link in board[terr]
+                      if link not in owned and territories[terr, 1] > 1)
+        assert set(map(tuple, compiled.attacks(territories, player).tolist())) == attacks
+
+@pytest.mark.parametrize('tables', BOARDS)
+def test_start_borders_match_adjacency_lists(tables):
+    board = tables[0]
+    agent = AggressiveAgent()
+    agent.pregame_setup([1, None, [0, 1, 2], False, board, tables[1], tables[3], None, None])
+    rng = np.random.default_rng(1)
+
+    for _ in range(20):
+        territories = random_territories(len(board), 3, rng)
+        expected = [link for terr in np.where(territories[:, 0] == 1)[0]
+                    for link in sorted(board[terr]) if territories[link, 0] == -1]
+        assert agent.get_start_borders((territories, None, 0)) == expected
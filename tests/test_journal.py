@@ -0,0 +1,135 @@
+'''
+Tests of the undo journal, unmaking back to a mark must
+leave the game exactly as it was at the mark
+'''
+
+import random
+import numpy as np
+import pytest
+from rlrisk.environment import Risk
+from rlrisk.agents import AggressiveAgent, BaseAgent
+
+RULES = [{}, {'blitz': True, 'bulk_allocation': True, 'steal_cards': True},
+         {'steal_cards': True}]
+
+def fingerprint(env, decision):
+    """Everything about a game a mark must bring back, and the pending decision"""
+
+    (territories, cards, trade_ins), action_code, options = decision
+    deck = env.deck
+    return (territories.tobytes(), cards.tobytes(), trade_ins, env.turn_count, env.game_over,
+            tuple(player.defeated for player in env.players), tuple(deck.pile), deck.pointer,
+            tuple(deck.discarded), str(deck.hands), tuple(env.owned_masks),
+            tuple(env.territory_counts), action_code, str(options), env.current_player,
+            str(env.rng.get_state()))
+
+def step(env, decision):
+    """Plays the pending decision with the agent that must make it"""
+
+    state, action_code, options = decision
+    action = env.players[env.current_player].take_action(state, action_code, options)
+    state, action_code, options, done = env.step(action)
+    return (state, action_code, options), done
+
+@pytest.mark.parametrize('rules', RULES)
+def test_unmake_restores_the_mark(rules):
+    random.seed(3)
+    np.random.seed(3)
+    players = [AggressiveAgent(), BaseAgent(), AggressiveAgent()]
+    env = Risk(players, seed=11, verbose=False, record=None, turn_cap=150, **rules)
+    decision = env.reset()
+
+    done = False
+    count = checks = 0
+    while not done:
+        if count % 53 == 7:
+            mark = env.mark()
+            expected = fingerprint(env, decision)
+
+            #explore a line, with a nested mark unmade on the way
+            explored, ended, inner = decision, False, None
+            for depth in range(random.randint(1, 120)):
+                if depth == 20:
+                    inner = (env.mark(), fingerprint(env, explored))
+                explored, ended = step(env, explored)
+                if ended:
+                    break
+            if inner is not None and not ended:
+                explored = env.unmake(inner[0])
+                assert fingerprint(env, explored) == inner[1]
+                for _ in range(30):
+                    explored, ended = step(env, explored)
+                    if ended:
+                        break
+
+            decision = env.unmake(mark)
+            assert fingerprint(env, decision) == expected
+            checks += 1
+            if count % 3 == 0:
+                env.end_journal()
+
+        decision, done = step(env, decision)
+        count += 1
+    assert checks > 0
+
+def test_unmake_without_step():
+    #games not played through reset and step only have their changes undone
+    env = Risk([AggressiveAgent(), AggressiveAgent()], seed=2, verbose=False, record=None)
+    env.play()
+    territories = env.state[0].copy()
+
+    mark = env.mark()
+    env.set_troops(0, 50)
+    env.set_owner(1, 1 - env.state[0][1, 0])
+    assert env.unmake(mark) is None
+    assert np.array_equal(env.state[0], territories)
+    assert env.territory_counts[env.state[0][0, 0]] == len(env.board)
+
+def test_unmake_replays_only_when_stepped():
+    random.seed(4)
+    np.random.seed(4)
+    players = [AggressiveAgent(), AggressiveAgent(), AggressiveAgent()]
+    env = Risk(players, seed=5, verbose=False, record=None, turn_cap=150)
+    decision = env.reset()
+    for _ in range(200):
+        decision, _ = step(env, decision)
+
+    outer = env.mark()
+    expected, snapshot = fingerprint(env, decision), env.snapshot()
+    for _ in range(40):
+        decision, _ = step(env, decision)
+    inner = env.mark()
+    for _ in range(40):
+        decision, _ = step(env, decision)
+
+    #unmaking only undoes the journal, the generator is left alone
+    generator = env.decisions
+    env.unmake(inner)
+    decision = env.unmake(outer)
+    assert env.decisions is generator
+    assert fingerprint(env, decision) == expected
+    position = env.snapshot()
+    assert np.array_equal(position.territories, snapshot.territories)
+    assert (position.turn_count, position.phase, position.actions, str(position.rng_state)) == \
+        (snapshot.turn_count, snapshot.phase, snapshot.actions, str(snapshot.rng_state))
+    assert env.mark().length == outer.length
+
+    #the game then plays on as it did from the mark
+    env.end_journal()
+    random.seed(6)
+    np.random.seed(6)
+    played = [fingerprint(env, decision)]
+    for _ in range(30):
+        decision, _ = step(env, decision)
+        played.append(fingerprint(env, decision))
+
+    other = Risk([AggressiveAgent() for _ in range(3)], seed=9, verbose=False, record=None,
+                 turn_cap=150)
+    decision = other.restore(snapshot)
+    random.seed(6)
+    np.random.seed(6)
+    replayed = [fingerprint(other, decision)]
+    for _ in range(30):
+        decision, _ = step(other, decision)
+        replayed.append(fingerprint(other, decision))
+    assert played == replayed
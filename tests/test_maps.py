@@ -0,0 +1,61 @@
+'''
+Tests of Map, boards kept as arrays that are loaded from
+map files or generated synthetically
+'''
+
+import json
+import numpy as np
+import pytest
+from rlrisk.environment import Map
+
+SYNTHETIC = [(2, 7), (42, 7), (60, 5), (60, 6), (500, 9)]
+
+def same_map(first, second):
+    """Whether two maps have the same territories, edges, continents and cards"""
+
+    return (first.names == second.names and np.array_equal(first.indices, second.indices)
+            and np.array_equal(first.indptr, second.indptr)
+            and first.continents == second.continents and first.rewards == second.rewards
+            and first.cards == second.cards)
+
+@pytest.mark.parametrize('board_map', [Map.classic(), Map.synthetic(80, seed=3)])
+def test_dict_round_trip(board_map, tmp_path):
+    again = Map.from_dict(json.loads(json.dumps(board_map.to_dict())))
+    assert same_map(again, board_map)
+    assert np.array_equal(again.positions, board_map.positions)
+
+    path = str(tmp_path / 'map.json')
+    board_map.save(path)
+    assert same_map(Map.load(path), board_map)
+
+@pytest.mark.parametrize('territories, continent_size', SYNTHETIC)
+def test_synthetic_maps_are_connected(territories, continent_size):
+    board_map = Map.synthetic(territories, continent_size=continent_size, seed=territories)
+    assert len(board_map) == territories
+    assert board_map.connected()
+    assert len(board_map.cards) == territories + 2
+
+@pytest.mark.parametrize('territories, continent_size', SYNTHETIC)
+def test_synthetic_continents_partition_the_board(territories, continent_size):
+    board_map = Map.synthetic(territories, continent_size=continent_size, seed=territories)
+    members = sorted(terr for continent in board_map.continents.values() for terr in continent)
+    assert members == list(range(territories))
+
+    sizes = [len(continent) for continent in board_map.continents.values()]
+    assert max(sizes) == min(continent_size, territories)
+    assert sum(size == continent_size for size in sizes) >= len(sizes) // 2
+
+    #every continent holds together
+    board, _, _, _ = board_map.tables()
+    for continent in board_map.continents.values():
+        seen, frontier = {continent[0]}, [continent[0]]
+        for terr in frontier:
+            for adjacent in board[terr]:
+                if adjacent in continent and adjacent not in seen:
+                    seen.add(adjacent)
+                    frontier.append(adjacent)
+        assert seen == set(continent)
+
+def test_synthetic_seed_repeats_maps():
+    assert same_map(Map.synthetic(100, seed=1), Map.synthetic(100, seed=1))
+    assert not same_map(Map.synthetic(100, seed=1), Map.synthetic(100, seed=2))
@@ -0,0 +1,54 @@
+'''
+Tests of MCTSAgent, which must only search in its simulator
+and choose legal actions
+'''
+
+import random
+import numpy as np
+import pytest
+from rlrisk.environment import Risk
+from rlrisk.agents import AggressiveAgent, MCTSAgent
+
+def position(env):
+    """Everything about the real game a search could disturb"""
+
+    deck = env.deck
+    territories, cards, trade_ins = env.state
+    return (territories.tobytes(), cards.tobytes(), trade_ins, env.turn_count, env.game_over,
+            tuple(player.defeated for player in env.players), tuple(deck.pile), deck.pointer,
+            tuple(deck.discarded), str(env.rng.get_state()), len(env.phase_actions))
+
+def checked(agent, env, checks):
+    """Wraps the agent's take_action to check every search it makes"""
+
+    search = agent.take_action
+
+    def take_action(state, action_code, options):
+        before = position(env)
+        action = search(state, action_code, options)
+        assert position(env) == before
+
+        space = env.action_space
+        legal = np.where(space.mask(action_code, options))[0].tolist()
+        assert any(space.decode(action_code, column, options) == action for column in legal)
+        checks.append(len(legal))
+        return action
+
+    agent.take_action = take_action
+
+@pytest.mark.parametrize('rules', [{}, {'blitz': True, 'steal_cards': True}])
+def test_searches_leave_the_game_alone(rules):
+    random.seed(2)
+    np.random.seed(2)
+    agent = MCTSAgent(iterations=8, rollout_depth=20, seed=1)
+    env = Risk([agent, AggressiveAgent(), AggressiveAgent()], seed=3, verbose=False,
+               record=None, turn_cap=6, **rules)
+    checks = []
+    checked(agent, env, checks)
+    env.play()
+    #most decisions have a choice to search
+    assert sum(choices > 1 for choices in checks) > 10
+
+def test_needs_a_limit():
+    with pytest.raises(ValueError):
+        MCTSAgent(iterations=None, time_limit=None)
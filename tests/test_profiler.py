@@ -0,0 +1,95 @@
+'''
+Tests of the Profiler, whose totals must add up to the
+phases played and the decisions the agents made
+'''
+
+import json
+import random
+import time
+import numpy as np
+import pytest
+from rlrisk.environment import Risk, Profiler
+from rlrisk.agents import AggressiveAgent
+
+#seconds every fortify source decision takes
+PAUSE = 0.002
+
+class CountingAgent(AggressiveAgent):
+    """AggressiveAgent that counts its decisions and pauses on fortify sources"""
+
+    def __init__(self, counts):
+        super(CountingAgent, self).__init__()
+        self.counts = counts
+
+    def take_action(self, state, action_code, options):
+        key = (self.player, action_code)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if action_code == 4:
+            time.sleep(PAUSE)
+        return super(CountingAgent, self).take_action(state, action_code, options)
+
+def play(profiler, rules, counts):
+    """Plays a seeded profiled game"""
+
+    random.seed(5)
+    np.random.seed(5)
+    env = Risk([CountingAgent(counts) for _ in range(3)], seed=5, verbose=False, record=None,
+               turn_cap=25, profiler=profiler, **rules)
+    env.play()
+    return env
+
+@pytest.mark.parametrize('rules', [{}, {'blitz': True, 'bulk_allocation': True}])
+def test_totals_add_up(rules):
+    profiler, counts = Profiler(), {}
+    play(profiler, rules, counts)
+    summary = profiler.summary()
+
+    #every decision is counted once, by player and action code
+    decisions = dict(((player, code), totals['calls'])
+                     for player, codes in summary['decisions'].items()
+                     for code, totals in codes.items())
+    assert decisions == counts
+    seconds = [totals['seconds'] for codes in summary['decisions'].values()
+               for totals in codes.values()]
+    assert summary['agent_seconds'] == pytest.approx(sum(seconds))
+    for player in range(3):
+        fortify = summary['decisions'][player].get(4)
+        if fortify is not None:
+            assert fortify['seconds'] >= PAUSE * fortify['calls']
+
+    phases = summary['phases']
+    assert phases['setup']['calls'] == phases['starting troops']['calls'] == 1
+    assert phases['recruitment']['calls'] == phases['attack']['calls']
+    assert phases['fortify']['calls'] <= phases['attack']['calls']
+    assert sum(totals['calls'] for totals in phases['fortify']['players'].values()) == \
+        phases['fortify']['calls']
+    for totals in phases.values():
+        assert totals['seconds'] >= totals['agent_seconds'] >= 0
+        assert totals['engine_seconds'] == pytest.approx(totals['seconds'] -
+                                                         totals['agent_seconds'])
+
+    #fortify sources are chosen during the fortify phase only
+    pauses = sum(counts.get((player, 4), 0) for player in range(3))
+    assert pauses > 0
+    assert phases['fortify']['agent_seconds'] >= PAUSE * pauses
+
+def test_games_add_up_and_trace(tmp_path):
+    profiler, counts = Profiler(), {}
+    play(profiler, {}, counts)
+    play(profiler, {}, counts)
+    summary = profiler.summary()
+    assert summary['phases']['setup']['calls'] == 2
+    assert sum(totals['calls'] for codes in summary['decisions'].values()
+               for totals in codes.values()) == sum(counts.values())
+
+    path = str(tmp_path / 'trace.json')
+    profiler.chrome_trace(path)
+    with open(path) as trace_file:
+        events = json.load(trace_file)['traceEvents']
+    timed = [event for event in events if event['ph'] == 'X']
+    assert len(timed) == len(profiler.events)
+    assert sum(event['cat'] == 'decision' for event in timed) == sum(counts.values())
+    assert "recruitment" in profiler.report()
+
+    with pytest.raises(ValueError):
+        Profiler(trace=False).chrome_trace()
@@ -0,0 +1,37 @@
+'''
+Tests of the Recorder, the in-memory record of a game
+'''
+
+import numpy as np
+import pytest
+from rlrisk.environment import Risk, Map
+from rlrisk.environment.recorder import Recorder
+from rlrisk.agents import AggressiveAgent
+
+@pytest.mark.parametrize('board_map', [None, Map.synthetic(60, seed=0)])
+def test_empty_records_have_board_rows(board_map):
+    players = [AggressiveAgent(), AggressiveAgent()]
+    env = Risk(players, seed=1, verbose=False, record=None, board_map=board_map)
+    owners, troops, cards, trade_ins = env.play()[:4]
+
+    assert owners.shape == troops.shape == (0, len(env.board))
+    assert cards.shape == (0, len(env.card_faces))
+    assert trade_ins.shape == (0,)
+
+def test_records_stack_with_empty_records():
+    players = [AggressiveAgent(), AggressiveAgent()]
+    recorded = Risk(players, seed=1, verbose=False).play()
+    empty = Risk(players, seed=1, verbose=False, record=None).play()
+    for array, other in zip(recorded[:4], empty[:4]):
+        assert len(np.concatenate([array, other])) == len(array)
+
+@pytest.mark.parametrize('granularity', [True, -2, "turns"])
+def test_invalid_granularity(granularity):
+    with pytest.raises(ValueError):
+        Recorder(granularity)
+
+@pytest.mark.parametrize('granularity, turns', [("turn", [0, 1, 2, 3]), (2, [0, 2]),
+                                                (None, []), (False, [])])
+def test_granularity(granularity, turns):
+    recorder = Recorder(granularity)
+    assert [turn for turn in range(4) if recorder.wants(turn)] == turns
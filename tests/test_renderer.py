@@ -0,0 +1,51 @@
+'''
+Tests of the Renderer, which draws a GUI on its own thread
+'''
+
+import time
+import pytest
+from rlrisk.environment import Risk
+from rlrisk.environment.renderer import Renderer
+
+class FakeGUI(object):
+    """Keeps the states it is asked to draw, without a display"""
+
+    def __init__(self):
+        self.drawn = []
+        self.closed = False
+
+    def recolor(self, state):
+        self.drawn.append(state)
+
+    def quit_game(self):
+        self.closed = True
+
+def test_latest_state_is_drawn():
+    renderer = Renderer(FakeGUI, fps=1000)
+    state = Risk.gen_init_state()
+    for troops in range(1, 6):
+        state[0][:, 1] = troops
+        renderer.recolor(state)
+    renderer.quit_game()
+
+    gui = renderer.gui
+    assert gui.closed
+    assert 1 <= len(gui.drawn) <= 5
+    assert (gui.drawn[-1][0][:, 1] == 5).all()
+
+def test_gui_errors_are_raised():
+    def broken():
+        raise OSError("no display")
+
+    start = time.time()
+    with pytest.raises(OSError):
+        Renderer(broken)
+    assert time.time() - start < 5
+
+def test_slow_gui_times_out():
+    def slow():
+        time.sleep(2)
+        return FakeGUI()
+
+    with pytest.raises(RuntimeError):
+        Renderer(slow, timeout=0.1)
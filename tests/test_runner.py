@@ -0,0 +1,37 @@
+'''
+Tests of the process-pool game runner, whose results must
+not depend on how games are split between workers
+'''
+
+import pytest
+from rlrisk import runner
+
+AGENTS = ['aggressive', 'base', 'aggressive']
+
+def results(summary):
+    """The parts of a summary that depend on the games alone"""
+
+    return (summary['games'], summary['wins'], summary['capped'], summary['lengths'].tolist())
+
+@pytest.mark.parametrize('env, env_kwargs', [('risk', {'turn_cap': 250}),
+                                             ('risk', {'turn_cap': 250, 'blitz': True}),
+                                             ('southern', {'turn_cap': 250})])
+def test_same_results_for_any_workers(env, env_kwargs):
+    serial = runner.simulate(10, AGENTS, workers=1, chunk_size=4, seed=5, env=env,
+                             env_kwargs=env_kwargs)
+    pooled = runner.simulate(10, AGENTS, workers=3, chunk_size=1, seed=5, env=env,
+                             env_kwargs=env_kwargs)
+    assert results(pooled) == results(serial)
+    assert sum(serial['wins']) + serial['capped'] == 10
+
+def test_seed_changes_games():
+    first = runner.simulate(6, AGENTS, workers=1, seed=1, env_kwargs={'turn_cap': 250})
+    again = runner.simulate(6, AGENTS, workers=1, seed=1, env_kwargs={'turn_cap': 250})
+    other = runner.simulate(6, AGENTS, workers=1, seed=2, env_kwargs={'turn_cap': 250})
+    assert results(again) == results(first)
+    assert results(other) != results(first)
+
+def test_no_games():
+    summary = runner.simulate(0, AGENTS, workers=1, seed=1)
+    assert summary['games'] == 0
+    assert len(summary['lengths']) == 0
@@ -0,0 +1,83 @@
+'''
+Tests of streaming records to a TrajectorySink and reading
+them back with a TrajectoryDataset
+'''
+
+import random
+import numpy as np
+import pytest
+from rlrisk.environment import Risk, TrajectorySink, TrajectoryDataset
+from rlrisk.agents import AggressiveAgent
+
+def play(seed, **kwargs):
+    """Plays a seeded game of three AggressiveAgents"""
+
+    random.seed(seed)
+    np.random.seed(seed)
+    players = [AggressiveAgent() for _ in range(3)]
+    return Risk(players, seed=seed, verbose=False, turn_cap=100, **kwargs).play()
+
+def same_record(first, second):
+    """Whether two records of Risk.play are equal"""
+
+    arrays_equal = all(np.array_equal(array, other) for array, other in zip(first[:4], second[:4]))
+    return arrays_equal and list(first[4]) == list(second[4]) and first[5] == second[5]
+
+def test_dataset_reads_back_the_games(tmp_path):
+    #a small shard size makes games move to new shards
+    sink = TrajectorySink(str(tmp_path), shard_size=150)
+    seeds = [1, 2, 3, 4]
+    streamed = [play(seed, sink=sink, steal_cards=seed % 2 == 0) for seed in seeds]
+    sink.close()
+
+    dataset = TrajectoryDataset(str(tmp_path))
+    assert len(dataset) == len(seeds)
+    assert dataset.meta['shards'] > 1
+    for game, seed in enumerate(seeds):
+        in_memory = play(seed, steal_cards=seed % 2 == 0)
+        assert same_record(dataset[game], in_memory)
+        assert same_record(streamed[game], in_memory)
+
+def test_sink_appends_to_a_directory(tmp_path):
+    sink = TrajectorySink(str(tmp_path), shard_size=200)
+    play(1, sink=sink)
+    sink.close()
+
+    sink = TrajectorySink(str(tmp_path))
+    play(2, sink=sink)
+    sink.close()
+
+    dataset = TrajectoryDataset(str(tmp_path))
+    assert len(dataset) == 2
+    assert same_record(dataset[0], play(1))
+    assert same_record(dataset[1], play(2))
+
+def test_sink_rejects_other_settings(tmp_path):
+    sink = TrajectorySink(str(tmp_path), shard_size=200)
+    play(1, sink=sink)
+    sink.close()
+
+    TrajectorySink(str(tmp_path), shard_size=200, troop_dtype=np.int16)
+    with pytest.raises(ValueError):
+        TrajectorySink(str(tmp_path), shard_size=100)
+    with pytest.raises(ValueError):
+        TrajectorySink(str(tmp_path), troop_dtype=np.int32)
+
+def test_shards_hold_only_indexed_games(tmp_path):
+    sink = TrajectorySink(str(tmp_path), shard_size=150)
+    for seed in [1, 2, 3, 4]:
+        play(seed, sink=sink)
+    sink.close()
+
+    #games moved to a new shard leave no rows behind in the old one
+    dataset = TrajectoryDataset(str(tmp_path))
+    stored = sum(len(dataset.shard(num)[3]) for num in range(dataset.meta['shards']))
+    assert stored == dataset.index[:, 2].sum()
+
+def test_empty_game_has_board_widths(tmp_path):
+    env = Risk([AggressiveAgent(), AggressiveAgent()], verbose=False,
+               sink=TrajectorySink(str(tmp_path)))
+    owners, troops, cards, trade_ins = env.recorder.arrays()
+    assert owners.shape == troops.shape == (0, len(env.board))
+    assert cards.shape == (0, len(env.state[1]))
+    assert len(trade_ins) == 0
@@ -0,0 +1,91 @@
+'''
+Tests of snapshot and restore, which must put a game back at
+the same decision with the same random stream
+'''
+
+import pickle
+import random
+import numpy as np
+import pytest
+from rlrisk.environment import Risk
+from rlrisk.agents import AggressiveAgent, BaseAgent
+
+RULES = [{}, {'blitz': True, 'bulk_allocation': True}, {'steal_cards': True}]
+
+def new_game(rules, seed=3):
+    """A game of four AggressiveAgents, started through reset"""
+
+    #agents draw from the global streams
+    random.seed(seed)
+    np.random.seed(seed)
+    players = [AggressiveAgent() for _ in range(4)]
+    env = Risk(players, seed=seed, verbose=False, record=None, turn_cap=150, **rules)
+    return env, env.reset()
+
+def play_out(env, decision, seed):
+    """Plays a game to the end, returning every state seen"""
+
+    random.seed(seed)
+    np.random.seed(seed)
+    state, action_code, options = decision
+    seen = []
+    done = False
+    while not done:
+        action = env.players[env.current_player].take_action(state, action_code, options)
+        state, action_code, options, done = env.step(action)
+        seen.append((state[0].tobytes(), state[1].tobytes(), state[2], action_code))
+    return seen
+
+def same_decision(first, second):
+    """Whether two decisions from reset, step or restore are the same"""
+
+    (state, action_code, options), (other, other_code, other_options) = first, second
+    return (np.array_equal(state[0], other[0]) and np.array_equal(state[1], other[1]) and
+            state[2] == other[2] and action_code == other_code and
+            str(options) == str(other_options))
+
+@pytest.mark.parametrize('rules', RULES)
+def test_restore_in_simulator(rules):
+    env, decision = new_game(rules)
+    sim = env.simulator([BaseAgent() for _ in range(4)], seed=1)
+
+    done = False
+    count = 0
+    while not done:
+        if count % 37 == 0:
+            snapshot = pickle.loads(pickle.dumps(env.snapshot()))
+            assert same_decision(sim.restore(snapshot), decision)
+
+        state, action_code, options = decision
+        action = env.players[env.current_player].take_action(state, action_code, options)
+        state, action_code, options, done = env.step(action)
+        decision = (state, action_code, options)
+        count += 1
+
+@pytest.mark.parametrize('rules', RULES)
+def test_restore_plays_the_same_game(rules):
+    env, decision = new_game(rules)
+    for _ in range(200):
+        state, action_code, options = decision
+        action = env.players[env.current_player].take_action(state, action_code, options)
+        state, action_code, options, done = env.step(action)
+        assert not done
+        decision = (state, action_code, options)
+
+    snapshot = env.snapshot()
+    played = play_out(env, decision, seed=7)
+
+    #the rest of the game is the same, in the same or another environment
+    assert play_out(env, env.restore(snapshot), seed=7) == played
+    sim = env.simulator([AggressiveAgent() for _ in range(4)])
+    assert play_out(sim, sim.restore(snapshot), seed=7) == played
+
+def test_snapshots_of_a_phase_share_arrays():
+    env, decision = new_game({})
+    first = env.snapshot()
+    state, action_code, options = decision
+    env.step(env.players[env.current_player].take_action(state, action_code, options))
+    second = env.snapshot()
+
+    assert second.territories is first.territories
+    assert len(second.actions) == len(first.actions) + 1
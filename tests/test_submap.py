@@ -0,0 +1,62 @@
+'''
+Tests of sub-maps and the environments restricted to them,
+which must keep the part of the board they select
+'''
+
+import random
+import numpy as np
+import pytest
+from rlrisk.environment import Risk
+from rlrisk.minigames import SouthernWarfare, restrict, submap
+from rlrisk.agents import AggressiveAgent
+
+def test_submap_keeps_the_selection():
+    board, continents, _, rewards = Risk.gen_board()
+    names = Risk.id_names()[0]
+    selection = submap(continents=['Australia'], territories=[board[continents['Australia'][0]][0]])
+    kept = selection.backward.tolist()
+    assert kept == sorted(kept) and len(kept) == 5
+
+    #adjacency between kept territories only, under the new IDs
+    for new, adjacent in selection.board.items():
+        original = kept[new]
+        assert sorted(kept[adj] for adj in adjacent) == sorted(adj for adj in board[original]
+                                                               if adj in kept)
+    assert list(selection.continents) == ['Australia']
+    assert selection.con_rewards == {'Australia': rewards['Australia']}
+    assert selection.id_names()[0] == dict((new, names[terr]) for new, terr in enumerate(kept))
+
+def test_submaps_are_compiled_once():
+    board, continents, _, _ = Risk.gen_board()
+    africa = continents['Africa']
+    extra = next(adj for terr in africa for adj in board[terr] if adj not in africa)
+
+    first = submap(continents=['Africa'], territories=[extra])
+    assert submap(territories=sorted(africa, reverse=True) + [extra]) is first
+    assert restrict(continents=['Africa'], territories=[extra]) is \
+        restrict(territories=[extra], continents=['Africa'])
+
+def test_invalid_selections():
+    with pytest.raises(ValueError):
+        submap()
+    with pytest.raises(ValueError):
+        submap(continents=['Atlantis'])
+    with pytest.raises(ValueError):
+        submap(continents=['Australia', 'S_America'])
+
+@pytest.mark.parametrize('env_class', [SouthernWarfare,
+                                       restrict(continents=['Asia', 'Australia'])])
+def test_restricted_games(env_class):
+    random.seed(1)
+    np.random.seed(1)
+    env = env_class([AggressiveAgent() for _ in range(3)], seed=1, verbose=False, turn_cap=150)
+    size = len(env_class.submap.board)
+    assert env.board == env_class.submap.tables()[0]
+    assert all(player.board == env.board for player in env.players)
+
+    owners, troops, cards, trade_ins, turn_order, steal_cards = env.play()
+    assert owners.shape[1] == troops.shape[1] == size
+    assert ((owners >= 0) & (owners < 3)).all()
+    assert env.turn_count > 0
+    if env.winner():
+        assert (env.state[0][:, 0] == env.state[0][0, 0]).all()
@@ -0,0 +1,66 @@
+'''
+Tests of TradeTable, which must reward the same troops
+as drawing from the trade in value generators did
+'''
+
+import itertools
+import pickle
+import numpy as np
+import pytest
+from rlrisk.environment import config
+from rlrisk.environment.trades import TradeTable, PICKLED_VALUES
+
+def squares():
+    """An endless trade in sequence given by the user"""
+
+    for num in itertools.count(1):
+        yield num * num
+
+@pytest.mark.parametrize('setting', ["s", "1"])
+def test_settings_match_the_generators(setting):
+    #what Risk drew from its tee'd copy of the setting's generator
+    generator, _ = itertools.tee(config.get_trade_vals(setting))
+    expected = [next(generator) for _ in range(60)]
+
+    table = TradeTable(setting)
+    assert [table[trade_ins] for trade_ins in range(60)] == expected
+    assert table[np.array([[3, 0], [59, 7]])].tolist() == [[expected[3], expected[0]],
+                                                          [expected[59], expected[7]]]
+
+def test_values_are_drawn_lazily():
+    drawn = []
+    source = (drawn.append(num) or num for num in squares())
+    table = TradeTable(source)
+    assert len(table) == 0 and drawn == []
+    assert table[4] == 25
+    assert len(table) == len(drawn) == 5
+    assert table[np.array([], dtype=int)].tolist() == []
+    assert len(table) == 5
+
+def test_finite_sequences_end():
+    table = TradeTable([4, 6, 8])
+    assert table[2] == 8
+    with pytest.raises(ValueError):
+        table[3]
+    with pytest.raises(ValueError):
+        TradeTable("x")
+
+@pytest.mark.parametrize('setting', ["s", "1"])
+def test_pickled_settings_keep_drawing(setting):
+    table = TradeTable(setting)
+    table[10]
+    copy = pickle.loads(pickle.dumps(table))
+    assert [copy[trade_ins] for trade_ins in range(200)] == \
+        [TradeTable(setting)[trade_ins] for trade_ins in range(200)]
+
+def test_pickled_generators_keep_their_values():
+    table = TradeTable(squares())
+    table[3]
+    copy = pickle.loads(pickle.dumps(table))
+    assert len(copy) == PICKLED_VALUES
+    assert copy[PICKLED_VALUES - 1] == PICKLED_VALUES ** 2
+    with pytest.raises(ValueError):
+        copy[PICKLED_VALUES]
+
+    #the original still draws from its generator
+    assert table[PICKLED_VALUES] == (PICKLED_VALUES + 1) ** 2
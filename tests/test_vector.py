@@ -0,0 +1,55 @@
+'''
+Tests of VecRisk, environments stepped in worker processes
+'''
+
+import numpy as np
+import pytest
+from rlrisk.environment import VecRisk
+
+def random_columns(masks, rng):
+    """A random legal column of every environment's mask"""
+
+    scores = rng.random(masks.shape)
+    scores[~masks] = -1
+    return scores.argmax(1)
+
+def play(workers, steps=1500):
+    """Steps four two player games with random legal actions"""
+
+    rng = np.random.default_rng(0)
+    envs = VecRisk(4, players=2, workers=workers, seed=0, env_kwargs={'turn_cap': 5})
+    try:
+        observation = envs.reset()
+        seen, ended = [], []
+        for _ in range(steps):
+            territories, cards, trade_ins, acting, action_codes, masks = observation
+            assert masks.any(1).all()
+            assert ((acting >= 0) & (acting < 2)).all()
+            seen.append((territories.copy(), cards.copy(), action_codes.copy()))
+
+            observation, dones, infos = envs.step(random_columns(masks, rng))
+            for done, info in zip(dones, infos):
+                assert (info is not None) == done
+                if done:
+                    ended.append(info)
+        return seen, ended
+    finally:
+        envs.close()
+
+def test_steps_do_not_depend_on_workers():
+    serial, serial_ended = play(1)
+    pooled, pooled_ended = play(2)
+    assert serial_ended and serial_ended == pooled_ended
+    for first, second in zip(serial, pooled):
+        assert all(np.array_equal(array, other) for array, other in zip(first, second))
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_worker_errors_are_raised(workers):
+    envs = VecRisk(2, players=2, workers=workers, seed=0)
+    try:
+        envs.reset()
+        with pytest.raises(RuntimeError, match="IndexError"):
+            envs.step(np.array([10**6, 10**6]))
+    finally:
+        envs.close()
+    assert not any(process.is_alive() for process in envs.processes)